@@ -1,5 +1,11 @@
+import json
+
+from django.conf import settings
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 from .models.models import (
     Empresa, CustomUser, Proyecto, Zona, Sector, Reporte,
     DetallePosteElectrico, FotoReporte,
@@ -9,11 +15,65 @@ from .models.models import (
 )
 from .forms import CustomUserCreationForm, CustomUserChangeForm
 
+
+class ConteoEstimadoPaginator(Paginator):
+    """
+    Paginador del admin para tablas grandes. En PostgreSQL usa la estimación del
+    planificador (pg_class.reltuples sin filtros, EXPLAIN con filtros) cuando pasa
+    de settings.ADMIN_CONTEO_ESTIMADO_DESDE filas; por debajo hace el COUNT exacto.
+    """
+
+    @cached_property
+    def count(self):
+        qs = self.object_list
+        connection = connections[qs.db]
+        if connection.vendor == 'postgresql':
+            umbral = getattr(settings, 'ADMIN_CONTEO_ESTIMADO_DESDE', 10000)
+            estimado = self._estimar(qs, connection)
+            if estimado is not None and estimado >= umbral:
+                return estimado
+        return super().count
+
+    @staticmethod
+    def _estimar(qs, connection):
+        with connection.cursor() as cursor:
+            if not qs.query.where:
+                cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                               [qs.model._meta.db_table])
+                fila = cursor.fetchone()
+                return int(fila[0]) if fila and fila[0] > 0 else None
+            sql, params = qs.order_by().values('pk').query.sql_with_params()
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]['Plan']['Plan Rows'])
+
+
+class TablaGrandeAdmin(admin.ModelAdmin):
+    """Base para changelists de tablas grandes: conteo estimado y sin el COUNT total extra."""
+    paginator = ConteoEstimadoPaginator
+    show_full_result_count = False
+    list_per_page = 50
+
+
+class EmpresaAdmin(admin.ModelAdmin):
+    list_display = ('nombre', 'ruc', 'estado_activa')
+    search_fields = ('nombre', 'ruc')
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        if request.user.rol == 'superadmin':
+            return qs
+        return qs.filter(id=request.user.empresa_id)
+
 # Usuario
 class CustomUserAdmin(UserAdmin):
     add_form = CustomUserCreationForm
     form = CustomUserChangeForm
     model = CustomUser
+    paginator = ConteoEstimadoPaginator
+    show_full_result_count = False
 
     list_display = (
         'id', 'dni', 'nombres', 'apellidos', 'email', 'celular',
@@ -22,6 +82,9 @@ class CustomUserAdmin(UserAdmin):
     list_filter = ('rol', 'empresa', 'is_active', 'estado', 'estado_contrasena')
     search_fields = ('dni', 'email', 'nombres', 'apellidos', 'celular')
     ordering = ('dni',)
+    list_select_related = ('empresa', 'supervisor')
+    # Autocompletado: el <select> con todos los supervisores/empresas no escala
+    autocomplete_fields = ('empresa', 'supervisor')
 
     fieldsets = (
         (None, {'fields': ('dni', 'email', 'password')}),
@@ -50,6 +113,7 @@ class CustomUserAdmin(UserAdmin):
         return qs.filter(empresa=request.user.empresa)
 
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        # Con autocomplete_fields el queryset ya no se renderiza completo: solo valida el valor elegido
         if db_field.name == "empresa":
             # Si es superadmin, ve todas las empresas
             if hasattr(request.user, 'rol') and request.user.rol == 'superadmin':
@@ -78,22 +142,40 @@ class BaseEmpresaAdmin(admin.ModelAdmin):
 
 class ProyectoAdmin(BaseEmpresaAdmin):
     list_display = ('nombre', 'empresa', 'activo')
+    list_select_related = ('empresa',)
+    search_fields = ('nombre',)
+
+    def get_queryset(self, request):
+        # __str__ usa empresa.nombre (también en el autocompletado)
+        return super().get_queryset(request).select_related('empresa')
 
 class ZonaAdmin(admin.ModelAdmin):
+    search_fields = ('nombre',)
+
     def get_queryset(self, request):
-        qs = super().get_queryset(request)
+        qs = super().get_queryset(request).select_related('distrito', 'proyecto')
         if request.user.rol == 'superadmin':
             return qs
         return qs.filter(proyecto__empresa=request.user.empresa)
 
 class SectorAdmin(admin.ModelAdmin):
+    search_fields = ('nombre',)
+
     def get_queryset(self, request):
-        qs = super().get_queryset(request)
+        qs = super().get_queryset(request).select_related('zona')
         if request.user.rol == 'superadmin':
             return qs
         return qs.filter(zona__proyecto__empresa=request.user.empresa)
 
-class ReporteAdmin(admin.ModelAdmin):
+class ReporteAdmin(TablaGrandeAdmin):
+    list_display = ('id', 'tipo', 'estado', 'encargado', 'proyecto', 'zona', 'sector', 'fecha_reporte')
+    list_filter = ('tipo', 'estado')
+    list_select_related = ('encargado', 'proyecto__empresa', 'zona__distrito', 'zona__proyecto', 'sector__zona')
+    search_fields = ('=id', 'encargado__dni')
+    autocomplete_fields = ('encargado', 'proyecto', 'zona', 'sector')
+    date_hierarchy = 'fecha_reporte'
+    ordering = ('-fecha_reporte',)
+
     def get_queryset(self, request):
         qs = super().get_queryset(request)
         if request.user.rol == 'superadmin':
@@ -103,11 +185,24 @@ class ReporteAdmin(admin.ModelAdmin):
 class DetallePosteElectricoAdmin(admin.ModelAdmin):
     list_display = ('reporte', 'codigo', 'tension', 'altura', 'propietario')
 
-class FotoReporteAdmin(admin.ModelAdmin):
-    list_display = ('reporte', 'tipo', 'latitud', 'longitud')
+class FotoReporteAdmin(TablaGrandeAdmin):
+    list_display = ('id', 'reporte', 'tipo', 'is_principal', 'latitud', 'longitud')
+    # Sin filtro por tipo (texto libre: SELECT DISTINCT sobre toda la tabla) ni
+    # date_hierarchy por la fecha del reporte (JOIN en cada carga)
+    list_filter = ('is_principal',)
+    list_select_related = ('reporte__encargado',)
+    search_fields = ('=reporte__id',)
+    autocomplete_fields = ('reporte',)
+    ordering = ('-id',)
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        if request.user.rol == 'superadmin':
+            return qs
+        return qs.filter(reporte__proyecto__empresa=request.user.empresa)
 
 # Registro
-admin.site.register(Empresa)
+admin.site.register(Empresa, EmpresaAdmin)
 admin.site.register(CustomUser, CustomUserAdmin)
 admin.site.register(Proyecto, ProyectoAdmin)
 admin.site.register(Zona, ZonaAdmin)
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from . import signals
+        from .db import configurar_sqlite
+
+        signals.conectar()
+        connection_created.connect(configurar_sqlite, dispatch_uid='core_configurar_sqlite')
@@ -0,0 +1,63 @@
+"""
+Backend PostgreSQL con pool de conexiones (psycopg2).
+
+Uso en settings.DATABASES:
+
+    'ENGINE': 'core.backends.postgresql_pool',
+    'CONN_MAX_AGE': 0,   # cada petición devuelve la conexión al pool
+    'POOL': {'min_size': 2, 'max_size': 10, 'timeout': 10, 'check_idle': 30, 'max_lifetime': 3600},
+
+Django sigue "abriendo" y "cerrando" la conexión por petición, pero en lugar de
+conectar/desconectar contra el servidor la toma y la devuelve al pool del proceso.
+"""
+import os
+import threading
+
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from .pool import ConnectionPool
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def _pool(self, conn_params):
+        # Clave por PID: tras un fork (gunicorn --preload) cada worker arma su propio pool.
+        # Los parámetros entran en la clave porque los tests cambian NAME sobre el mismo alias.
+        clave = (self.alias, os.getpid(), tuple(sorted((k, str(v)) for k, v in conn_params.items())))
+        pool = _pools.get(clave)
+        if pool is None:
+            with _pools_lock:
+                pool = _pools.get(clave)
+                if pool is None:
+                    opciones = self.settings_dict.get('POOL') or {}
+                    pool = ConnectionPool(
+                        lambda: super(DatabaseWrapper, self).get_new_connection(conn_params),
+                        min_size=int(opciones.get('min_size', 1)),
+                        max_size=int(opciones.get('max_size', 10)),
+                        timeout=float(opciones.get('timeout', 10)),
+                        check_idle=float(opciones.get('check_idle', 30)),
+                        max_lifetime=float(opciones.get('max_lifetime', 3600)),
+                    )
+                    _pools[clave] = pool
+        return pool
+
+    def get_new_connection(self, conn_params):
+        self._pool_actual = self._pool(conn_params)
+        conexion = self._pool_actual.obtener()
+        # El padre fija isolation_level al conectar; en una conexión reutilizada se calcula igual
+        nivel = self.settings_dict['OPTIONS'].get('isolation_level')
+        self.isolation_level = IsolationLevel(nivel) if nivel is not None else IsolationLevel.READ_COMMITTED
+        return conexion
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self._pool_actual.devolver(self.connection)
+
+    def pool_estado(self):
+        pool = getattr(self, '_pool_actual', None)
+        return pool.estado() if pool else None
@@ -0,0 +1,139 @@
+"""
+Pool de conexiones psycopg2 compartido por los hilos de un proceso.
+
+- min_size conexiones se abren al crear el pool; nunca se superan max_size.
+- Si no hay conexiones libres se espera hasta `timeout` segundos.
+- Antes de entregar una conexión que estuvo ociosa más de `check_idle` segundos
+  se verifica con `SELECT 1`; las rotas se descartan y se reemplazan.
+- Al devolverla se hace ROLLBACK de lo pendiente y RESET de PARAMETROS_SESION,
+  para que un SET (p. ej. statement_timeout) de una petición no contamine a la
+  siguiente. No se usa RESET ALL porque desharía client_encoding/TimeZone.
+"""
+import threading
+import time
+from collections import deque
+
+import psycopg2
+from psycopg2 import extensions
+
+
+class PoolAgotado(Exception):
+    """No se liberó ninguna conexión dentro del timeout."""
+
+
+class ConnectionPool:
+    PARAMETROS_SESION = ('statement_timeout', 'lock_timeout')
+
+    def __init__(self, factory, min_size=1, max_size=10, timeout=10.0, check_idle=30.0, max_lifetime=3600.0):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError('Se requiere 0 <= min_size <= max_size y max_size >= 1')
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_idle = check_idle
+        self.max_lifetime = max_lifetime
+
+        self._libres = deque()      # (conexion, devuelta_en)
+        self._creadas_en = {}       # id(conexion) -> monotonic
+        self._total = 0
+        self._cond = threading.Condition()
+
+        for _ in range(min_size):
+            conexion = self._crear()
+            self._libres.append((conexion, time.monotonic()))
+
+    def _crear(self):
+        conexion = self.factory()
+        self._creadas_en[id(conexion)] = time.monotonic()
+        self._total += 1
+        return conexion
+
+    def _descartar(self, conexion):
+        self._creadas_en.pop(id(conexion), None)
+        self._total -= 1
+        try:
+            conexion.close()
+        except psycopg2.Error:
+            pass
+
+    def _sana(self, conexion, devuelta_en):
+        if conexion.closed:
+            return False
+        ahora = time.monotonic()
+        if ahora - self._creadas_en.get(id(conexion), ahora) > self.max_lifetime:
+            return False
+        if ahora - devuelta_en < self.check_idle:
+            return True
+        try:
+            autocommit = conexion.autocommit
+            conexion.autocommit = True
+            with conexion.cursor() as cur:
+                cur.execute('SELECT 1')
+            conexion.autocommit = autocommit
+            return True
+        except psycopg2.Error:
+            return False
+
+    def obtener(self):
+        """Entrega una conexión sana; crea una nueva si hay cupo."""
+        limite = time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                while self._libres:
+                    conexion, devuelta_en = self._libres.pop()  # LIFO: la más caliente primero
+                    if self._sana(conexion, devuelta_en):
+                        return conexion
+                    self._descartar(conexion)
+                if self._total < self.max_size:
+                    # Se reserva el cupo antes de conectar para no pasarse de max_size
+                    self._total += 1
+                    break
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    raise PoolAgotado(f'Sin conexiones libres tras {self.timeout}s (max_size={self.max_size})')
+                self._cond.wait(restante)
+
+        try:
+            conexion = self.factory()
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._creadas_en[id(conexion)] = time.monotonic()
+        return conexion
+
+    def devolver(self, conexion):
+        """Limpia el estado de sesión y deja la conexión disponible (o la descarta si está rota)."""
+        sana = not conexion.closed
+        if sana:
+            try:
+                if conexion.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                    conexion.rollback()
+                autocommit = conexion.autocommit
+                conexion.autocommit = True
+                with conexion.cursor() as cur:
+                    for parametro in self.PARAMETROS_SESION:
+                        cur.execute(f'RESET {parametro}')
+                conexion.autocommit = autocommit
+            except psycopg2.Error:
+                sana = False
+
+        with self._cond:
+            if sana and self._total <= self.max_size:
+                self._libres.append((conexion, time.monotonic()))
+            else:
+                self._descartar(conexion)
+            self._cond.notify()
+
+    def cerrar(self):
+        with self._cond:
+            while self._libres:
+                conexion, _ = self._libres.pop()
+                self._descartar(conexion)
+
+    def estado(self):
+        with self._cond:
+            return {'total': self._total, 'libres': len(self._libres), 'max_size': self.max_size}
@@ -0,0 +1,130 @@
+"""
+Ajustes de conexión a la base de datos.
+
+SQLite (cuando no hay DATABASE_URL): al abrir cada conexión se aplican los
+PRAGMA de settings.SQLITE_PRAGMAS. Con WAL los lectores no se bloquean mientras
+un wizard guarda y busy_timeout hace que los escritores esperen en vez de
+fallar con "database is locked".
+
+PostgreSQL: cada vista puede declarar su statement_timeout (ver `statement_timeout`
+y StatementTimeoutMiddleware) para cortar consultas desbocadas.
+
+Presupuesto de consultas: cada vista puede declarar cuántas consultas SQL puede
+hacer por petición (ver `presupuesto_consultas` y PresupuestoConsultasMiddleware).
+`manage.py verificar_presupuestos` recorre las rutas con datos de prueba y falla
+si alguna vista se pasa.
+"""
+import re
+
+from django.conf import settings
+
+# Perfil por defecto para despliegues pequeños sobre SQLite
+PRAGMAS_PRODUCCION = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',      # seguro con WAL; solo se pierde la última transacción ante un corte de energía
+    'busy_timeout': 5000,         # ms esperando el lock de escritura
+    'cache_size': -20000,         # negativo = KiB (≈ 20 MB por conexión)
+    'mmap_size': 134217728,       # 128 MB de lectura por mmap
+    'temp_store': 'MEMORY',
+    'foreign_keys': 'ON',
+}
+
+
+def aplicar_pragmas(cursor, pragmas):
+    """Ejecuta los PRAGMA sobre un cursor DB-API (Django o sqlite3)."""
+    for nombre, valor in pragmas.items():
+        cursor.execute(f'PRAGMA {nombre}={valor}')
+
+
+def configurar_sqlite(sender, connection, **kwargs):
+    """Receptor de `connection_created`: aplica el perfil a las conexiones SQLite."""
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', None)
+    if not pragmas:
+        return
+    with connection.cursor() as cursor:
+        aplicar_pragmas(cursor, pragmas)
+
+
+def statement_timeout(valor):
+    """
+    Decorador para vistas (función o clase) que fija su statement_timeout.
+
+    Args:
+        valor: Milisegundos, o una clave de settings.DB_STATEMENT_TIMEOUTS
+               ('lectura', 'exportacion', ...). 0 desactiva el límite.
+
+    Ejemplo:
+        @statement_timeout('lectura')
+        @api_view(['GET'])
+        def mi_listado(request): ...
+    """
+    def decorador(vista):
+        vista.statement_timeout = valor
+        return vista
+    return decorador
+
+
+def resolver_statement_timeout(view_func):
+    """Devuelve el timeout en ms que corresponde a una vista (o el 'default' de settings)."""
+    timeouts = getattr(settings, 'DB_STATEMENT_TIMEOUTS', {})
+    valor = getattr(view_func, 'statement_timeout', None)
+    if valor is None:
+        clase = getattr(view_func, 'view_class', None) or getattr(view_func, 'cls', None)
+        valor = getattr(clase, 'statement_timeout', None)
+    if valor is None:
+        valor = 'default'
+    if isinstance(valor, str):
+        valor = timeouts.get(valor, 0)
+    return int(valor or 0)
+
+
+def presupuesto_consultas(maximo):
+    """
+    Decorador para vistas (función o clase) que fija cuántas consultas SQL puede
+    hacer en una petición.
+
+    Args:
+        maximo: Número de consultas, o una clave de settings.DB_PRESUPUESTOS_CONSULTAS.
+                0 desactiva el control.
+
+    Ejemplo:
+        @presupuesto_consultas(8)
+        @api_view(['GET'])
+        def mi_detalle(request, pk): ...
+    """
+    def decorador(vista):
+        vista.presupuesto_consultas = maximo
+        return vista
+    return decorador
+
+
+def resolver_presupuesto_consultas(view_func):
+    """Devuelve el máximo de consultas de una vista (o el 'default' de settings); 0 = sin límite."""
+    presupuestos = getattr(settings, 'DB_PRESUPUESTOS_CONSULTAS', {})
+    valor = getattr(view_func, 'presupuesto_consultas', None)
+    if valor is None:
+        clase = getattr(view_func, 'view_class', None) or getattr(view_func, 'cls', None)
+        valor = getattr(clase, 'presupuesto_consultas', None)
+    if valor is None:
+        valor = 'default'
+    if isinstance(valor, str):
+        valor = presupuestos.get(valor, 0)
+    return int(valor or 0)
+
+
+_RE_LISTA_IN = re.compile(r'\bIN \((?:%s|\?|[^()]*?)(?:, ?(?:%s|\?|[^()]*?))*\)', re.I)
+_RE_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_RE_ESPACIOS = re.compile(r'\s+')
+
+
+def huella_sql(sql):
+    """
+    Normaliza una consulta para agrupar las que solo difieren en valores:
+    literales -> ?, listas IN (...) colapsadas y espacios unificados.
+    Varias consultas con la misma huella en una petición suelen indicar un N+1.
+    """
+    sql = _RE_LITERAL.sub('?', sql)
+    sql = _RE_LISTA_IN.sub('IN (...)', sql)
+    return _RE_ESPACIOS.sub(' ', sql).strip()
@@ -0,0 +1,166 @@
+"""
+Soporte de la cabecera `Idempotency-Key` para POSTs que crean registros.
+
+La app móvil reintenta cuando pierde la respuesta; con la misma clave el servidor
+devuelve la respuesta original en lugar de crear otro wizard/reporte.
+
+    - Clave nueva: se reserva (estado en_proceso), se ejecuta la vista y se guarda
+      status + cuerpo si la respuesta no es 5xx.
+    - Clave repetida con el mismo contenido: se devuelve lo guardado con la
+      cabecera `Idempotent-Replayed: true`, sin ejecutar la vista.
+    - Clave repetida con otro contenido: 422.
+    - Clave todavía en proceso (reintento concurrente): 409 con Retry-After.
+    - Clave en proceso con la reserva vencida (el worker murió o se cortó por
+      timeout): el reintento la toma con un UPDATE condicional y ejecuta la vista.
+
+Las claves son por usuario y duran settings.IDEMPOTENCY_TTL_HORAS; la reserva
+en_proceso dura settings.IDEMPOTENCY_RESERVA_SEGUNDOS (más que el timeout del worker).
+`manage.py limpiar_idempotencia` borra las vencidas.
+"""
+import functools
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from .models.models_idempotencia import ClaveIdempotencia
+
+HEADER = 'HTTP_IDEMPOTENCY_KEY'
+MAX_LARGO_CLAVE = 255
+
+
+def _fingerprint(request):
+    """
+    Hash del contenido de la petición. Los archivos entran por nombre y tamaño:
+    no se leen, así un reintento con fotos no cuesta volver a procesarlas.
+    """
+    data = request.data
+    if hasattr(data, 'lists'):  # QueryDict (multipart / form)
+        campos = {k: v for k, v in data.lists() if k not in request.FILES}
+    else:
+        campos = data
+    archivos = {
+        k: [(f.name, f.size) for f in request.FILES.getlist(k)]
+        for k in request.FILES
+    }
+    contenido = json.dumps(
+        {'ruta': request.path, 'data': campos, 'archivos': archivos},
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+
+def _reserva(ahora):
+    return ahora + timedelta(seconds=getattr(settings, 'IDEMPOTENCY_RESERVA_SEGUNDOS', 120))
+
+
+def _tomar(registro, ahora):
+    """
+    Toma una clave en_proceso con la reserva vencida. El UPDATE condicional deja
+    pasar a un solo reintento aunque lleguen varios a la vez.
+    """
+    reserva = _reserva(ahora)
+    tomada = ClaveIdempotencia.objects.filter(
+        pk=registro.pk, estado='en_proceso', en_proceso_hasta=registro.en_proceso_hasta,
+    ).update(en_proceso_hasta=reserva)
+    if not tomada:
+        return False
+    registro.en_proceso_hasta = reserva
+    return True
+
+
+def _respuesta_guardada(registro):
+    response = Response(registro.respuesta, status=registro.status_code)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotente(vista):
+    """
+    Decorador para el handler de una vista DRF (función bajo @api_view o método
+    post de un APIView). Sin la cabecera la vista se comporta igual que siempre.
+    """
+    @functools.wraps(vista)
+    def envoltura(*args, **kwargs):
+        request = next(a for a in args if isinstance(a, Request))
+        clave = request.META.get(HEADER, '').strip()
+        if not clave or not request.user.is_authenticated:
+            return vista(*args, **kwargs)
+        if len(clave) > MAX_LARGO_CLAVE:
+            return Response({"detail": f"Idempotency-Key no puede superar {MAX_LARGO_CLAVE} caracteres."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        endpoint = f'{request.method} {request.path}'[:255]
+        fingerprint = _fingerprint(request)
+        ahora = timezone.now()
+
+        registro = ClaveIdempotencia.objects.filter(usuario=request.user, clave=clave).first()
+        if registro is not None and registro.expira_en <= ahora:
+            registro.delete()
+            registro = None
+
+        if registro is None:
+            try:
+                with transaction.atomic():
+                    registro = ClaveIdempotencia.objects.create(
+                        usuario=request.user,
+                        clave=clave,
+                        endpoint=endpoint,
+                        fingerprint=fingerprint,
+                        en_proceso_hasta=_reserva(ahora),
+                        expira_en=ahora + timedelta(hours=getattr(settings, 'IDEMPOTENCY_TTL_HORAS', 24)),
+                    )
+            except IntegrityError:
+                # Otro reintento la reservó entre el SELECT y el INSERT
+                registro = ClaveIdempotencia.objects.filter(usuario=request.user, clave=clave).first()
+                if registro is None:
+                    return vista(*args, **kwargs)
+            else:
+                return _ejecutar(vista, registro, args, kwargs)
+
+        if registro.fingerprint != fingerprint or registro.endpoint != endpoint:
+            return Response({"detail": "Idempotency-Key ya usada con otra petición."},
+                            status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        if registro.estado == 'en_proceso':
+            vencida = registro.en_proceso_hasta is None or registro.en_proceso_hasta <= ahora
+            if vencida and _tomar(registro, ahora):
+                return _ejecutar(vista, registro, args, kwargs)
+            response = Response({"detail": "La petición original todavía se está procesando."},
+                                status=status.HTTP_409_CONFLICT)
+            response['Retry-After'] = '1'
+            return response
+        return _respuesta_guardada(registro)
+
+    return envoltura
+
+
+def _ejecutar(vista, registro, args, kwargs):
+    # Solo se toca la fila mientras siga siendo nuestra reserva: si otro reintento
+    # la tomó por vencida, el que llegue tarde no la borra ni la pisa
+    propia = ClaveIdempotencia.objects.filter(
+        pk=registro.pk, estado='en_proceso', en_proceso_hasta=registro.en_proceso_hasta)
+    try:
+        response = vista(*args, **kwargs)
+    except Exception:
+        propia.delete()
+        raise
+
+    if response.status_code >= 500 or not hasattr(response, 'data'):
+        # Error del servidor: el cliente debe poder reintentar con la misma clave
+        propia.delete()
+        return response
+
+    # Se guarda ya serializado a JSON (fechas, Decimal) para devolverlo tal cual
+    propia.update(
+        respuesta=json.loads(JSONRenderer().render(response.data) or b'null'),
+        status_code=response.status_code,
+        estado='completado',
+    )
+    return response
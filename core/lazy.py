@@ -0,0 +1,35 @@
+"""
+Importación diferida de módulos pesados u opcionales.
+
+`lazy_import('modulo')` devuelve el módulo sin ejecutarlo: el import real ocurre
+en el primer acceso a un atributo. Así los workers no pagan al arrancar por
+librerías que solo usan unos pocos endpoints o comandos (generación del esquema
+OpenAPI, PDFs, etc.). Si el módulo no está instalado devuelve None, lo que sirve
+también para dependencias opcionales.
+"""
+import importlib.util
+import sys
+
+
+def lazy_import(nombre):
+    """
+    Args:
+        nombre: Nombre completo del módulo (p. ej. 'drf_yasg.codecs')
+
+    Returns:
+        El módulo (cargado en diferido) o None si no está instalado
+    """
+    if nombre in sys.modules:
+        return sys.modules[nombre]
+    try:
+        spec = importlib.util.find_spec(nombre)
+    except ModuleNotFoundError:  # paquete padre inexistente
+        return None
+    if spec is None:
+        return None
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[nombre] = modulo
+    loader.exec_module(modulo)
+    return modulo
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from core.services.archivo_frio import ArchivoFrioService
+
+
+class Command(BaseCommand):
+    help = ("Mueve encuestas publicadas antiguas (con sus partes y referencias a fotos) al "
+            "archivo frío .jsonl.gz, o rehidrata registros sueltos.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tipo", action="append", choices=sorted(ArchivoFrioService.TIPOS),
+                            help="Tipos a archivar (repetible; por defecto todos).")
+        parser.add_argument("--dias", type=int, default=None,
+                            help="Antigüedad mínima sin cambios (por defecto ARCHIVO_FRIO_DIAS).")
+        parser.add_argument("--empresa", type=int, help="Solo esta empresa.")
+        parser.add_argument("--proyecto", type=int, help="Solo este proyecto (reportes).")
+        parser.add_argument("--incluir-proyectos-activos", action="store_true",
+                            help="Archiva reportes aunque su proyecto siga activo.")
+        parser.add_argument("--lote", type=int, default=ArchivoFrioService.LOTE,
+                            help="Registros por transacción.")
+        parser.add_argument("--simular", action="store_true",
+                            help="Solo cuenta los candidatos.")
+        parser.add_argument("--rehidratar", action="append", metavar="TIPO:ID",
+                            help="Devuelve un registro archivado a las tablas vivas (repetible).")
+
+    def handle(self, *args, **opts):
+        if opts["rehidratar"]:
+            for valor in opts["rehidratar"]:
+                tipo, _, objeto_id = valor.partition(":")
+                if tipo not in ArchivoFrioService.TIPOS or not objeto_id:
+                    raise CommandError(f"Formato TIPO:ID inválido: {valor}")
+                try:
+                    ok = ArchivoFrioService.rehidratar(tipo, objeto_id)
+                except IntegrityError as e:
+                    raise CommandError(f"No se pudo rehidratar {valor}: {e}")
+                self.stdout.write(f"{valor}: {'rehidratado' if ok else 'no está archivado'}")
+            return
+
+        for tipo in opts["tipo"] or ArchivoFrioService.TIPOS:
+            qs = ArchivoFrioService.candidatos(
+                tipo, dias=opts["dias"], empresa_id=opts["empresa"], proyecto_id=opts["proyecto"],
+                incluir_proyectos_activos=opts["incluir_proyectos_activos"],
+            )
+            if opts["simular"]:
+                self.stdout.write(f"{tipo}: {qs.count()} candidatos")
+                continue
+            resultado = ArchivoFrioService.archivar(
+                tipo, qs, lote=opts["lote"],
+                al_terminar_lote=lambda n, t=tipo: self.stdout.write(f"  {t}: {n} archivados"),
+            )
+            for omitido in resultado["omitidos"]:
+                self.stderr.write(f"{tipo} {omitido['id']}: {omitido['motivo']}")
+            self.stdout.write(self.style.SUCCESS(
+                f"{tipo}: {resultado['archivados']} archivados en {len(resultado['archivos'])} archivos"))
@@ -0,0 +1,115 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+ESQUEMA = 'bench_particiones'
+
+CONSULTAS = (
+    ('último mes', "SELECT count(*) FROM {t} WHERE creado_en >= now() - interval '1 month'"),
+    ('3 meses, un encargado', "SELECT id, creado_en FROM {t} WHERE encargado_id = 7 "
+                              "AND creado_en >= now() - interval '3 months' ORDER BY creado_en DESC LIMIT 50"),
+    ('un mes de hace un año', "SELECT count(*), max(payload) FROM {t} "
+                              "WHERE creado_en >= now() - interval '13 months' "
+                              "AND creado_en < now() - interval '12 months'"),
+)
+
+
+class Command(BaseCommand):
+    help = ("Benchmark de particionado mensual en PostgreSQL: consultas por rango de fecha, "
+            "tamaño de índices y archivado de un mes, tabla plana frente a particionada. "
+            f"Usa tablas sintéticas en el esquema {ESQUEMA}, que se borra al terminar.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, default=500000, help='Filas de cada tabla.')
+        parser.add_argument('--meses', type=int, default=24, help='Meses de historia.')
+        parser.add_argument('--repeticiones', type=int, default=7, help='Ejecuciones por consulta.')
+
+    def _preparar(self, cursor, filas, meses):
+        cursor.execute(f'DROP SCHEMA IF EXISTS {ESQUEMA} CASCADE')
+        cursor.execute(f'CREATE SCHEMA {ESQUEMA}')
+        columnas = '(id bigint NOT NULL, encargado_id integer NOT NULL, creado_en timestamptz NOT NULL, payload text)'
+        cursor.execute(f'CREATE TABLE {ESQUEMA}.plana {columnas}')
+        cursor.execute(f'CREATE TABLE {ESQUEMA}.particionada {columnas} PARTITION BY RANGE (creado_en)')
+        for n in range(-meses, 2):
+            cursor.execute(
+                f"SELECT date_trunc('month', now()) + make_interval(months => %s), "
+                f"date_trunc('month', now()) + make_interval(months => %s)", [n, n + 1])
+            desde, hasta = cursor.fetchone()
+            cursor.execute(
+                f'CREATE TABLE {ESQUEMA}.particionada_{n + meses} PARTITION OF {ESQUEMA}.particionada '
+                f'FOR VALUES FROM (%s) TO (%s)', [desde, hasta])
+        # Fechas uniformes desde el primer día de hace `meses` meses hasta ahora
+        datos = ("SELECT g, g %% 200, o.inicio + random() * (now() - o.inicio), md5(g::text) "
+                 "FROM generate_series(1, %s) g, "
+                 "(SELECT date_trunc('month', now()) - make_interval(months => %s) AS inicio) o")
+        cursor.execute(f'INSERT INTO {ESQUEMA}.plana {datos}', [filas, meses])
+        cursor.execute(f'INSERT INTO {ESQUEMA}.particionada SELECT * FROM {ESQUEMA}.plana')
+        for tabla in ('plana', 'particionada'):
+            cursor.execute(f'ALTER TABLE {ESQUEMA}.{tabla} ADD PRIMARY KEY (id, creado_en)')
+            cursor.execute(f'CREATE INDEX ON {ESQUEMA}.{tabla} (creado_en)')
+            cursor.execute(f'CREATE INDEX ON {ESQUEMA}.{tabla} (encargado_id, creado_en)')
+            cursor.execute(f'ANALYZE {ESQUEMA}.{tabla}')
+
+    def _tamano_indices(self, cursor, tabla):
+        # pg_partition_tree no devuelve filas para una tabla sin particionar
+        cursor.execute(
+            "SELECT coalesce((SELECT sum(pg_indexes_size(relid)) FROM pg_partition_tree(%s)), "
+            "pg_indexes_size(%s::regclass))", [f'{ESQUEMA}.{tabla}'] * 2)
+        return cursor.fetchone()[0]
+
+    def _medir(self, cursor, sql, repeticiones):
+        cursor.execute(sql)  # calienta caché y plan
+        cursor.fetchall()
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            cursor.execute(sql)
+            cursor.fetchall()
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        return statistics.median(tiempos)
+
+    def _buffers(self, cursor, sql):
+        cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}')
+        plan = cursor.fetchone()[0]
+        plan = plan[0] if isinstance(plan, list) else plan
+        return plan['Plan'].get('Shared Hit Blocks', 0) + plan['Plan'].get('Shared Read Blocks', 0)
+
+    def handle(self, *args, **opts):
+        if connection.vendor != 'postgresql':
+            raise CommandError("Este benchmark requiere PostgreSQL.")
+        with connection.cursor() as cursor:
+            self.stdout.write(f"Preparando {opts['filas']} filas en {opts['meses']} meses...")
+            self._preparar(cursor, opts['filas'], opts['meses'])
+            try:
+                self.stdout.write(f"\n{'consulta':<26} {'plana ms':>10} {'part. ms':>10} "
+                                  f"{'plana blq':>10} {'part. blq':>10}")
+                for nombre, sql in CONSULTAS:
+                    plana, part = (sql.format(t=f'{ESQUEMA}.{t}') for t in ('plana', 'particionada'))
+                    self.stdout.write(
+                        f"{nombre:<26} {self._medir(cursor, plana, opts['repeticiones']):>10.2f} "
+                        f"{self._medir(cursor, part, opts['repeticiones']):>10.2f} "
+                        f"{self._buffers(cursor, plana):>10} {self._buffers(cursor, part):>10}")
+
+                self.stdout.write("\nÍndices (MB): plana {:.1f} / particionada {:.1f}".format(
+                    self._tamano_indices(cursor, 'plana') / 1048576,
+                    self._tamano_indices(cursor, 'particionada') / 1048576))
+
+                # Archivar el mes más viejo: DELETE por rango frente a DETACH + DROP
+                cursor.execute(f"SELECT min(creado_en) FROM {ESQUEMA}.plana")
+                cursor.execute(f"SELECT date_trunc('month', %s::timestamptz) + interval '1 month'",
+                               [cursor.fetchone()[0]])
+                corte = cursor.fetchone()[0]
+                inicio = time.perf_counter()
+                cursor.execute(f'DELETE FROM {ESQUEMA}.plana WHERE creado_en < %s', [corte])
+                borradas = cursor.rowcount
+                t_delete = (time.perf_counter() - inicio) * 1000
+                inicio = time.perf_counter()
+                cursor.execute(f'ALTER TABLE {ESQUEMA}.particionada DETACH PARTITION {ESQUEMA}.particionada_0')
+                cursor.execute(f'DROP TABLE {ESQUEMA}.particionada_0')
+                t_detach = (time.perf_counter() - inicio) * 1000
+                self.stdout.write(f"Archivar el mes más viejo ({borradas} filas): DELETE {t_delete:.1f} ms "
+                                  f"(deja filas muertas para VACUUM) / DETACH + DROP {t_detach:.1f} ms")
+            finally:
+                cursor.execute(f'DROP SCHEMA IF EXISTS {ESQUEMA} CASCADE')
@@ -0,0 +1,74 @@
+import gzip
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from core.models.models import CustomUser
+from core.renderers import FastJSONRenderer, orjson
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+RUTAS_POR_DEFECTO = [
+    '/api/predios/reportes/list/?page_size=100',
+    '/api/catalogos/arbol',
+    '/api/wizard/poste-electrico/listar/?page_size=100',
+]
+
+
+class Command(BaseCommand):
+    help = ("Mide bytes en la red (identity/gzip/br) y CPU de serialización "
+            "(JSONRenderer de DRF vs FastJSONRenderer) para endpoints de la API.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dni', required=True, help='DNI del usuario con el que se hacen las peticiones.')
+        parser.add_argument('--ruta', action='append', dest='rutas',
+                            help='Ruta a medir (repetible). Por defecto los listados más pesados.')
+        parser.add_argument('--repeticiones', type=int, default=50, help='Iteraciones por medición de CPU.')
+
+    def _cronometrar(self, fn, repeticiones):
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            resultado = fn()
+        return (time.perf_counter() - inicio) * 1000 / repeticiones, resultado
+
+    def handle(self, *args, **opts):
+        try:
+            user = CustomUser.objects.get(dni=opts['dni'])
+        except CustomUser.DoesNotExist:
+            raise CommandError(f"No existe el usuario con DNI {opts['dni']}")
+
+        client = APIClient(SERVER_NAME=(settings.ALLOWED_HOSTS or ['localhost'])[0])
+        client.force_authenticate(user)
+        rep = opts['repeticiones']
+        drf, rapido = JSONRenderer(), FastJSONRenderer()
+        quality = getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 5)
+        level = getattr(settings, 'COMPRESSION_GZIP_LEVEL', 6)
+
+        self.stdout.write(f"orjson: {'sí' if orjson else 'no'} | brotli: {'sí' if brotli else 'no'} | repeticiones: {rep}")
+        for ruta in opts['rutas'] or RUTAS_POR_DEFECTO:
+            response = client.get(ruta, HTTP_ACCEPT_ENCODING='identity')
+            if response.status_code != 200 or not hasattr(response, 'data'):
+                self.stdout.write(self.style.WARNING(f"{ruta}: HTTP {response.status_code}, se omite"))
+                continue
+            data = response.data
+
+            ms_drf, cuerpo = self._cronometrar(lambda: drf.render(data), rep)
+            ms_rapido, _ = self._cronometrar(lambda: rapido.render(data), rep)
+            ms_gzip, comprimido_gz = self._cronometrar(lambda: gzip.compress(cuerpo, compresslevel=level), rep)
+            linea = (f"{ruta}\n"
+                     f"  bytes: identity={len(cuerpo)} gzip={len(comprimido_gz)}")
+            if brotli is not None:
+                ms_br, comprimido_br = self._cronometrar(lambda: brotli.compress(cuerpo, quality=quality), rep)
+                linea += f" br={len(comprimido_br)}"
+            linea += (f"\n  render: drf={ms_drf:.2f}ms rápido={ms_rapido:.2f}ms"
+                      f" (x{ms_drf / ms_rapido if ms_rapido else 0:.1f})"
+                      f"\n  compresión: gzip={ms_gzip:.2f}ms")
+            if brotli is not None:
+                linea += f" br={ms_br:.2f}ms"
+            self.stdout.write(linea)
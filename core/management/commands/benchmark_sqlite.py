@@ -0,0 +1,103 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.db import PRAGMAS_PRODUCCION, aplicar_pragmas
+
+PAYLOAD = '{"elementos_electricos": [1, 2, 3], "elementos_telematicos": [6, 8]}'
+
+
+class Command(BaseCommand):
+    help = ("Benchmark de concurrencia SQLite: throughput de lectores y escritores con los "
+            "valores por defecto de SQLite frente al perfil de producción (WAL + PRAGMA).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lectores', type=int, default=4, help='Hilos lectores.')
+        parser.add_argument('--escritores', type=int, default=2, help='Hilos escritores.')
+        parser.add_argument('--segundos', type=float, default=5.0, help='Duración de cada corrida.')
+        parser.add_argument('--filas', type=int, default=20000, help='Filas iniciales de la tabla.')
+
+    def _conectar(self, ruta, pragmas):
+        # timeout=0: el único tiempo de espera es el busy_timeout del perfil
+        conn = sqlite3.connect(ruta, timeout=0, isolation_level=None, check_same_thread=False)
+        aplicar_pragmas(conn.cursor(), pragmas)
+        return conn
+
+    def _preparar(self, ruta, pragmas, filas):
+        conn = self._conectar(ruta, pragmas)
+        conn.execute('CREATE TABLE wizard (id INTEGER PRIMARY KEY, encargado_id INTEGER, '
+                     'codigo TEXT, payload TEXT, actualizado_en REAL)')
+        conn.execute('CREATE INDEX wizard_enc_act ON wizard (encargado_id, actualizado_en)')
+        conn.execute('BEGIN')
+        conn.executemany('INSERT INTO wizard (encargado_id, codigo, payload, actualizado_en) VALUES (?, ?, ?, ?)',
+                         ((i % 50, f'P-{i}', PAYLOAD, time.time()) for i in range(filas)))
+        conn.execute('COMMIT')
+        conn.close()
+
+    def _correr(self, pragmas, opts):
+        with tempfile.TemporaryDirectory() as tmp:
+            ruta = os.path.join(tmp, 'bench.sqlite3')
+            self._preparar(ruta, pragmas, opts['filas'])
+            fin = time.monotonic() + opts['segundos']
+            conteo = {'lecturas': 0, 'escrituras': 0, 'bloqueos': 0}
+            lock = threading.Lock()
+
+            def sumar(clave, n=1):
+                with lock:
+                    conteo[clave] += n
+
+            def lector(idx):
+                conn = self._conectar(ruta, pragmas)
+                while time.monotonic() < fin:
+                    try:
+                        conn.execute('SELECT id, codigo, actualizado_en FROM wizard WHERE encargado_id = ? '
+                                     'ORDER BY actualizado_en DESC LIMIT 20', (idx % 50,)).fetchall()
+                        sumar('lecturas')
+                    except sqlite3.OperationalError:
+                        sumar('bloqueos')
+                conn.close()
+
+            def escritor(idx):
+                conn = self._conectar(ruta, pragmas)
+                i = 0
+                while time.monotonic() < fin:
+                    try:
+                        # Igual que un guardado de wizard: una transacción corta con un par de sentencias
+                        conn.execute('BEGIN IMMEDIATE')
+                        conn.execute('UPDATE wizard SET payload = ?, actualizado_en = ? WHERE id = ?',
+                                     (PAYLOAD, time.time(), (idx * 7919 + i) % opts['filas'] + 1))
+                        conn.execute('INSERT INTO wizard (encargado_id, codigo, payload, actualizado_en) '
+                                     'VALUES (?, ?, ?, ?)', (idx, f'W-{idx}-{i}', PAYLOAD, time.time()))
+                        conn.execute('COMMIT')
+                        sumar('escrituras')
+                    except sqlite3.OperationalError:
+                        if conn.in_transaction:
+                            conn.execute('ROLLBACK')
+                        sumar('bloqueos')
+                    i += 1
+                conn.close()
+
+            hilos = ([threading.Thread(target=lector, args=(i,)) for i in range(opts['lectores'])]
+                     + [threading.Thread(target=escritor, args=(i,)) for i in range(opts['escritores'])])
+            for h in hilos:
+                h.start()
+            for h in hilos:
+                h.join()
+        seg = opts['segundos']
+        return {k: v / seg for k, v in conteo.items()}
+
+    def handle(self, *args, **opts):
+        self.stdout.write(f"SQLite {sqlite3.sqlite_version} | lectores={opts['lectores']} "
+                          f"escritores={opts['escritores']} | {opts['segundos']}s por corrida")
+        perfiles = (
+            ('por defecto', {'busy_timeout': 5000}),  # mismo timeout para comparar solo journaling/caché
+            ('producción', PRAGMAS_PRODUCCION),
+        )
+        for nombre, pragmas in perfiles:
+            r = self._correr(pragmas, opts)
+            self.stdout.write(f"  {nombre:<12} lecturas/s={r['lecturas']:9.0f}  "
+                              f"escrituras/s={r['escrituras']:7.0f}  bloqueos/s={r['bloqueos']:6.1f}")
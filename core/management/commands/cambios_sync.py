@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from core.services.sync_feed import SyncFeedService
+
+
+class Command(BaseCommand):
+    help = "Mantenimiento del change-feed de sincronización (CambioSync)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sembrar", action="store_true",
+                            help="Registra un upsert por cada fila existente (carga inicial con after=0).")
+        parser.add_argument("--compactar", action="store_true",
+                            help="Elimina entradas superadas por un cambio posterior del mismo objeto.")
+        parser.add_argument("--batch-size", type=int, default=1000,
+                            help="Tamaño de lote para bulk_create.")
+
+    def handle(self, *args, **opts):
+        if not (opts["sembrar"] or opts["compactar"]):
+            raise CommandError("Indica --sembrar y/o --compactar.")
+        if opts["sembrar"]:
+            total = SyncFeedService.sembrar(batch_size=opts["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"Cambios sembrados: {total}"))
+        if opts["compactar"]:
+            total = SyncFeedService.compactar()
+            self.stdout.write(self.style.SUCCESS(f"Entradas eliminadas: {total}"))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from vot_core import openapi
+
+
+class Command(BaseCommand):
+    help = ("Genera el esquema OpenAPI (JSON y YAML) una sola vez y lo deja versionado "
+            "en OPENAPI_SCHEMA_DIR para servirlo sin introspección.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--destino", help="Directorio de salida (por defecto OPENAPI_SCHEMA_DIR).")
+
+    def handle(self, *args, **opts):
+        manifest = openapi.generar(opts.get("destino"))
+        self.stdout.write(self.style.SUCCESS(
+            f"Esquema {manifest['version']} generado: {manifest['json']}, {manifest['yaml']}"
+        ))
@@ -0,0 +1,102 @@
+import itertools
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models.models_importacion import ImportacionLegado
+from core.services.importacion_reportes import ImportacionReportesService
+
+
+class Command(BaseCommand):
+    help = ("Importa reportes históricos (Reporte + DetallePredio + fotos) desde CSV o JSONL "
+            "por lotes, con punto de control para retomar si se interrumpe.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("archivo", help="Ruta del archivo .csv o .jsonl")
+        parser.add_argument("--formato", choices=["csv", "jsonl"],
+                            help="Formato del archivo (por defecto según la extensión).")
+        parser.add_argument("--nombre",
+                            help="Nombre del punto de control (por defecto el nombre del archivo).")
+        parser.add_argument("--lote", type=int, default=ImportacionReportesService.LOTE,
+                            help="Filas por transacción.")
+        parser.add_argument("--workers", type=int, default=ImportacionReportesService.WORKERS_FOTOS,
+                            help="Hilos para copiar fotos.")
+        parser.add_argument("--fotos-dir",
+                            help="Carpeta base de las rutas de la columna fotos.")
+        parser.add_argument("--reiniciar", action="store_true",
+                            help="Descarta el punto de control y empieza desde la primera fila "
+                                 "(no borra lo ya importado).")
+        parser.add_argument("--sin-copy", action="store_true",
+                            help="En PostgreSQL usa bulk_create en lugar de COPY.")
+        parser.add_argument("--sin-sync", action="store_true",
+                            help="No registra los reportes en el feed de sincronización.")
+        parser.add_argument("--errores",
+                            help="Archivo .jsonl donde escribir las filas rechazadas.")
+
+    def handle(self, *args, **opts):
+        ruta = opts["archivo"]
+        if not os.path.isfile(ruta):
+            raise CommandError(f"No existe el archivo {ruta}")
+        formato = opts["formato"] or os.path.splitext(ruta)[1].lstrip(".").lower()
+        if formato not in ("csv", "jsonl"):
+            raise CommandError("Indica --formato csv o jsonl.")
+        if opts["lote"] < 1:
+            raise CommandError("--lote debe ser mayor que 0.")
+        if opts["fotos_dir"] and not os.path.isdir(opts["fotos_dir"]):
+            raise CommandError(f"No existe la carpeta {opts['fotos_dir']}")
+
+        nombre = opts["nombre"] or os.path.basename(ruta)
+        importacion, creada = ImportacionLegado.objects.get_or_create(
+            nombre=nombre, defaults={"archivo": os.path.abspath(ruta)})
+        if opts["reiniciar"] and not creada:
+            importacion.estado = "en_curso"
+            importacion.filas_procesadas = importacion.reportes_creados = 0
+            importacion.fotos_copiadas = importacion.filas_con_error = 0
+            importacion.save()
+        elif importacion.estado == "terminada":
+            self.stdout.write(self.style.WARNING(
+                f"La importación '{nombre}' ya terminó ({importacion.reportes_creados} reportes). "
+                "Usa --reiniciar para repetirla."))
+            return
+        elif importacion.filas_procesadas:
+            self.stdout.write(f"Retomando '{nombre}' desde la fila {importacion.filas_procesadas + 1}")
+
+        servicio = ImportacionReportesService(
+            importacion,
+            fotos_dir=opts["fotos_dir"],
+            lote=opts["lote"],
+            workers=opts["workers"],
+            usar_copy=False if opts["sin_copy"] else None,
+            registrar_sync=not opts["sin_sync"],
+        )
+        salida_errores = open(opts["errores"], "a", encoding="utf-8") if opts["errores"] else None
+
+        def progreso(lote):
+            for error in lote["errores"]:
+                if salida_errores:
+                    salida_errores.write(json.dumps(error, ensure_ascii=False) + "\n")
+                elif opts["verbosity"] > 1:
+                    self.stderr.write(f"Fila {error['fila']}: {'; '.join(error['errores'])}")
+            self.stdout.write(
+                f"  hasta fila {lote['hasta_fila']}: {lote['creados']} reportes, "
+                f"{lote['fotos']} fotos, {len(lote['errores'])} con errores")
+
+        try:
+            filas = itertools.islice(
+                ImportacionReportesService.leer(ruta, formato), importacion.filas_procesadas, None)
+            resultado = servicio.importar(filas, al_terminar_lote=progreso)
+        except (OSError, UnicodeDecodeError) as e:
+            raise CommandError(str(e))
+        finally:
+            if salida_errores:
+                salida_errores.close()
+
+        modo = "COPY" if servicio.usar_copy else "bulk_create"
+        self.stdout.write(self.style.SUCCESS(
+            f"{resultado['creados']} reportes y {resultado['fotos']} fotos importados "
+            f"({resultado['procesadas']} filas, {modo})"))
+        if resultado["errores"]:
+            self.stdout.write(self.style.WARNING(
+                f"{len(resultado['errores'])} filas con errores o fotos faltantes"
+                + (f" (ver {opts['errores']})" if opts["errores"] else " (usa --errores o -v 2)")))
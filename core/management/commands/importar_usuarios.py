@@ -0,0 +1,48 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from core.services.importacion_usuarios import ImportacionUsuariosService
+
+
+class Command(BaseCommand):
+    help = "Importa usuarios en bloque desde un archivo CSV o JSON (todo o nada)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("archivo", help="Ruta del archivo .csv o .json")
+        parser.add_argument("--formato", choices=["csv", "json"],
+                            help="Formato del archivo (por defecto según la extensión).")
+        parser.add_argument("--empresa-id", type=int,
+                            help="Fuerza la empresa de todas las filas.")
+        parser.add_argument("--password-defecto",
+                            help="Contraseña para las filas sin columna password.")
+        parser.add_argument("--workers", type=int,
+                            help="Procesos para hashear contraseñas (por defecto: nº de CPUs).")
+        parser.add_argument("--validar", action="store_true",
+                            help="Solo valida, no crea usuarios.")
+
+    def handle(self, *args, **opts):
+        ruta = opts["archivo"]
+        formato = opts["formato"] or os.path.splitext(ruta)[1].lstrip(".").lower()
+        try:
+            with open(ruta, "rb") as f:
+                filas = ImportacionUsuariosService.leer(f.read(), formato)
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        servicio = ImportacionUsuariosService(
+            empresa_id=opts["empresa_id"],
+            password_defecto=opts["password_defecto"],
+            workers=opts["workers"],
+            # Proceso de un solo hilo: fork es seguro y arranca más rápido
+            metodo_procesos="fork",
+        )
+        resultado = servicio.importar(filas, solo_validar=opts["validar"])
+
+        for error in resultado["errores"]:
+            self.stderr.write(f"Fila {error['fila']} ({error['dni']}): {'; '.join(error['errores'])}")
+        if resultado["errores"]:
+            raise CommandError(f"{len(resultado['errores'])} filas con errores; no se creó ningún usuario.")
+        if opts["validar"]:
+            self.stdout.write(self.style.SUCCESS(f"{resultado['total']} filas válidas"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"{resultado['creados']} usuarios creados"))
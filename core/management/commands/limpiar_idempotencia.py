@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models.models_idempotencia import ClaveIdempotencia
+
+
+class Command(BaseCommand):
+    help = "Elimina las claves de idempotencia vencidas (Idempotency-Key)."
+
+    def handle(self, *args, **opts):
+        borrados, _ = ClaveIdempotencia.objects.filter(expira_en__lte=timezone.now()).delete()
+        self.stdout.write(self.style.SUCCESS(f"Claves vencidas eliminadas: {borrados}"))
@@ -0,0 +1,88 @@
+from datetime import datetime
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.particiones import ParticionesService
+
+
+class Command(BaseCommand):
+    help = ("Particionado mensual opcional en PostgreSQL de las tablas de "
+            "settings.PARTICIONES_MENSUALES: conversión, particiones futuras y archivo. "
+            "Sin opciones muestra el estado.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tabla", action="append", metavar="app.Modelo[:campo]",
+                            help="Limita a estos modelos (repetible). Con :campo se puede "
+                                 "diagnosticar un modelo fuera de la configuración.")
+        parser.add_argument("--convertir", action="store_true",
+                            help="Convierte las tablas planas en particionadas (bloquea la tabla).")
+        parser.add_argument("--crear-futuras", action="store_true",
+                            help="Crea las particiones del mes actual y los siguientes (para cron).")
+        parser.add_argument("--meses", type=int, default=None,
+                            help="Meses futuros a crear (por defecto PARTICIONES_MESES_FUTUROS).")
+        parser.add_argument("--archivar-antes", metavar="AAAA-MM",
+                            help="Separa las particiones de meses anteriores al indicado.")
+        parser.add_argument("--eliminar", action="store_true",
+                            help="Con --archivar-antes, borra las particiones en vez de moverlas "
+                                 "al esquema de archivo.")
+
+    def _tablas(self, opts):
+        configuradas = ParticionesService.configuradas()
+        if not opts["tabla"]:
+            return configuradas
+        por_etiqueta = {m._meta.label_lower: (m, c) for m, c in configuradas}
+        elegidas = []
+        for valor in opts["tabla"]:
+            etiqueta, _, campo = valor.partition(":")
+            try:
+                modelo = apps.get_model(etiqueta)
+            except (LookupError, ValueError):
+                raise CommandError(f"Modelo desconocido: {etiqueta}")
+            if not campo:
+                if modelo._meta.label_lower not in por_etiqueta:
+                    raise CommandError(f"{etiqueta} no está en PARTICIONES_MENSUALES; indica {etiqueta}:campo.")
+                campo = por_etiqueta[modelo._meta.label_lower][1]
+            elegidas.append((modelo, campo))
+        return elegidas
+
+    def handle(self, *args, **opts):
+        if not ParticionesService.disponible():
+            raise CommandError("El particionado solo está disponible con PostgreSQL.")
+        antes = None
+        if opts["archivar_antes"]:
+            try:
+                antes = datetime.strptime(opts["archivar_antes"], "%Y-%m").date()
+            except ValueError:
+                raise CommandError("--archivar-antes debe tener el formato AAAA-MM.")
+        if opts["eliminar"] and not antes:
+            raise CommandError("--eliminar solo se usa con --archivar-antes.")
+
+        for modelo, campo in self._tablas(opts):
+            tabla = modelo._meta.db_table
+            if opts["convertir"] and not ParticionesService.esta_particionada(tabla):
+                try:
+                    creadas = ParticionesService.convertir(modelo, campo, opts["meses"])
+                except ValueError as e:
+                    self.stderr.write(self.style.ERROR(f"{tabla}: {e}"))
+                    continue
+                self.stdout.write(self.style.SUCCESS(f"{tabla}: particionada por {campo} ({creadas} meses)"))
+
+            if not ParticionesService.esta_particionada(tabla):
+                motivos = ParticionesService.impedimentos(modelo, campo)
+                estado = "no convertible: " + " ".join(motivos) if motivos else "plana (usa --convertir)"
+                self.stdout.write(f"{tabla}: {estado}")
+                continue
+
+            if opts["crear_futuras"]:
+                creadas = ParticionesService.crear_futuras(tabla, opts["meses"])
+                self.stdout.write(f"{tabla}: {len(creadas)} particiones nuevas {' '.join(creadas)}".rstrip())
+            if antes:
+                archivadas = ParticionesService.archivar(tabla, antes, eliminar=opts["eliminar"])
+                accion = "eliminadas" if opts["eliminar"] else f"movidas a {ParticionesService.esquema_archivo()}"
+                self.stdout.write(f"{tabla}: {len(archivadas)} particiones {accion} {' '.join(archivadas)}".rstrip())
+            if not (opts["crear_futuras"] or antes or opts["convertir"]):
+                particiones = ParticionesService.particiones(tabla)
+                self.stdout.write(f"{tabla}: particionada por {campo}, {len(particiones)} particiones")
+                for p in particiones:
+                    self.stdout.write(f"  {p['nombre']:<45} ~{p['filas']:>10} filas {p['bytes'] / 1024:>10.0f} KB")
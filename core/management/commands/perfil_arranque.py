@@ -0,0 +1,102 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+# Se ejecuta en un proceso limpio: este comando ya arrancó Django y sus imports no cuentan
+SCRIPT_ARRANQUE = r"""
+import json, os, sys, time
+t0 = time.perf_counter()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vot_core.settings')
+from django.conf import settings
+settings.INSTALLED_APPS
+t1 = time.perf_counter()
+import django
+django.setup()
+t2 = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+t3 = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+t4 = time.perf_counter()
+print(json.dumps({
+    'settings_ms': (t1 - t0) * 1000,
+    'apps_ready_ms': (t2 - t1) * 1000,
+    'urlconf_ms': (t3 - t2) * 1000,
+    'wsgi_ms': (t4 - t3) * 1000,
+    'total_ms': (t4 - t0) * 1000,
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = ("Perfila el arranque de un worker: tiempo de settings, apps.ready, URLconf y WSGI, "
+            "y costo de import por módulo (python -X importtime).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=25, help='Cantidad de módulos a listar.')
+        parser.add_argument('--agrupar', choices=['modulo', 'paquete'], default='paquete',
+                            help='Agrupa el costo por módulo o por paquete de primer nivel.')
+        parser.add_argument('--orden', choices=['propio', 'acumulado'], default='propio',
+                            help='Ordena por tiempo propio o acumulado (incluye sub-imports).')
+        parser.add_argument('--json', action='store_true', help='Salida en JSON.')
+
+    def _parsear_importtime(self, stderr):
+        """Devuelve [(modulo, propio_us, acumulado_us)] de la salida de -X importtime."""
+        filas = []
+        for linea in stderr.splitlines():
+            if not linea.startswith('import time:') or 'self [us]' in linea:
+                continue
+            try:
+                propio, acumulado, nombre = [p.strip() for p in linea.replace('import time:', '', 1).split('|')]
+            except ValueError:
+                continue
+            filas.append((nombre, int(propio), int(acumulado)))
+        return filas
+
+    def handle(self, *args, **opts):
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', SCRIPT_ARRANQUE],
+            capture_output=True, text=True, env=os.environ.copy(),
+        )
+        if proc.returncode != 0:
+            raise CommandError(f"El arranque falló:\n{proc.stderr[-2000:]}")
+        fases = json.loads(proc.stdout.strip().splitlines()[-1])
+        filas = self._parsear_importtime(proc.stderr)
+
+        if opts['agrupar'] == 'paquete':
+            # Solo el tiempo propio se puede sumar sin contar dos veces
+            por_paquete = defaultdict(lambda: [0, 0])
+            for nombre, propio, _ in filas:
+                paquete = nombre.split('.')[0]
+                por_paquete[paquete][0] += propio
+                por_paquete[paquete][1] += 1
+            ranking = sorted(((p, us, n) for p, (us, n) in por_paquete.items()), key=lambda f: -f[1])
+            encabezado = ('paquete', 'propio_ms', 'modulos')
+            ranking = [(p, us / 1000, n) for p, us, n in ranking[:opts['top']]]
+        else:
+            idx = 1 if opts['orden'] == 'propio' else 2
+            ranking = sorted(filas, key=lambda f: -f[idx])[:opts['top']]
+            encabezado = ('modulo', 'propio_ms', 'acumulado_ms')
+            ranking = [(n, p / 1000, a / 1000) for n, p, a in ranking]
+
+        if opts['json']:
+            self.stdout.write(json.dumps({
+                'fases': fases,
+                'modulos_importados': len(filas),
+                'ranking': [dict(zip(encabezado, f)) for f in ranking],
+            }, indent=2))
+            return
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Fases de arranque"))
+        for fase, ms in fases.items():
+            self.stdout.write(f"  {fase:<14} {ms:8.1f} ms")
+        self.stdout.write(f"  módulos importados: {len(filas)}")
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Top {len(ranking)} por {encabezado[0]}"))
+        for nombre, a, b in ranking:
+            b_txt = f"{b:10.1f}" if isinstance(b, float) else f"{b:10d}"
+            self.stdout.write(f"  {a:8.1f} {b_txt}  {nombre}")
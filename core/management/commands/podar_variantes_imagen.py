@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from core.services.variantes_imagen import VariantesImagenService
+
+
+class Command(BaseCommand):
+    help = ("Borra variantes de imagen en disco (la menos usada primero) hasta quedar "
+            "bajo MEDIA_VARIANTES_MAX_BYTES, y recalcula el tamaño ocupado.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mb', type=int, default=None,
+                            help='Tamaño objetivo en MB (por defecto el 90%% del máximo). 0 vacía el caché.')
+
+    def handle(self, *args, **opts):
+        objetivo = None if opts['mb'] is None else opts['mb'] * 1024 * 1024
+        total = VariantesImagenService.podar(objetivo)
+        self.stdout.write(self.style.SUCCESS(f"Caché de variantes: {total / (1024 * 1024):.1f} MB"))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from core.services.contadores_avance import ContadoresAvanceService
+
+
+class Command(BaseCommand):
+    help = ("Recalcula en bloque los contadores de avance por zona/sector/tipo/estado "
+            "a partir de los reportes e informa cuánto se habían desviado.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--zona", type=int, help="Solo los contadores de esta zona.")
+        parser.add_argument("--batch-size", type=int, default=1000,
+                            help="Tamaño de lote para bulk_create.")
+
+    def handle(self, *args, **opts):
+        resultado = ContadoresAvanceService.reconciliar(zona_id=opts["zona"], batch_size=opts["batch_size"])
+        estilo = self.style.WARNING if resultado["corregidas"] else self.style.SUCCESS
+        self.stdout.write(estilo(
+            f"{resultado['filas']} contadores; {resultado['corregidas']} corregidos "
+            f"(diferencia total {resultado['diferencia']})"))
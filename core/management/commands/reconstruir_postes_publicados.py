@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from core.services.postes_publicados import PostePublicadoService
+
+
+class Command(BaseCommand):
+    help = "Reconstruye en bloque la proyección PostePublicado desde los wizards publicados."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tipo", choices=["electrico", "telematico", "todos"], default="todos",
+                            help="Tipo de poste a reconstruir (por defecto: todos).")
+        parser.add_argument("--batch-size", type=int, default=500,
+                            help="Wizards procesados por transacción.")
+
+    def handle(self, *args, **opts):
+        tipos = ["electrico", "telematico"] if opts["tipo"] == "todos" else [opts["tipo"]]
+        for tipo in tipos:
+            total = PostePublicadoService(tipo).reconstruir(batch_size=opts["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"Postes {tipo}: {total} filas proyectadas"))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from core.services.elementos_index import ElementosIndexService
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice relacional de elementos (PosteElementoLink) desde los arrays JSON de los wizards."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tipo", choices=["electrico", "telematico", "todos"], default="todos",
+                            help="Tipo de wizard a reindexar (por defecto: todos).")
+        parser.add_argument("--batch-size", type=int, default=500,
+                            help="Wizards procesados por transacción.")
+
+    def handle(self, *args, **opts):
+        tipos = ["electrico", "telematico"] if opts["tipo"] == "todos" else [opts["tipo"]]
+        for tipo in tipos:
+            total = ElementosIndexService(tipo).reindexar(batch_size=opts["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"Postes {tipo}: {total} links creados"))
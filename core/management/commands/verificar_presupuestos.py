@@ -0,0 +1,221 @@
+import io
+import os
+import tempfile
+from collections import Counter
+from datetime import date
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    CaptureQueriesContext, override_settings, setup_databases, setup_test_environment, teardown_databases,
+)
+from django.urls import URLPattern, URLResolver, reverse
+from django.urls.converters import PathConverter, UUIDConverter
+from rest_framework.test import APIClient
+
+from core.db import huella_sql, resolver_presupuesto_consultas
+from core.middleware import PresupuestoConsultasMiddleware
+
+METODOS = ('GET', 'POST')
+ROLES = ('encargado', 'supervisor', 'admin', 'superadmin')
+
+
+def rutas(patrones, prefijo=''):
+    """Recorre urlpatterns (con include anidados) devolviendo los URLPattern con nombre."""
+    for p in patrones:
+        if isinstance(p, URLResolver):
+            yield from rutas(p.url_patterns, prefijo + str(p.pattern))
+        elif isinstance(p, URLPattern):
+            yield prefijo + str(p.pattern), p
+
+
+def sembrar():
+    """
+    Datos mínimos para que cada ruta encuentre sus objetos: un usuario por rol,
+    ubicaciones, catálogos, un reporte de poste y uno de predio, y un wizard de cada tipo.
+    La foto del reporte de poste es una imagen real en MEDIA_ROOT, para que las
+    vistas de media lleguen a servirla.
+    """
+    from PIL import Image
+
+    from core.models.models import (
+        CustomUser, DetallePosteElectrico, DetallePredio, Distrito, ElementoElectrico,
+        Empresa, FotoReporte, PosteElectricoWizard, PredioWizard, Proyecto, Reporte, Sector, Zona,
+    )
+    from core.models.models_telematico import PosteTelematicWizard
+
+    silencio = io.StringIO()
+    for comando in ('seed_catalogos', 'seed_parametros_poste'):
+        call_command(comando, stdout=silencio)
+
+    empresa = Empresa.objects.create(nombre='Empresa Presupuestos')
+    usuarios = {}
+    for n, rol in enumerate(('superadmin', 'admin', 'supervisor', 'encargado'), start=1):
+        usuarios[rol] = CustomUser.objects.create_user(
+            dni=f'9900000{n}', email=f'{rol}@presupuestos.local', password='presupuesto1',
+            nombres=rol.title(), apellidos='Presupuestos', rol=rol,
+            empresa=None if rol == 'superadmin' else empresa,
+            supervisor=usuarios.get('supervisor'),
+        )
+    encargado = usuarios['encargado']
+
+    proyecto = Proyecto.objects.create(nombre='Proyecto', empresa=empresa, fecha_inicio=date.today())
+    distrito = Distrito.objects.create(nombre='Distrito Presupuestos', empresa=empresa)
+    zonas = [Zona.objects.create(nombre=f'Zona {i}', distrito=distrito, proyecto=proyecto) for i in range(3)]
+    sectores = [Sector.objects.create(nombre=f'Sector {i}', zona=z) for i, z in enumerate(zonas)]
+    encargado.sectores.set(sectores)
+
+    base = dict(encargado=encargado, proyecto=proyecto, zona=zonas[0], sector=sectores[0], latitud=-12.0, longitud=-77.0)
+    poste = Reporte.objects.create(tipo='electrico', **base)
+    DetallePosteElectrico.objects.create(reporte=poste, tension='BT', codigo='P-1', altura=Decimal('9.00'))
+    foto = 'fotos_reportes/presupuestos.jpg'
+    os.makedirs(os.path.join(str(settings.MEDIA_ROOT), 'fotos_reportes'), exist_ok=True)
+    Image.new('RGB', (64, 48), 'gray').save(os.path.join(str(settings.MEDIA_ROOT), foto), 'JPEG')
+    FotoReporte.objects.create(reporte=poste, imagen=foto, tipo='general')
+    predio = Reporte.objects.create(tipo='predio', **base)
+    DetallePredio.objects.create(reporte=predio, codigo_predio='PR-1')
+
+    elementos = list(ElementoElectrico.objects.values_list('id', flat=True)[:3])
+    electrico = PosteElectricoWizard.objects.create(encargado=encargado, tension='BT', codigo='WE-1',
+                                                    elementos_electricos=elementos)
+    telematico = PosteTelematicWizard.objects.create(encargado=encargado, codigo='WT-1',
+                                                     elementos_telematicos=[str(e) for e in elementos])
+    predio_wizard = PredioWizard.objects.create(encargado=encargado, empresa=empresa, distrito=distrito,
+                                                zona=zonas[0], sector=sectores[0])
+    return usuarios, {
+        'usuario': encargado.id, 'poste': poste.id, 'predio': predio.id,
+        'electrico': electrico.id, 'telematico': telematico.id, 'predio_wizard': predio_wizard.id,
+        'distrito': distrito.id, 'zona': zonas[0].id, 'sector': sectores[0].id,
+        'elemento': elementos[0], 'foto': foto,
+    }
+
+
+def valor_parametro(ruta, nombre, convertidor, ids):
+    """Elige el objeto sembrado que corresponde a un parámetro de la ruta."""
+    if isinstance(convertidor, UUIDConverter):
+        return ids['predio_wizard']
+    if isinstance(convertidor, PathConverter):
+        return ids['foto']
+    if nombre in ('sector_id', 'zona_id'):
+        return ids[nombre[:-3]]
+    if ruta.startswith('usuarios/'):
+        return ids['usuario']
+    if nombre == 'wizard_id':
+        return ids['telematico'] if 'telematico' in ruta else ids['electrico']
+    if ruta.startswith('postes/'):
+        return ids['poste']
+    return ids['predio']
+
+
+def parametros_query(nombre, ids):
+    """Query params obligatorios de las vistas GET, para medir su camino real y no el 400."""
+    return {
+        'catalogo_arbol': {'distrito_id': ids['distrito']},
+        'postes_cercanos': {'lat': -12.0, 'lon': -77.0},
+        'postes_elementos_buscar': {'elemento_id': ids['elemento']},
+        'media_variante': {'width': 32},
+    }.get(nombre, {})
+
+
+def consultas_de_vista(capturadas):
+    """Consultas capturadas sin el mantenimiento de sesión (SET/RESET), como el middleware."""
+    return [q for q in capturadas.captured_queries
+            if not q['sql'].lstrip().upper().startswith(PresupuestoConsultasMiddleware.IGNORAR)]
+
+
+class Command(BaseCommand):
+    help = ("Recorre todas las rutas de core/urls.py con cada rol sobre una base de prueba "
+            "sembrada y falla si alguna vista supera su presupuesto de consultas o responde 5xx.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rol', action='append', dest='roles', choices=ROLES,
+                            help='Rol con el que se recorren las rutas (repetible). Por defecto todos.')
+        parser.add_argument('--detalle', action='store_true',
+                            help='Muestra todas las rutas, no solo las que se pasan.')
+        parser.add_argument('--base-actual', action='store_true',
+                            help='Siembra en la base ya configurada en vez de crear una de prueba '
+                                 '(para llamarlo desde un TestCase, que ya tiene la suya).')
+
+    def handle(self, *args, **opts):
+        config = None
+        if not opts['base_actual']:
+            setup_test_environment()
+            config = setup_databases(verbosity=0, interactive=False)
+        try:
+            # Las fotos sembradas y sus variantes no tocan el MEDIA_ROOT real
+            with tempfile.TemporaryDirectory() as media, \
+                    override_settings(MEDIA_ROOT=media, MEDIA_VARIANTES_DIR=os.path.join(media, '.variantes')):
+                excedidas, errores = self._verificar(opts['roles'] or ROLES, opts['detalle'])
+        finally:
+            if config is not None:
+                teardown_databases(config, verbosity=0)
+
+        if excedidas or errores:
+            raise CommandError(f"{excedidas} peticiones superaron su presupuesto de consultas "
+                               f"y {errores} respondieron con error 5xx.")
+        self.stdout.write(self.style.SUCCESS("Todas las vistas están dentro de su presupuesto."))
+
+    def _verificar(self, roles, detalle):
+        from core import urls as core_urls
+
+        usuarios, ids = sembrar()
+        clientes = {}
+        for rol in roles:
+            cliente = APIClient()
+            cliente.raise_request_exception = False
+            cliente.force_authenticate(usuarios[rol])
+            clientes[rol] = cliente
+
+        excedidas = errores = 0
+        sin_medir = []
+        for ruta, patron in rutas(core_urls.urlpatterns):
+            if not patron.name:
+                continue
+            kwargs = {
+                nombre: valor_parametro(ruta, nombre, conv, ids)
+                for nombre, conv in patron.pattern.converters.items()
+            }
+            url = reverse(patron.name, kwargs=kwargs)
+            query = parametros_query(patron.name, ids)
+            presupuesto = resolver_presupuesto_consultas(patron.callback)
+
+            for metodo in METODOS:
+                medida = False
+                for rol, cliente in clientes.items():
+                    with CaptureQueriesContext(connection) as capturadas:
+                        if metodo == 'POST':
+                            response = cliente.post(url, {}, format='json')
+                        else:
+                            response = cliente.get(url, query)
+                    if response.status_code == 405:
+                        break
+                    medida = medida or response.status_code < 400
+                    consultas = consultas_de_vista(capturadas)
+                    total = len(consultas)
+                    error = response.status_code >= 500
+                    pasa = not error and (not presupuesto or total <= presupuesto)
+                    if pasa and not detalle:
+                        continue
+                    linea = f"{metodo} {url} [{rol}] HTTP {response.status_code}: {total}/{presupuesto or '∞'} consultas"
+                    if pasa:
+                        self.stdout.write(linea)
+                        continue
+                    if error:
+                        errores += 1
+                    else:
+                        excedidas += 1
+                    self.stdout.write(self.style.ERROR(linea))
+                    huellas = Counter(huella_sql(q['sql']) for q in consultas)
+                    for huella, n in huellas.most_common(5):
+                        self.stdout.write(f"    {n}x {huella[:200]}")
+                else:
+                    if metodo == 'GET' and not medida:
+                        sin_medir.append(url)
+
+        # Rutas GET que ningún rol pudo usar: su presupuesto solo se midió en el camino de error
+        for url in sin_medir:
+            self.stdout.write(self.style.WARNING(f"GET {url}: ningún rol obtuvo respuesta 2xx/3xx"))
+        return excedidas, errores
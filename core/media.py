@@ -0,0 +1,158 @@
+"""
+Entrega de archivos de MEDIA_ROOT después de autorizar la petición en Django.
+
+Según settings.MEDIA_OFFLOAD:
+    - 'x-accel' (nginx): se responde solo con X-Accel-Redirect hacia una location
+      `internal` (MEDIA_ACCEL_PREFIX) y nginx envía los bytes.
+    - 'x-sendfile' (Apache mod_xsendfile / lighttpd): X-Sendfile con la ruta absoluta.
+    - '' (por defecto): el propio Django con FileResponse, atendiendo Range.
+
+En todos los casos se envía un ETag fuerte y se responde 304 a If-None-Match;
+el servidor de adelante se encarga de Range cuando recibe el archivo.
+
+Ejemplo nginx:
+
+    location /media-protegida/ {
+        internal;
+        alias /app/media/;
+    }
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import parse_etags
+
+RANGO_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+BLOQUE = 64 * 1024
+
+
+def etag_archivo(estado: os.stat_result) -> str:
+    """ETag fuerte a partir de tamaño y mtime (ns): cambia si el archivo se reemplaza."""
+    return f'"{estado.st_size:x}-{estado.st_mtime_ns:x}"'
+
+
+def coincide_etag(cabecera: str, etag: str) -> bool:
+    """
+    Comparación débil de If-None-Match (RFC 9110): acepta `*`, listas y las
+    formas "x" / W/"x" en cualquiera de los dos lados (CompressionMiddleware
+    debilita el ETag de las respuestas que comprime).
+    """
+    if not cabecera:
+        return False
+    etags = parse_etags(cabecera)
+    if '*' in etags:
+        return True
+    debil = lambda e: e[2:] if e.startswith('W/') else e  # noqa: E731
+    return debil(etag) in {debil(e) for e in etags}
+
+
+def parsear_rango(cabecera: str, tamano: int):
+    """
+    Interpreta un único rango `bytes=a-b`, `bytes=a-` o `bytes=-n`.
+
+    Returns:
+        (inicio, fin) inclusivos, None si no hay rango utilizable (se envía
+        completo) o 'insatisfacible' si queda fuera del archivo.
+    """
+    if not cabecera:
+        return None
+    m = RANGO_RE.match(cabecera.strip())
+    if not m:
+        # Varios rangos o sintaxis desconocida: se ignora y se envía completo
+        return None
+    inicio, fin = m.groups()
+    if inicio == '' and fin == '':
+        return None
+    if inicio == '':
+        sufijo = int(fin)
+        if sufijo == 0:
+            return 'insatisfacible'
+        return max(tamano - sufijo, 0), tamano - 1
+    inicio = int(inicio)
+    fin = tamano - 1 if fin == '' else min(int(fin), tamano - 1)
+    if inicio >= tamano or fin < inicio:
+        return 'insatisfacible'
+    return inicio, fin
+
+
+def _leer_tramo(ruta: str, inicio: int, largo: int):
+    with open(ruta, 'rb') as f:
+        f.seek(inicio)
+        while largo > 0:
+            bloque = f.read(min(BLOQUE, largo))
+            if not bloque:
+                break
+            largo -= len(bloque)
+            yield bloque
+
+
+def _cabeceras_comunes(response, etag: str, cache_control: str):
+    response['ETag'] = etag
+    response['Accept-Ranges'] = 'bytes'
+    response['Cache-Control'] = cache_control
+    response['X-Content-Type-Options'] = 'nosniff'
+    return response
+
+
+def servir_archivo(request, ruta_absoluta: str, ruta_relativa: str,
+                   cache_control: str = 'private, max-age=3600', content_type: str = None,
+                   etag: str = None):
+    """
+    Respuesta HTTP para un archivo ya autorizado.
+
+    Args:
+        ruta_absoluta: ruta en disco (X-Sendfile y FileResponse)
+        ruta_relativa: ruta dentro de MEDIA_ROOT (X-Accel-Redirect)
+        etag: ETag a usar si el contenido no depende del mtime (p. ej. variantes,
+              cuyo mtime se renueva por LRU); por defecto tamaño + mtime
+    """
+    try:
+        estado = os.stat(ruta_absoluta)
+    except OSError:
+        return None
+
+    etag = etag or etag_archivo(estado)
+    if coincide_etag(request.META.get('HTTP_IF_NONE_MATCH', ''), etag):
+        return _cabeceras_comunes(HttpResponseNotModified(), etag, cache_control)
+
+    content_type = content_type or mimetypes.guess_type(ruta_absoluta)[0] or 'application/octet-stream'
+    modo = getattr(settings, 'MEDIA_OFFLOAD', '')
+
+    if modo == 'x-accel':
+        prefijo = getattr(settings, 'MEDIA_ACCEL_PREFIX', '/media-protegida/')
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = quote(prefijo.rstrip('/') + '/' + ruta_relativa)
+        return _cabeceras_comunes(response, etag, cache_control)
+    if modo == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = ruta_absoluta
+        return _cabeceras_comunes(response, etag, cache_control)
+
+    tamano = estado.st_size
+    rango = None
+    if request.method == 'GET':
+        if_range = request.META.get('HTTP_IF_RANGE', '')
+        # If-Range con otro ETag (o con fecha, que no usamos): se envía completo
+        if not if_range or if_range == etag:
+            rango = parsear_rango(request.META.get('HTTP_RANGE', ''), tamano)
+
+    if rango == 'insatisfacible':
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{tamano}'
+        return _cabeceras_comunes(response, etag, cache_control)
+
+    if rango is None:
+        response = FileResponse(open(ruta_absoluta, 'rb'), content_type=content_type)
+        return _cabeceras_comunes(response, etag, cache_control)
+
+    inicio, fin = rango
+    largo = fin - inicio + 1
+    response = StreamingHttpResponse(_leer_tramo(ruta_absoluta, inicio, largo),
+                                     status=206, content_type=content_type)
+    response['Content-Length'] = str(largo)
+    response['Content-Range'] = f'bytes {inicio}-{fin}/{tamano}'
+    return _cabeceras_comunes(response, etag, cache_control)
@@ -0,0 +1,204 @@
+"""
+Middlewares de la API.
+
+CompressionMiddleware: compresión negociada (Brotli / gzip).
+- Brotli si el cliente lo acepta (`Accept-Encoding: br`), si no gzip.
+- Solo comprime tipos de texto/JSON y cuerpos de al menos COMPRESSION_MIN_SIZE bytes.
+- No toca respuestas en streaming, ya codificadas ni archivos (imágenes, PDFs).
+
+StatementTimeoutMiddleware: statement_timeout de PostgreSQL por vista.
+
+PresupuestoConsultasMiddleware: cuenta las consultas SQL de cada petición y
+registra un warning con las huellas SQL más repetidas si la vista se pasa de su
+presupuesto.
+"""
+import gzip
+import logging
+import re
+from collections import Counter
+
+from django.conf import settings
+from django.db import DatabaseError, OperationalError, connection
+from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
+
+from .db import huella_sql, resolver_presupuesto_consultas, resolver_statement_timeout
+from .lazy import lazy_import
+
+# Opcional: sin Brotli se negocia solo gzip. Se carga con la primera respuesta comprimida.
+brotli = lazy_import('brotli')
+
+logger = logging.getLogger(__name__)
+
+COMPRIMIBLES = (
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'application/x-ndjson',
+    'application/yaml',
+    'application/openapi+json',
+    'application/vnd.oai.openapi',
+    'image/svg+xml',
+    'text/',
+)
+
+_RE_ACCEPT = re.compile(r'\s*([a-z*]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?', re.I)
+
+
+def codificaciones_aceptadas(accept_encoding):
+    """Devuelve las codificaciones aceptadas con q > 0."""
+    aceptadas = set()
+    for parte in accept_encoding.split(','):
+        m = _RE_ACCEPT.match(parte)
+        if not m:
+            continue
+        try:
+            q = float(m.group(2)) if m.group(2) is not None else 1.0
+        except ValueError:
+            q = 0.0
+        if q > 0:
+            aceptadas.add(m.group(1).lower())
+    return aceptadas
+
+
+class CompressionMiddleware:
+    """Comprime con Brotli o gzip según Accept-Encoding y el tamaño del cuerpo."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+        # Calidad 4-5 en Brotli da mejor ratio que gzip-6 con CPU similar en respuestas dinámicas
+        self.brotli_quality = getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 5)
+        self.gzip_level = getattr(settings, 'COMPRESSION_GZIP_LEVEL', 6)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        return self.process_response(request, response)
+
+    def _es_comprimible(self, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return False
+        if response.status_code in (204, 206, 304):
+            return False
+        if len(response.content) < self.min_size:
+            return False
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        return content_type.startswith(COMPRIMIBLES)
+
+    def process_response(self, request, response):
+        # El cuerpo depende de Accept-Encoding aunque esta respuesta no se comprima
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if not self._es_comprimible(response):
+            return response
+
+        aceptadas = codificaciones_aceptadas(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if brotli is not None and ('br' in aceptadas or '*' in aceptadas):
+            cuerpo = brotli.compress(response.content, quality=self.brotli_quality)
+            codificacion = 'br'
+        elif 'gzip' in aceptadas or '*' in aceptadas:
+            cuerpo = gzip.compress(response.content, compresslevel=self.gzip_level, mtime=0)
+            codificacion = 'gzip'
+        else:
+            return response
+
+        if len(cuerpo) >= len(response.content):
+            return response
+
+        response.content = cuerpo
+        response['Content-Length'] = str(len(cuerpo))
+        response['Content-Encoding'] = codificacion
+        # Un ETag fuerte del cuerpo sin comprimir ya no describe estos bytes
+        etag = response.get('ETag')
+        if etag and not etag.startswith('W/'):
+            response['ETag'] = 'W/' + etag
+        return response
+
+
+class StatementTimeoutMiddleware:
+    """
+    Fija `statement_timeout` en PostgreSQL antes de ejecutar la vista según
+    `resolver_statement_timeout` y lo restaura al terminar la petición.
+    Una consulta cancelada por timeout responde 503 en lugar de 500.
+    """
+    QUERY_CANCELED = '57014'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            return self.get_response(request)
+        finally:
+            if getattr(request, '_statement_timeout_ms', None) and connection.connection is not None:
+                try:
+                    with connection.cursor() as cursor:
+                        cursor.execute('SET statement_timeout TO DEFAULT')
+                except DatabaseError:
+                    # Conexión rota: Django la descarta al cerrar la petición
+                    pass
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if connection.vendor != 'postgresql':
+            return None
+        ms = resolver_statement_timeout(view_func)
+        if ms:
+            # En autocommit: el SET queda para toda la sesión, no solo para una transacción
+            with connection.cursor() as cursor:
+                cursor.execute('SET statement_timeout = %s', [ms])
+            request._statement_timeout_ms = ms
+        return None
+
+    def process_exception(self, request, exception):
+        causa = getattr(exception, '__cause__', None)
+        if isinstance(exception, OperationalError) and getattr(causa, 'pgcode', None) == self.QUERY_CANCELED:
+            return JsonResponse(
+                {"detail": "La consulta excedió el tiempo máximo permitido. Acote los filtros e intente de nuevo."},
+                status=503,
+            )
+        return None
+
+
+class PresupuestoConsultasMiddleware:
+    """
+    Cuenta las consultas de la petición con un execute_wrapper (no depende de
+    DEBUG) y las compara con `resolver_presupuesto_consultas` de la vista.
+    Si se pasa, registra un warning en `core.middleware` con las huellas SQL más
+    repetidas. Con DEBUG agrega la cabecera X-Consultas.
+    """
+    # Mantenimiento de sesión (p. ej. statement_timeout): no cuenta para la vista
+    IGNORAR = ('SET ', 'RESET ')
+    HUELLAS_EN_LOG = 5
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        consultas = []
+
+        def registrar(execute, sql, params, many, context):
+            if not sql.lstrip().upper().startswith(self.IGNORAR):
+                consultas.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(registrar):
+            response = self.get_response(request)
+
+        presupuesto = getattr(request, '_presupuesto_consultas', 0)
+        if presupuesto and len(consultas) > presupuesto:
+            huellas = Counter(huella_sql(sql) for sql in consultas).most_common(self.HUELLAS_EN_LOG)
+            logger.warning(
+                'Presupuesto de consultas excedido: %s %s (%s) hizo %d consultas, máximo %d.\n%s',
+                request.method, request.path, getattr(request, '_vista_nombre', '?'),
+                len(consultas), presupuesto,
+                '\n'.join(f'  {n}x {huella}' for huella, n in huellas),
+            )
+        if settings.DEBUG:
+            response['X-Consultas'] = str(len(consultas))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._presupuesto_consultas = resolver_presupuesto_consultas(view_func)
+        # @api_view y as_view() envuelven la vista: el nombre útil está en la clase
+        vista = getattr(view_func, 'view_class', None) or getattr(view_func, 'cls', None) or view_func
+        request._vista_nombre = f'{vista.__module__}.{vista.__name__}'
+        return None
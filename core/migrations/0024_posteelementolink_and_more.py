@@ -0,0 +1,44 @@
+# Generated by Django 4.2 on 2026-10-19 12:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_alter_postetelematicwizard_2_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PosteElementoLink',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo_poste', models.CharField(choices=[('electrico', 'Poste Eléctrico'), ('telematico', 'Poste Telemático')], max_length=10)),
+                ('lista', models.CharField(choices=[('electrico', 'Elementos eléctricos'), ('telematico', 'Elementos telemáticos')], max_length=10)),
+                ('elemento', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='postes_links', to='core.elementoelectrico')),
+                ('poste_electrico', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='elementos_links', to='core.posteelectricowizard')),
+                ('poste_telematico', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='elementos_links', to='core.postetelematicwizard')),
+            ],
+            options={
+                'db_table': 'poste_elemento_link',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='posteelementolink',
+            index=models.Index(fields=['elemento', 'tipo_poste', 'lista'], name='poste_eleme_element_d6da9e_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='posteelementolink',
+            constraint=models.UniqueConstraint(condition=models.Q(('poste_electrico__isnull', False)), fields=('poste_electrico', 'lista', 'elemento'), name='uniq_link_poste_electrico_elemento'),
+        ),
+        migrations.AddConstraint(
+            model_name='posteelementolink',
+            constraint=models.UniqueConstraint(condition=models.Q(('poste_telematico__isnull', False)), fields=('poste_telematico', 'lista', 'elemento'), name='uniq_link_poste_telematico_elemento'),
+        ),
+        migrations.AddConstraint(
+            model_name='posteelementolink',
+            constraint=models.CheckConstraint(check=models.Q(models.Q(('poste_electrico__isnull', False), ('poste_telematico__isnull', True), ('tipo_poste', 'electrico')), models.Q(('poste_electrico__isnull', True), ('poste_telematico__isnull', False), ('tipo_poste', 'telematico')), _connector='OR'), name='link_un_solo_poste_por_tipo'),
+        ),
+    ]
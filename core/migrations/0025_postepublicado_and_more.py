@@ -0,0 +1,72 @@
+# Generated by Django 4.2 on 2026-10-19 12:26
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_posteelementolink_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostePublicado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo_poste', models.CharField(choices=[('electrico', 'Poste Eléctrico'), ('telematico', 'Poste Telemático')], max_length=10)),
+                ('wizard_id', models.PositiveBigIntegerField()),
+                ('encargado_nombre', models.CharField(blank=True, default='', max_length=201)),
+                ('codigo', models.CharField(blank=True, db_index=True, max_length=50, null=True)),
+                ('tension', models.CharField(blank=True, max_length=2, null=True)),
+                ('cables_electricos', models.PositiveIntegerField(blank=True, null=True)),
+                ('cables_telematicos', models.PositiveIntegerField(blank=True, null=True)),
+                ('estructura', models.CharField(blank=True, default='', max_length=64)),
+                ('material', models.CharField(blank=True, default='', max_length=64)),
+                ('zona_instalacion', models.CharField(blank=True, default='', max_length=64)),
+                ('resistencia', models.CharField(blank=True, default='', max_length=64)),
+                ('resistencia_valor', models.PositiveIntegerField(blank=True, null=True)),
+                ('estado_poste', models.CharField(blank=True, default='', max_length=100)),
+                ('inclinacion', models.CharField(blank=True, default='', max_length=100)),
+                ('propietario', models.CharField(blank=True, default='', max_length=10)),
+                ('altura', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('latitud', models.DecimalField(blank=True, decimal_places=8, max_digits=10, null=True)),
+                ('longitud', models.DecimalField(blank=True, decimal_places=8, max_digits=11, null=True)),
+                ('observaciones', models.TextField(blank=True, default='')),
+                ('foto_principal', models.CharField(blank=True, default='', max_length=255)),
+                ('total_fotos', models.PositiveSmallIntegerField(default=0)),
+                ('publicado_en', models.DateTimeField()),
+                ('actualizado_en', models.DateTimeField(auto_now=True)),
+                ('empresa', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='core.empresa')),
+                ('encargado', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='postes_publicados', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Poste publicado',
+                'verbose_name_plural': 'Postes publicados',
+                'db_table': 'postes_publicados',
+                'ordering': ['-publicado_en'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='postepublicado',
+            index=models.Index(fields=['empresa', 'publicado_en'], name='postes_publ_empresa_f181f9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='postepublicado',
+            index=models.Index(fields=['encargado', 'publicado_en'], name='postes_publ_encarga_a1d1d8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='postepublicado',
+            index=models.Index(fields=['tipo_poste', 'publicado_en'], name='postes_publ_tipo_po_dfda26_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='postepublicado',
+            index=models.Index(fields=['latitud', 'longitud'], name='postes_publ_latitud_3354e6_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='postepublicado',
+            constraint=models.UniqueConstraint(fields=('tipo_poste', 'wizard_id'), name='uniq_poste_publicado_por_wizard'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-19 12:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0025_postepublicado_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='posteelectricowizard',
+            index=models.Index(fields=['encargado', 'actualizado_en'], name='core_postee_encarga_4c6c1b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='postetelematicwizard',
+            index=models.Index(fields=['encargado', 'actualizado_en'], name='core_postet_encarga_7368d0_idx'),
+        ),
+    ]
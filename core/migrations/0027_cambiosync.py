@@ -0,0 +1,40 @@
+# Generated by Django 4.2 on 2026-10-19 12:30
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0026_posteelectricowizard_core_postee_encarga_4c6c1b_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CambioSync',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('entidad', models.CharField(max_length=32)),
+                ('objeto_id', models.CharField(max_length=64)),
+                ('operacion', models.CharField(choices=[('upsert', 'Alta/Modificación'), ('delete', 'Baja')], max_length=6)),
+                ('creado_en', models.DateTimeField(auto_now_add=True)),
+                ('usuario', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='cambios_sync', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Cambio de sincronización',
+                'verbose_name_plural': 'Cambios de sincronización',
+                'db_table': 'cambios_sync',
+                'ordering': ['seq'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='cambiosync',
+            index=models.Index(fields=['usuario', 'seq'], name='cambios_syn_usuario_e1b340_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cambiosync',
+            index=models.Index(fields=['entidad', 'objeto_id'], name='cambios_syn_entidad_11054b_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2 on 2026-10-19 12:40
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0027_cambiosync'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClaveIdempotencia',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('clave', models.CharField(max_length=255)),
+                ('endpoint', models.CharField(max_length=255)),
+                ('fingerprint', models.CharField(max_length=64)),
+                ('estado', models.CharField(choices=[('en_proceso', 'En proceso'), ('completado', 'Completado')], default='en_proceso', max_length=10)),
+                ('status_code', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('respuesta', models.JSONField(blank=True, null=True)),
+                ('creado_en', models.DateTimeField(auto_now_add=True)),
+                ('expira_en', models.DateTimeField(db_index=True)),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='claves_idempotencia', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Clave de idempotencia',
+                'verbose_name_plural': 'Claves de idempotencia',
+                'db_table': 'claves_idempotencia',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='claveidempotencia',
+            constraint=models.UniqueConstraint(fields=('usuario', 'clave'), name='uniq_idempotencia_usuario_clave'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-19 12:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0028_claveidempotencia'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['rol', 'empresa', 'apellidos', 'nombres'], name='core_custom_rol_ce6d8d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['supervisor', 'rol', 'apellidos', 'nombres'], name='core_custom_supervi_18e19b_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-19 12:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0029_customuser_indices_listado'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reporte',
+            index=models.Index(fields=['fecha_reporte'], name='core_report_fecha_r_58d31d_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2 on 2026-10-19 12:50
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0030_reporte_fecha_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='postepublicado',
+            name='celda',
+            field=models.BigIntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='postepublicado',
+            index=models.Index(django.db.models.functions.text.Upper('codigo'), name='postes_pub_codigo_upper_idx'),
+        ),
+    ]
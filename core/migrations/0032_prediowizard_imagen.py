@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-19 12:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0031_postepublicado_celda'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='prediowizard',
+            name='imagen',
+            field=models.ImageField(blank=True, null=True, upload_to='fotos_predios/%Y/%m/'),
+        ),
+    ]
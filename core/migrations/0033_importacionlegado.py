@@ -0,0 +1,33 @@
+# Generated by Django 4.2 on 2026-10-19 13:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0032_prediowizard_imagen'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportacionLegado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=150, unique=True)),
+                ('archivo', models.CharField(max_length=255)),
+                ('estado', models.CharField(choices=[('en_curso', 'En curso'), ('terminada', 'Terminada')], default='en_curso', max_length=10)),
+                ('filas_procesadas', models.PositiveIntegerField(default=0)),
+                ('reportes_creados', models.PositiveIntegerField(default=0)),
+                ('fotos_copiadas', models.PositiveIntegerField(default=0)),
+                ('filas_con_error', models.PositiveIntegerField(default=0)),
+                ('iniciada_en', models.DateTimeField(auto_now_add=True)),
+                ('actualizada_en', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Importación de legado',
+                'verbose_name_plural': 'Importaciones de legado',
+                'db_table': 'importaciones_legado',
+            },
+        ),
+    ]
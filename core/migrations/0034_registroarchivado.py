@@ -0,0 +1,40 @@
+# Generated by Django 4.2 on 2026-10-19 13:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0033_importacionlegado'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegistroArchivado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(max_length=30)),
+                ('objeto_id', models.CharField(max_length=64)),
+                ('empresa_id', models.IntegerField(blank=True, null=True)),
+                ('proyecto_id', models.IntegerField(blank=True, null=True)),
+                ('encargado_id', models.IntegerField(blank=True, null=True)),
+                ('archivo', models.CharField(max_length=255)),
+                ('offset', models.BigIntegerField()),
+                ('longitud', models.PositiveIntegerField()),
+                ('archivado_en', models.DateTimeField()),
+                ('rehidratado_en', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'registros_archivados',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='registroarchivado',
+            index=models.Index(fields=['empresa_id', 'proyecto_id'], name='registros_a_empresa_d3ba79_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='registroarchivado',
+            constraint=models.UniqueConstraint(fields=('tipo', 'objeto_id'), name='uniq_registro_archivado'),
+        ),
+    ]
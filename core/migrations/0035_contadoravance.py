@@ -0,0 +1,53 @@
+# Generated by Django 4.2 on 2026-10-19 13:13
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def poblar_contadores(apps, schema_editor):
+    """Carga inicial de los contadores con los reportes existentes."""
+    Reporte = apps.get_model('core', 'Reporte')
+    ContadorAvance = apps.get_model('core', 'ContadorAvance')
+    grupos = (Reporte.objects.using(schema_editor.connection.alias)
+              .values('zona_id', 'sector_id', 'tipo', 'estado').annotate(n=Count('id')).order_by())
+    ContadorAvance.objects.using(schema_editor.connection.alias).bulk_create(
+        [ContadorAvance(zona_id=g['zona_id'], sector_id=g['sector_id'], tipo=g['tipo'],
+                        estado=g['estado'], total=g['n']) for g in grupos],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0034_registroarchivado'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContadorAvance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(max_length=20)),
+                ('estado', models.CharField(max_length=20)),
+                ('total', models.IntegerField(default=0)),
+                ('sector', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='contadores_avance', to='core.sector')),
+                ('zona', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='contadores_avance', to='core.zona')),
+            ],
+            options={
+                'verbose_name': 'Contador de avance',
+                'verbose_name_plural': 'Contadores de avance',
+                'db_table': 'contadores_avance',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='contadoravance',
+            index=models.Index(fields=['zona'], name='contadores__zona_id_d29079_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='contadoravance',
+            constraint=models.UniqueConstraint(fields=('sector', 'zona', 'tipo', 'estado'), name='uniq_contador_avance'),
+        ),
+        migrations.RunPython(poblar_contadores, migrations.RunPython.noop),
+    ]
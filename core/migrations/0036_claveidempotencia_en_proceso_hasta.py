@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-19 13:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0035_contadoravance'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='claveidempotencia',
+            name='en_proceso_hasta',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations
+
+# Búsqueda por prefijo de buscar_usuarios: istartswith compila a
+# UPPER(col::text) LIKE UPPER(%s), que solo usa un índice sobre la misma
+# expresión con text_pattern_ops (LIKE 'X%' con una collation distinta de C).
+INDICES = (
+    ('usuarios_apellidos_upper_idx', 'apellidos'),
+    ('usuarios_nombres_upper_idx', 'nombres'),
+)
+
+
+def crear_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return  # SQLite (desarrollo): su LIKE no distingue mayúsculas y no usa estos índices
+    tabla = schema_editor.quote_name(apps.get_model('core', 'CustomUser')._meta.db_table)
+    for nombre, columna in INDICES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {nombre} ON {tabla} '
+            f'(UPPER({schema_editor.quote_name(columna)}::text) text_pattern_ops)'
+        )
+
+
+def borrar_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for nombre, _ in INDICES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {nombre}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0036_claveidempotencia_en_proceso_hasta'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indices, borrar_indices),
+    ]
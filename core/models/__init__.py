@@ -3,6 +3,13 @@
 # Keep this file intentionally small to avoid import-time side effects.
 from .models import *  # noqa: F401,F403
 from .models_telematico import *  # noqa: F401,F403
+from .models_elementos import *  # noqa: F401,F403
+from .models_publicados import *  # noqa: F401,F403
+from .models_sync import *  # noqa: F401,F403
+from .models_idempotencia import *  # noqa: F401,F403
+from .models_importacion import *  # noqa: F401,F403
+from .models_archivo import *  # noqa: F401,F403
+from .models_avance import *  # noqa: F401,F403
 
 # Note: models.py does not define __all__; we intentionally avoid importing
 # it to prevent import errors. If you later add __all__ there, you can
@@ -61,6 +61,13 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
 
     objects = CustomUserManager()
 
+    class Meta:
+        indexes = [
+            # Listados de usuarios: filtro por rol/empresa u rol/supervisor, orden alfabético
+            models.Index(fields=['rol', 'empresa', 'apellidos', 'nombres']),
+            models.Index(fields=['supervisor', 'rol', 'apellidos', 'nombres']),
+        ]
+
     def __str__(self):
         return f"{self.dni} - {self.nombres} {self.apellidos} ({self.get_rol_display()})"
 
@@ -180,9 +187,26 @@ class Reporte(models.Model):
     latitud = models.FloatField(blank=True, null=True)
     longitud = models.FloatField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            # Orden por defecto y date_hierarchy del admin
+            models.Index(fields=['fecha_reporte']),
+        ]
+
     def __str__(self):
         return f"{self.tipo} - {self.encargado.email} - {self.fecha_reporte.date()}"
 
+    # Campos que definen el contador de avance (core/services/contadores_avance.py)
+    CAMPOS_AVANCE = ('zona_id', 'sector_id', 'tipo', 'estado')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Valores con los que se leyó: al guardar se sabe qué contador restar
+        if all(c in instance.__dict__ for c in cls.CAMPOS_AVANCE):
+            instance._clave_avance = tuple(instance.__dict__[c] for c in cls.CAMPOS_AVANCE)
+        return instance
+
     def clean(self):
         # Exclusividad de detalle por tipo
         has_elec = hasattr(self, 'detalle_electrico') and self.detalle_electrico_id is not None
@@ -318,6 +342,8 @@ class PredioWizard(models.Model):
 
      # <<< añade este campo >>> 
     observaciones = models.TextField(blank=True, default="")
+    # Foto de fachada (paso 'media'); al publicar pasa a FotoReporte principal
+    imagen = models.ImageField(upload_to='fotos_predios/%Y/%m/', null=True, blank=True)
     # payload de detalle
 
     is_published = models.BooleanField(default=False)
@@ -358,6 +384,7 @@ class PosteElectricoWizard(models.Model):
         ordering = ['-actualizado_en']
         indexes = [
             models.Index(fields=['encargado', 'estado']),
+            models.Index(fields=['encargado', 'actualizado_en']),
         ]
 
     def __str__(self):
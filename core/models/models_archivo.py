@@ -0,0 +1,34 @@
+from django.db import models
+
+
+class RegistroArchivado(models.Model):
+    """
+    Índice del archivo frío (core/services/archivo_frio.py): dónde quedó cada
+    registro que salió de las tablas vivas.
+
+    Sin FKs a propósito: el registro y sus padres pueden no existir en la base.
+    `offset`/`longitud` ubican el miembro gzip del registro dentro del .jsonl.gz,
+    así que rehidratar uno solo lee unos KB del archivo.
+    """
+    tipo = models.CharField(max_length=30)
+    objeto_id = models.CharField(max_length=64)   # pk del registro raíz (int o uuid)
+    empresa_id = models.IntegerField(null=True, blank=True)
+    proyecto_id = models.IntegerField(null=True, blank=True)
+    encargado_id = models.IntegerField(null=True, blank=True)
+    archivo = models.CharField(max_length=255)    # relativo a settings.ARCHIVO_FRIO_DIR
+    offset = models.BigIntegerField()
+    longitud = models.PositiveIntegerField()
+    archivado_en = models.DateTimeField()
+    rehidratado_en = models.DateTimeField(null=True, blank=True)  # null = está en el archivo
+
+    class Meta:
+        db_table = 'registros_archivados'
+        constraints = [
+            models.UniqueConstraint(fields=['tipo', 'objeto_id'], name='uniq_registro_archivado'),
+        ]
+        indexes = [
+            models.Index(fields=['empresa_id', 'proyecto_id']),
+        ]
+
+    def __str__(self):
+        return f"{self.tipo} {self.objeto_id} -> {self.archivo}@{self.offset}"
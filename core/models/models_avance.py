@@ -0,0 +1,38 @@
+from django.db import models
+
+from .models import Sector, Zona
+
+
+class ContadorAvance(models.Model):
+    """
+    Reportes vivos por (zona, sector, tipo, estado), mantenido por
+    core/services/contadores_avance.py en la misma transacción que el guardado o
+    borrado del Reporte. El avance de un sector o de una zona se arma sumando
+    unas pocas filas en lugar de contar sobre core_reporte.
+
+    Las FKs no tienen restricción en la base a propósito: al borrar un sector en
+    cascada, los post_delete de sus reportes vuelven a tocar estas filas y una FK
+    real haría fallar el COMMIT. Las filas huérfanas las limpia
+    `manage.py reconciliar_avance`.
+    """
+    zona = models.ForeignKey(Zona, on_delete=models.DO_NOTHING, db_constraint=False,
+                             related_name='contadores_avance')
+    sector = models.ForeignKey(Sector, on_delete=models.DO_NOTHING, db_constraint=False,
+                               related_name='contadores_avance')
+    tipo = models.CharField(max_length=20)
+    estado = models.CharField(max_length=20)
+    total = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'contadores_avance'
+        constraints = [
+            models.UniqueConstraint(fields=['sector', 'zona', 'tipo', 'estado'], name='uniq_contador_avance'),
+        ]
+        indexes = [
+            models.Index(fields=['zona']),
+        ]
+        verbose_name = "Contador de avance"
+        verbose_name_plural = "Contadores de avance"
+
+    def __str__(self):
+        return f"Zona {self.zona_id} / Sector {self.sector_id} - {self.tipo} {self.estado}: {self.total}"
@@ -0,0 +1,75 @@
+from django.db import models
+from django.db.models import Q
+
+
+class PosteElementoLink(models.Model):
+    """
+    Índice relacional de los elementos declarados en la Parte 1 de los wizards
+    de poste (eléctrico y telemático).
+
+    Los wizards guardan sus elementos como arrays JSON; esta tabla es la copia
+    normalizada que permite filtrar y contar por elemento directamente en la
+    base de datos. Se mantiene desde ElementosIndexService al guardar la Parte 1
+    y se reconstruye con `manage.py reindexar_elementos_poste`.
+    """
+    TIPO_POSTE = (
+        ('electrico', 'Poste Eléctrico'),
+        ('telematico', 'Poste Telemático'),
+    )
+    LISTAS = (
+        ('electrico', 'Elementos eléctricos'),
+        ('telematico', 'Elementos telemáticos'),
+    )
+
+    tipo_poste = models.CharField(max_length=10, choices=TIPO_POSTE)
+    poste_electrico = models.ForeignKey(
+        'PosteElectricoWizard',
+        on_delete=models.CASCADE,
+        null=True, blank=True,
+        related_name='elementos_links'
+    )
+    poste_telematico = models.ForeignKey(
+        'PosteTelematicWizard',
+        on_delete=models.CASCADE,
+        null=True, blank=True,
+        related_name='elementos_links'
+    )
+    elemento = models.ForeignKey(
+        'ElementoElectrico',
+        on_delete=models.CASCADE,
+        related_name='postes_links'
+    )
+    # Array del wizard del que proviene (elementos_electricos / elementos_telematicos)
+    lista = models.CharField(max_length=10, choices=LISTAS)
+
+    class Meta:
+        db_table = 'poste_elemento_link'
+        indexes = [
+            models.Index(fields=['elemento', 'tipo_poste', 'lista']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['poste_electrico', 'lista', 'elemento'],
+                condition=Q(poste_electrico__isnull=False),
+                name='uniq_link_poste_electrico_elemento'
+            ),
+            models.UniqueConstraint(
+                fields=['poste_telematico', 'lista', 'elemento'],
+                condition=Q(poste_telematico__isnull=False),
+                name='uniq_link_poste_telematico_elemento'
+            ),
+            models.CheckConstraint(
+                check=(
+                    Q(tipo_poste='electrico', poste_electrico__isnull=False, poste_telematico__isnull=True)
+                    | Q(tipo_poste='telematico', poste_telematico__isnull=False, poste_electrico__isnull=True)
+                ),
+                name='link_un_solo_poste_por_tipo'
+            ),
+        ]
+
+    @property
+    def wizard_id(self):
+        return self.poste_electrico_id if self.tipo_poste == 'electrico' else self.poste_telematico_id
+
+    def __str__(self):
+        return f'{self.tipo_poste} #{self.wizard_id} → elemento {self.elemento_id} ({self.lista})'
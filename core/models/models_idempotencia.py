@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.db import models
+
+
+class ClaveIdempotencia(models.Model):
+    """
+    Respuesta guardada de un POST enviado con cabecera `Idempotency-Key`.
+
+    Si la app móvil reintenta la misma petición (misma clave y mismo contenido)
+    dentro del TTL, se devuelve esta respuesta sin volver a ejecutar la escritura.
+    Ver core/idempotency.py.
+    """
+    ESTADOS = (
+        ('en_proceso', 'En proceso'),
+        ('completado', 'Completado'),
+    )
+
+    usuario = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='claves_idempotencia'
+    )
+    clave = models.CharField(max_length=255)
+    endpoint = models.CharField(max_length=255)          # "POST /api/..."
+    fingerprint = models.CharField(max_length=64)        # sha256 del contenido de la petición
+    estado = models.CharField(max_length=10, choices=ESTADOS, default='en_proceso')
+    # Mientras no venza, un reintento recibe 409; vencido (worker caído), el reintento la toma
+    en_proceso_hasta = models.DateTimeField(null=True, blank=True)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    respuesta = models.JSONField(null=True, blank=True)
+    creado_en = models.DateTimeField(auto_now_add=True)
+    expira_en = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = 'claves_idempotencia'
+        constraints = [
+            models.UniqueConstraint(fields=['usuario', 'clave'], name='uniq_idempotencia_usuario_clave'),
+        ]
+        verbose_name = "Clave de idempotencia"
+        verbose_name_plural = "Claves de idempotencia"
+
+    def __str__(self):
+        return f"{self.clave} ({self.estado}) - {self.endpoint}"
@@ -0,0 +1,33 @@
+from django.db import models
+
+
+class ImportacionLegado(models.Model):
+    """
+    Punto de control de `manage.py importar_reportes`.
+
+    Se actualiza en la misma transacción que cada lote insertado: si el comando se
+    corta, al volver a ejecutarlo con el mismo nombre retoma desde `filas_procesadas`
+    sin duplicar ni perder reportes.
+    """
+    ESTADOS = (
+        ('en_curso', 'En curso'),
+        ('terminada', 'Terminada'),
+    )
+
+    nombre = models.CharField(max_length=150, unique=True)
+    archivo = models.CharField(max_length=255)
+    estado = models.CharField(max_length=10, choices=ESTADOS, default='en_curso')
+    filas_procesadas = models.PositiveIntegerField(default=0)   # incluye las filas con error
+    reportes_creados = models.PositiveIntegerField(default=0)
+    fotos_copiadas = models.PositiveIntegerField(default=0)
+    filas_con_error = models.PositiveIntegerField(default=0)
+    iniciada_en = models.DateTimeField(auto_now_add=True)
+    actualizada_en = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'importaciones_legado'
+        verbose_name = "Importación de legado"
+        verbose_name_plural = "Importaciones de legado"
+
+    def __str__(self):
+        return f"{self.nombre} ({self.estado}) - {self.filas_procesadas} filas"
@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.db import models
+from django.db.models.functions import Upper
+
+
+class PostePublicado(models.Model):
+    """
+    Proyección desnormalizada de un poste publicado (eléctrico o telemático).
+
+    Un poste publicado vive repartido entre el wizard, sus partes 2-4, las fotos y
+    varios catálogos. Esta tabla guarda una fila por wizard publicado con los
+    nombres de catálogo ya resueltos, coordenadas y la foto principal, para que
+    listados, mapas y exportaciones se resuelvan con un scan de una sola tabla.
+
+    Se mantiene desde PostePublicadoService al publicar y se reconstruye con
+    `manage.py reconstruir_postes_publicados`. No es la fuente de verdad.
+    """
+    TIPO_POSTE = (
+        ('electrico', 'Poste Eléctrico'),
+        ('telematico', 'Poste Telemático'),
+    )
+
+    tipo_poste = models.CharField(max_length=10, choices=TIPO_POSTE)
+    wizard_id = models.PositiveBigIntegerField()
+
+    encargado = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True, blank=True,
+        related_name='postes_publicados'
+    )
+    encargado_nombre = models.CharField(max_length=201, blank=True, default="")
+    empresa = models.ForeignKey('Empresa', on_delete=models.SET_NULL, null=True, blank=True)
+
+    # Parte 1
+    codigo = models.CharField(max_length=50, null=True, blank=True, db_index=True)
+    tension = models.CharField(max_length=2, null=True, blank=True)
+    cables_electricos = models.PositiveIntegerField(null=True, blank=True)
+    cables_telematicos = models.PositiveIntegerField(null=True, blank=True)
+
+    # Parte 2 (nombres de ParametroCatalogo)
+    estructura = models.CharField(max_length=64, blank=True, default="")
+    material = models.CharField(max_length=64, blank=True, default="")
+    zona_instalacion = models.CharField(max_length=64, blank=True, default="")
+    resistencia = models.CharField(max_length=64, blank=True, default="")
+    resistencia_valor = models.PositiveIntegerField(null=True, blank=True)
+
+    # Parte 3
+    estado_poste = models.CharField(max_length=100, blank=True, default="")
+    inclinacion = models.CharField(max_length=100, blank=True, default="")
+    propietario = models.CharField(max_length=10, blank=True, default="")
+    altura = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+
+    # Parte 4
+    latitud = models.DecimalField(max_digits=10, decimal_places=8, null=True, blank=True)
+    longitud = models.DecimalField(max_digits=11, decimal_places=8, null=True, blank=True)
+    # Celda de la grilla para búsquedas por proximidad (ProximidadPostesService.celda)
+    celda = models.BigIntegerField(null=True, blank=True, db_index=True)
+    observaciones = models.TextField(blank=True, default="")
+    foto_principal = models.CharField(max_length=255, blank=True, default="")  # ruta relativa a MEDIA_ROOT
+    total_fotos = models.PositiveSmallIntegerField(default=0)
+
+    publicado_en = models.DateTimeField()
+    actualizado_en = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'postes_publicados'
+        ordering = ['-publicado_en']
+        constraints = [
+            models.UniqueConstraint(fields=['tipo_poste', 'wizard_id'], name='uniq_poste_publicado_por_wizard'),
+        ]
+        indexes = [
+            models.Index(fields=['empresa', 'publicado_en']),
+            models.Index(fields=['encargado', 'publicado_en']),
+            models.Index(fields=['tipo_poste', 'publicado_en']),
+            models.Index(fields=['latitud', 'longitud']),
+            # Duplicados por código sin distinguir mayúsculas
+            models.Index(Upper('codigo'), name='postes_pub_codigo_upper_idx'),
+        ]
+        verbose_name = "Poste publicado"
+        verbose_name_plural = "Postes publicados"
+
+    def __str__(self):
+        return f"PostePublicado {self.tipo_poste} #{self.wizard_id} - {self.codigo or 'Sin código'}"
@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.db import models
+
+
+class CambioSync(models.Model):
+    """
+    Registro monotónico de cambios (change-log) para la sincronización offline de la app móvil.
+
+    Cada alta, modificación o baja de catálogos, ubicaciones (Distrito/Zona/Sector),
+    wizards y reportes agrega una fila con un `seq` creciente. El cliente guarda el
+    último `seq` recibido y pide solo lo posterior en `/api/sync/?after=<seq>`.
+
+    Las filas de catálogos/ubicaciones son globales (usuario NULL); las de wizards y
+    reportes pertenecen al encargado dueño y solo se le envían a él.
+    """
+    OPERACIONES = (
+        ('upsert', 'Alta/Modificación'),
+        ('delete', 'Baja'),
+    )
+
+    seq = models.BigAutoField(primary_key=True)
+    entidad = models.CharField(max_length=32)
+    objeto_id = models.CharField(max_length=64)  # texto: PredioWizard usa UUID
+    operacion = models.CharField(max_length=6, choices=OPERACIONES)
+    usuario = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True, blank=True,
+        related_name='cambios_sync'
+    )
+    creado_en = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'cambios_sync'
+        ordering = ['seq']
+        indexes = [
+            models.Index(fields=['usuario', 'seq']),
+            models.Index(fields=['entidad', 'objeto_id']),
+        ]
+        verbose_name = "Cambio de sincronización"
+        verbose_name_plural = "Cambios de sincronización"
+
+    def __str__(self):
+        return f"#{self.seq} {self.operacion} {self.entidad}:{self.objeto_id}"
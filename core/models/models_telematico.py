@@ -35,11 +35,20 @@ class PosteTelematicWizard(models.Model):
         ordering = ['-actualizado_en']
         indexes = [
             models.Index(fields=['encargado', 'estado']),
+            models.Index(fields=['encargado', 'actualizado_en']),
         ]
 
     def __str__(self):
         return f"PosteTelematico #{self.id} - {self.codigo or 'Sin código'} ({self.estado})"
 
+    def save(self, *args, **kwargs):
+        # Equivalente a auto_now: el listado delta (?since=) depende de este campo
+        self.actualizado_en = timezone.now()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'actualizado_en'}
+        super().save(*args, **kwargs)
+
 from django.utils import timezone
 
 from django.utils import timezone
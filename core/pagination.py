@@ -0,0 +1,39 @@
+"""
+Paginación simple por page/page_size compartida por los listados de la API.
+Mantiene la misma forma de respuesta que PredioReporteListView:
+{"count", "page", "page_size", "results"}.
+"""
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def parse_page_params(request, default_page_size=DEFAULT_PAGE_SIZE, max_page_size=MAX_PAGE_SIZE):
+    """
+    Lee `page` y `page_size` de los query params tolerando valores inválidos.
+
+    Returns:
+        (page, page_size)
+    """
+    try:
+        page = max(1, int(request.query_params.get('page', 1)))
+    except ValueError:
+        page = 1
+    try:
+        page_size = min(max_page_size, max(1, int(request.query_params.get('page_size', default_page_size))))
+    except ValueError:
+        page_size = default_page_size
+    return page, page_size
+
+
+def paginate(request, items, default_page_size=DEFAULT_PAGE_SIZE, max_page_size=MAX_PAGE_SIZE):
+    """
+    Pagina un queryset (o lista) y devuelve la porción pedida y los metadatos.
+
+    Returns:
+        (porción, {"count", "page", "page_size"})
+    """
+    page, page_size = parse_page_params(request, default_page_size, max_page_size)
+    start = (page - 1) * page_size
+    total = items.count() if hasattr(items, 'count') and not isinstance(items, list) else len(items)
+    return items[start:start + page_size], {'count': total, 'page': page, 'page_size': page_size}
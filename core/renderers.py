@@ -0,0 +1,54 @@
+"""
+Renderer y parser JSON rápidos basados en orjson.
+
+orjson es opcional: si no está instalado se usan los de DRF sin cambios, así que
+la forma de las respuestas es la misma con o sin la dependencia.
+"""
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    # Z en vez de +00:00 y claves no-str igual que el encoder de DRF
+    ORJSON_OPTS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer que serializa con orjson.
+    Los tipos que orjson no conoce (Decimal, lazy strings, QuerySets, etc.) se
+    delegan al encoder de DRF para conservar exactamente la misma salida.
+    """
+    _encoder = encoders.JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            # Salida con sangría (navegador / ?indent): ruta estándar
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            return orjson.dumps(data, default=self._encoder.default, option=ORJSON_OPTS)
+        except TypeError:
+            # p. ej. enteros fuera de 64 bits: la ruta estándar sí los soporta
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser que decodifica con orjson (misma semántica de errores que DRF)."""
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except (ValueError, orjson.JSONDecodeError) as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
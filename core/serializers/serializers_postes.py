@@ -1,5 +1,6 @@
 # core/serializers.py
 from rest_framework import serializers
+from ..services.media_protegida import MediaProtegidaService
 from ..models.models import (
     Reporte, DetallePosteElectrico, DetallePredio, FotoReporte,
     ElementoElectrico, ElementoTelematico,
@@ -57,15 +58,19 @@ class PosteFotoCreateSerializer(serializers.ModelSerializer):
         return getattr(obj.imagen, "name", "").split("/")[-1]
 
     def get_url(self, obj):
-        request = self.context.get("request")
-        return request.build_absolute_uri(obj.imagen.url) if request and obj.imagen else None
+        return MediaProtegidaService.url(self.context.get("request"), obj.imagen.name if obj.imagen else None)
 
 
 class PosteFotoSerializer(serializers.ModelSerializer):
+    imagen = serializers.SerializerMethodField()
+
     class Meta:
         model = FotoReporte
         fields = ("id","tipo","latitud","longitud","imagen")
 
+    def get_imagen(self, obj):
+        return MediaProtegidaService.url(self.context.get("request"), obj.imagen.name if obj.imagen else None)
+
 
 class PosteReporteDetailSerializer(serializers.ModelSerializer):
     detalle_poste = serializers.SerializerMethodField()
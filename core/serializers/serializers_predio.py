@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from ..services.media_protegida import MediaProtegidaService
 from ..models.models import Reporte, DetallePredio, FotoReporte
 
 class ReporteCreateSerializer(serializers.ModelSerializer):
@@ -47,8 +48,7 @@ class FotoReporteCreateSerializer(serializers.ModelSerializer):
         return obj.imagen.name if obj.imagen else None
 
     def get_url(self, obj):
-        request = self.context.get("request")
-        return request.build_absolute_uri(obj.imagen.url) if (request and obj.imagen) else None
+        return MediaProtegidaService.url(self.context.get("request"), obj.imagen.name if obj.imagen else None)
 
 
 # Para devolver todo junto (detalle + foto principal)
@@ -60,8 +60,7 @@ class FotoMinSerializer(serializers.ModelSerializer):
         fields = ["id", "tipo", "url", "latitud", "longitud"]
 
     def get_url(self, obj):
-        request = self.context.get("request")
-        return request.build_absolute_uri(obj.imagen.url) if (request and obj.imagen) else None
+        return MediaProtegidaService.url(self.context.get("request"), obj.imagen.name if obj.imagen else None)
 
 
 class ReporteDetalleViewSerializer(serializers.ModelSerializer):
@@ -0,0 +1,27 @@
+from rest_framework import serializers
+from ..models.models_publicados import PostePublicado
+from ..services.media_protegida import MediaProtegidaService
+
+
+class PostePublicadoSerializer(serializers.ModelSerializer):
+    """Serializer de lectura de la proyección de postes publicados (una sola tabla, sin JOINs)."""
+    foto_principal_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = PostePublicado
+        fields = [
+            'id', 'tipo_poste', 'wizard_id',
+            'encargado', 'encargado_nombre', 'empresa',
+            'codigo', 'tension', 'cables_electricos', 'cables_telematicos',
+            'estructura', 'material', 'zona_instalacion', 'resistencia', 'resistencia_valor',
+            'estado_poste', 'inclinacion', 'propietario', 'altura',
+            'latitud', 'longitud', 'observaciones',
+            'foto_principal', 'foto_principal_url', 'total_fotos',
+            'publicado_en', 'actualizado_en',
+        ]
+        read_only_fields = fields
+
+    def get_foto_principal_url(self, obj):
+        if not obj.foto_principal:
+            return None
+        return MediaProtegidaService.url(self.context.get("request"), obj.foto_principal)
@@ -14,9 +14,9 @@ class PosteTelematicWizardSerializer(serializers.ModelSerializer):
     class Meta:
         model = PosteTelematicWizard
         fields = [
-            'id', 'estado', 'creado_en', 'proximo_paso'
+            'id', 'estado', 'creado_en', 'actualizado_en', 'proximo_paso'
         ]
-        read_only_fields = ['id', 'estado', 'creado_en']
+        read_only_fields = ['id', 'estado', 'creado_en', 'actualizado_en']
 
     def get_proximo_paso(self, obj):
         return f"/api/wizard/telematico/{obj.id}/parte1"
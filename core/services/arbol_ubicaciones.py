@@ -0,0 +1,101 @@
+import gzip
+import hashlib
+from typing import Dict, Iterable, List, Optional
+
+from django.core.cache import cache
+from django.db.models import Max, Q
+
+from ..lazy import lazy_import
+from ..models.models import Distrito, Zona, Sector
+from ..models.models_sync import CambioSync
+from ..renderers import FastJSONRenderer
+
+brotli = lazy_import('brotli')
+
+
+class ArbolUbicacionesService:
+    """
+    Árbol completo Distrito → Zona → Sector, construido una vez por versión del
+    catálogo de ubicaciones y guardado en caché ya serializado y comprimido.
+
+    La versión es el último `seq` de CambioSync para distrito/zona/sector: cualquier
+    alta, edición o baja la incrementa y las entradas viejas dejan de usarse solas.
+    """
+
+    ENTIDADES = ('distrito', 'zona', 'sector')
+    CACHE_PREFIX = 'arbol_ubicaciones'
+    CACHE_TTL = 60 * 60 * 24
+
+    @classmethod
+    def version(cls) -> int:
+        return (CambioSync.objects
+                .filter(entidad__in=cls.ENTIDADES)
+                .aggregate(v=Max('seq'))['v'] or 0)
+
+    @staticmethod
+    def construir(empresa_id: Optional[int] = None, sector_ids: Optional[Iterable[int]] = None) -> List[dict]:
+        """
+        Arma el árbol con tres consultas planas (sin prefetch por distrito).
+
+        Args:
+            empresa_id: Limita a los distritos de la empresa (más los compartidos, sin empresa)
+            sector_ids: Si se indica, solo esos sectores y las ramas que los contienen
+        """
+        distritos = Distrito.objects.all()
+        if empresa_id is not None:
+            distritos = distritos.filter(Q(empresa_id=empresa_id) | Q(empresa__isnull=True))
+        sectores = Sector.objects.filter(zona__distrito__in=distritos)
+        if sector_ids is not None:
+            sectores = sectores.filter(id__in=list(sector_ids))
+
+        por_zona: Dict[int, list] = {}
+        for s in sectores.order_by('nombre').values('id', 'nombre', 'zona_id'):
+            por_zona.setdefault(s['zona_id'], []).append({'id': s['id'], 'nombre': s['nombre']})
+
+        zonas = Zona.objects.filter(distrito__in=distritos)
+        if sector_ids is not None:
+            zonas = zonas.filter(id__in=list(por_zona))
+        por_distrito: Dict[int, list] = {}
+        for z in zonas.order_by('nombre').values('id', 'nombre', 'distrito_id'):
+            por_distrito.setdefault(z['distrito_id'], []).append(
+                {'id': z['id'], 'nombre': z['nombre'], 'sectores': por_zona.get(z['id'], [])}
+            )
+
+        if sector_ids is not None:
+            distritos = distritos.filter(id__in=list(por_distrito))
+        return [
+            {'id': d['id'], 'nombre': d['nombre'], 'zonas': por_distrito.get(d['id'], [])}
+            for d in distritos.order_by('nombre').values('id', 'nombre')
+        ]
+
+    @classmethod
+    def obtener(cls, empresa_id: Optional[int] = None, sector_ids: Optional[Iterable[int]] = None) -> dict:
+        """
+        Devuelve el árbol pre-serializado de la versión vigente.
+
+        Returns:
+            {"version", "etag", "gzip": bytes, "br": bytes | None}
+        """
+        version = cls.version()
+        alcance = 'todas' if empresa_id is None else str(empresa_id)
+        if sector_ids is not None:
+            ids = ','.join(str(i) for i in sorted(set(sector_ids)))
+            alcance += ':s' + hashlib.sha1(ids.encode()).hexdigest()[:16]
+        clave = f'{cls.CACHE_PREFIX}:{version}:{alcance}'
+
+        entrada = cache.get(clave)
+        if entrada is None:
+            cuerpo = FastJSONRenderer().render({
+                'version': version,
+                'distritos': cls.construir(empresa_id, sector_ids),
+            })
+            entrada = {
+                'version': version,
+                # Débil: el mismo contenido se sirve en br, gzip o sin comprimir
+                'etag': 'W/"arbol-%s-%s"' % (version, hashlib.sha1(cuerpo).hexdigest()[:12]),
+                'gzip': gzip.compress(cuerpo, compresslevel=9, mtime=0),
+                # Se comprime una sola vez por versión: vale la pena la calidad máxima
+                'br': brotli.compress(cuerpo, quality=11) if brotli is not None else None,
+            }
+            cache.set(clave, entrada, cls.CACHE_TTL)
+        return entrada
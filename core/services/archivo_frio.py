@@ -0,0 +1,276 @@
+import datetime
+import gzip
+import json
+import os
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.admin.utils import NestedObjects
+from django.core import serializers
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models.models import CustomUser, PosteElectricoWizard, PredioWizard, Reporte
+from ..models.models_archivo import RegistroArchivado
+from ..models.models_telematico import PosteTelematicWizard
+from .sync_feed import SyncFeedService
+
+
+class _EncoderArchivo(DjangoJSONEncoder):
+    """
+    DjangoJSONEncoder recorta datetime/time a milisegundos; aquí se guardan con
+    microsegundos para que el registro rehidratado conserve el mismo valor (los
+    cursores since/since_id comparan fechas exactas).
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+class ArchivoFrioService:
+    """
+    Archivo frío de encuestas publicadas que ya casi no se leen.
+
+    Cada registro raíz se guarda con todo lo que cuelga de él (las mismas filas que
+    borraría su CASCADE: detalle, partes del wizard, fotos) como una línea JSON, y
+    se borra de las tablas vivas. Los archivos son .jsonl.gz por tipo/empresa/proyecto
+    en ARCHIVO_FRIO_DIR; cada línea es un miembro gzip independiente, de modo que el
+    archivo completo se lee con zcat y un registro suelto con seek(offset) +
+    gzip.decompress. RegistroArchivado es el índice (una fila chica por registro).
+
+    Las imágenes no se mueven: las filas de foto guardan su ruta y al rehidratar
+    vuelven a apuntar al mismo archivo de MEDIA_ROOT.
+
+    `rehidratar` reinserta el registro con sus pks originales (las secuencias no
+    las reutilizan) y lo deja como estaba; lo usa ReporteDetailView cuando el
+    reporte pedido no está en la tabla.
+    """
+
+    # tipo -> (modelo, filtro de publicados, campo de antigüedad, empresa, proyecto, encargado)
+    TIPOS = {
+        'reporte': (Reporte, ~Q(estado='pendiente'), 'fecha_reporte',
+                    'proyecto__empresa_id', 'proyecto_id', 'encargado_id'),
+        'predio_wizard': (PredioWizard, Q(is_published=True), 'updated_at',
+                          'empresa_id', None, 'encargado_id'),
+        'poste_electrico': (PosteElectricoWizard, Q(estado='published'), 'actualizado_en',
+                            'encargado__empresa_id', None, 'encargado_id'),
+        'poste_telematico': (PosteTelematicWizard, Q(estado='published'), 'actualizado_en',
+                             'encargado__empresa_id', None, 'encargado_id'),
+    }
+    LOTE = 200
+
+    # ------------------------------------------------------------------
+    # Configuración
+    # ------------------------------------------------------------------
+    @staticmethod
+    def directorio() -> str:
+        return str(getattr(settings, 'ARCHIVO_FRIO_DIR', os.path.join(str(settings.BASE_DIR), 'archivo_frio')))
+
+    @staticmethod
+    def dias() -> int:
+        return int(getattr(settings, 'ARCHIVO_FRIO_DIAS', 365))
+
+    @staticmethod
+    def gracia_dias() -> int:
+        return int(getattr(settings, 'ARCHIVO_FRIO_GRACIA_DIAS', 30))
+
+    # ------------------------------------------------------------------
+    # Selección
+    # ------------------------------------------------------------------
+    @classmethod
+    def candidatos(cls, tipo: str, dias: Optional[int] = None, empresa_id: Optional[int] = None,
+                   proyecto_id: Optional[int] = None, incluir_proyectos_activos: bool = False):
+        """
+        Queryset de registros archivables: publicados, sin cambios desde hace `dias`
+        y, para tipos con proyecto, de proyectos ya cerrados (activo=False).
+        Se saltan los rehidratados hace menos de ARCHIVO_FRIO_GRACIA_DIAS.
+        """
+        modelo, publicados, campo_fecha, campo_empresa, campo_proyecto, _ = cls.TIPOS[tipo]
+        dias = cls.dias() if dias is None else dias
+        qs = modelo.objects.filter(publicados, **{f'{campo_fecha}__lt': timezone.now() - timedelta(days=dias)})
+        if empresa_id:
+            qs = qs.filter(**{campo_empresa: empresa_id})
+        if campo_proyecto:
+            if proyecto_id:
+                qs = qs.filter(**{campo_proyecto: proyecto_id})
+            if not incluir_proyectos_activos:
+                qs = qs.filter(proyecto__activo=False)
+        recientes = RegistroArchivado.objects.filter(
+            tipo=tipo, rehidratado_en__gte=timezone.now() - timedelta(days=cls.gracia_dias()),
+        ).values_list('objeto_id', flat=True)
+        return qs.exclude(pk__in=list(recientes)).order_by('pk')
+
+    # ------------------------------------------------------------------
+    # Archivar
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _recolectar(raiz) -> Tuple[List, List]:
+        """
+        La raíz y todo lo que su CASCADE borraría, en orden de inserción.
+
+        Returns:
+            (objetos, protegidos) — protegidos son filas con PROTECT que impiden borrarla
+        """
+        colector = NestedObjects(using=DEFAULT_DB_ALIAS)
+        colector.collect([raiz])
+        if colector.protected:
+            return [], [str(o) for o in colector.protected]
+        objetos = []
+        # collect() recorre de la raíz hacia abajo: cada padre aparece antes que sus hijos
+        for modelo, instancias in colector.data.items():
+            # Las tablas intermedias de M2M viajan dentro del objeto que declara el campo
+            if modelo._meta.auto_created:
+                continue
+            objetos.extend(sorted(instancias, key=lambda o: str(o.pk)))
+        return objetos, []
+
+    @classmethod
+    def _ruta_archivo(cls, tipo: str, empresa_id, proyecto_id, sello: str) -> str:
+        return '/'.join([tipo, f'empresa_{empresa_id or "na"}', f'proyecto_{proyecto_id or "na"}',
+                         f'{sello}.jsonl.gz'])
+
+    @classmethod
+    def archivar(cls, tipo: str, qs, lote: Optional[int] = None, al_terminar_lote=None) -> Dict:
+        """
+        Archiva los registros de `qs` (de `candidatos`) por lotes.
+
+        Cada lote es una transacción: se bloquean las raíces, se escriben sus líneas
+        (fsync antes del COMMIT), se crea el índice y se borran las filas. Si algo
+        falla, el lote no se borra y las líneas escritas quedan huérfanas en el
+        archivo (inofensivas: el índice no las referencia).
+
+        Returns:
+            {"archivados": n, "omitidos": [{"id", "motivo"}], "archivos": set(rutas)}
+        """
+        modelo, _, _, campo_empresa, campo_proyecto, campo_encargado = cls.TIPOS[tipo]
+        lote = lote or cls.LOTE
+        sello = timezone.now().strftime('%Y%m%d%H%M%S')
+        resultado = {'archivados': 0, 'omitidos': [], 'archivos': set()}
+        campos = ['pk', campo_empresa, campo_encargado] + ([campo_proyecto] if campo_proyecto else [])
+        pks = list(qs.values_list('pk', flat=True))
+
+        for inicio in range(0, len(pks), lote):
+            bloque = pks[inicio:inicio + lote]
+            with transaction.atomic():
+                raices = {r.pk: r for r in modelo.objects.select_for_update().filter(pk__in=bloque)}
+                datos = {v['pk']: v for v in modelo.objects.filter(pk__in=list(raices)).values(*campos)}
+                archivos = {}
+                registros, archivados = [], []
+                try:
+                    for pk in bloque:
+                        if pk not in raices:
+                            continue  # borrado mientras tanto
+                        objetos, protegidos = cls._recolectar(raices[pk])
+                        if protegidos:
+                            resultado['omitidos'].append(
+                                {'id': str(pk), 'motivo': f"Protegido por {', '.join(protegidos[:3])}"})
+                            continue
+                        info = datos[pk]
+                        empresa_id, encargado_id = info[campo_empresa], info[campo_encargado]
+                        proyecto_id = info[campo_proyecto] if campo_proyecto else None
+                        ruta = cls._ruta_archivo(tipo, empresa_id, proyecto_id, sello)
+                        if ruta not in archivos:
+                            absoluta = os.path.join(cls.directorio(), *ruta.split('/'))
+                            os.makedirs(os.path.dirname(absoluta), exist_ok=True)
+                            archivos[ruta] = open(absoluta, 'ab')
+                        f = archivos[ruta]
+
+                        linea = json.dumps({
+                            'tipo': tipo, 'id': str(pk), 'archivado_en': timezone.now(),
+                            'objetos': serializers.serialize('python', objetos),
+                        }, cls=_EncoderArchivo, ensure_ascii=False) + '\n'
+                        miembro = gzip.compress(linea.encode('utf-8'))
+                        offset = f.tell()
+                        f.write(miembro)
+                        archivados.append(pk)
+                        registros.append(RegistroArchivado(
+                            tipo=tipo, objeto_id=str(pk), empresa_id=empresa_id, proyecto_id=proyecto_id,
+                            encargado_id=encargado_id, archivo=ruta, offset=offset, longitud=len(miembro),
+                            archivado_en=timezone.now(),
+                        ))
+                    for f in archivos.values():
+                        f.flush()
+                        os.fsync(f.fileno())
+                finally:
+                    for f in archivos.values():
+                        f.close()
+
+                ids = [r.objeto_id for r in registros]
+                # Un registro rehidratado y vuelto a archivar reemplaza su entrada
+                RegistroArchivado.objects.filter(tipo=tipo, objeto_id__in=ids).delete()
+                RegistroArchivado.objects.bulk_create(registros)
+                modelo.objects.filter(pk__in=archivados).delete()
+
+            resultado['archivados'] += len(registros)
+            resultado['archivos'].update(archivos)
+            if al_terminar_lote:
+                al_terminar_lote(resultado['archivados'])
+        return resultado
+
+    # ------------------------------------------------------------------
+    # Leer / rehidratar
+    # ------------------------------------------------------------------
+    @classmethod
+    def leer(cls, registro: RegistroArchivado) -> dict:
+        """Línea archivada de un registro (solo lee su miembro gzip)."""
+        ruta = os.path.join(cls.directorio(), *registro.archivo.split('/'))
+        with open(ruta, 'rb') as f:
+            f.seek(registro.offset)
+            miembro = f.read(registro.longitud)
+        return json.loads(gzip.decompress(miembro).decode('utf-8'))
+
+    @staticmethod
+    def puede_rehidratar(user, registro: RegistroArchivado) -> bool:
+        """Visibilidad por rol, con las mismas reglas que MediaProtegidaService."""
+        rol = getattr(user, 'rol', None)
+        if rol == 'superadmin' or getattr(user, 'is_superuser', False):
+            return True
+        if rol == 'admin':
+            return bool(user.empresa_id) and registro.empresa_id == user.empresa_id
+        if rol == 'supervisor':
+            return CustomUser.objects.filter(pk=registro.encargado_id, supervisor_id=user.id).exists()
+        if rol == 'encargado':
+            return registro.encargado_id == user.id
+        return False
+
+    @classmethod
+    def buscar(cls, tipo: str, objeto_id) -> Optional[RegistroArchivado]:
+        return RegistroArchivado.objects.filter(
+            tipo=tipo, objeto_id=str(objeto_id), rehidratado_en__isnull=True).first()
+
+    @classmethod
+    def rehidratar(cls, tipo: str, objeto_id) -> bool:
+        """
+        Devuelve el registro archivado a las tablas vivas.
+
+        Returns:
+            True si quedó en la base (rehidratado ahora o por una petición
+            concurrente), False si no está archivado
+
+        Raises:
+            IntegrityError si algún padre (encargado, sector, ...) ya no existe
+        """
+        with transaction.atomic():
+            registro = (RegistroArchivado.objects.select_for_update()
+                        .filter(tipo=tipo, objeto_id=str(objeto_id)).first())
+            if registro is None:
+                return False
+            if registro.rehidratado_en is not None:
+                return True
+
+            objetos = list(serializers.deserialize('python', cls.leer(registro)['objetos']))
+            with transaction.atomic():
+                for obj in objetos:
+                    obj.save(force_insert=True)  # las filas no existen: sin UPDATE previo
+            registro.rehidratado_en = timezone.now()
+            registro.save(update_fields=['rehidratado_en'])
+
+            # save(raw) no dispara las señales del change-feed
+            for obj in objetos:
+                SyncFeedService.registrar(obj.object, 'upsert')
+        return True
@@ -0,0 +1,160 @@
+from collections import Counter
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Sum
+
+from ..models.models import Reporte
+from ..models.models_avance import ContadorAvance
+
+Clave = Tuple[int, int, str, str]  # (zona_id, sector_id, tipo, estado)
+
+
+class ContadoresAvanceService:
+    """
+    Contadores desnormalizados de reportes por zona/sector/tipo/estado.
+
+    Se mantienen con señales de Reporte (pre_save, post_save, post_delete):
+      - alta: +1 a su clave
+      - cambio de estado, tipo, zona o sector: -1 a la clave anterior, +1 a la nueva
+      - baja (también al archivar en frío): -1
+    El incremento es un único UPSERT atómico (INSERT ... ON CONFLICT DO UPDATE
+    SET total = total + n) que corre en la transacción del guardado, así que dos
+    publicaciones simultáneas en el mismo sector no se pisan.
+
+    Los caminos sin señales (bulk_create, COPY, QuerySet.update) deben llamar a
+    `sumar_reportes`; cualquier desvío lo corrige `reconciliar`.
+    """
+
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
+    @staticmethod
+    def clave(instance: Reporte) -> Clave:
+        return tuple(getattr(instance, c) for c in Reporte.CAMPOS_AVANCE)
+
+    @classmethod
+    def aplicar(cls, deltas: Dict[Clave, int]) -> None:
+        """Suma cada delta (positivo o negativo) a su contador, creándolo si falta."""
+        filas = [(*clave, delta) for clave, delta in deltas.items() if delta and None not in clave]
+        if not filas:
+            return
+        if connection.vendor in ('postgresql', 'sqlite'):
+            tabla = connection.ops.quote_name(ContadorAvance._meta.db_table)
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f"INSERT INTO {tabla} (zona_id, sector_id, tipo, estado, total) "
+                    f"VALUES (%s, %s, %s, %s, %s) "
+                    f"ON CONFLICT (sector_id, zona_id, tipo, estado) "
+                    f"DO UPDATE SET total = {tabla}.total + excluded.total",
+                    filas,
+                )
+            return
+        for zona_id, sector_id, tipo, estado, delta in filas:
+            clave = dict(zona_id=zona_id, sector_id=sector_id, tipo=tipo, estado=estado)
+            with transaction.atomic():
+                if not ContadorAvance.objects.filter(**clave).update(total=F('total') + delta):
+                    ContadorAvance.objects.create(total=delta, **clave)
+
+    @classmethod
+    def sumar_reportes(cls, reportes: Iterable[Reporte], signo: int = 1) -> None:
+        """Para altas/bajas masivas que no disparan señales (importaciones)."""
+        deltas = Counter()
+        for reporte in reportes:
+            deltas[cls.clave(reporte)] += signo
+        cls.aplicar(deltas)
+
+    # ------------------------------------------------------------------
+    # Señales
+    # ------------------------------------------------------------------
+    @classmethod
+    def antes_de_guardar(cls, sender, instance, raw=False, **kwargs):
+        # Instancia cargada con only()/defer() o creada a mano con pk: se lee la clave guardada
+        if raw or instance._state.adding or hasattr(instance, '_clave_avance'):
+            return
+        fila = Reporte.objects.filter(pk=instance.pk).values_list(*Reporte.CAMPOS_AVANCE).first()
+        if fila:
+            instance._clave_avance = fila
+
+    @classmethod
+    def al_guardar(cls, sender, instance, created=False, **kwargs):
+        nueva = cls.clave(instance)
+        anterior = None if created else getattr(instance, '_clave_avance', None)
+        if anterior != nueva:
+            deltas = Counter({nueva: 1})
+            if anterior is not None:
+                deltas[anterior] -= 1
+            cls.aplicar(deltas)
+        instance._clave_avance = nueva
+
+    @classmethod
+    def al_borrar(cls, sender, instance, **kwargs):
+        cls.aplicar({getattr(instance, '_clave_avance', None) or cls.clave(instance): -1})
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+    @staticmethod
+    def avance(**filtro) -> dict:
+        """
+        Totales por tipo y estado para `sector_id=` o `zona_id=`.
+
+        Returns:
+            {"total": n, "por_tipo": {tipo: {"total": n, "por_estado": {estado: n}}}}
+        """
+        filas = (ContadorAvance.objects.filter(**filtro).filter(total__gt=0)
+                 .values('tipo', 'estado').annotate(n=Sum('total')).order_by('tipo', 'estado'))
+        resultado = {'total': 0, 'por_tipo': {}}
+        for fila in filas:
+            tipo = resultado['por_tipo'].setdefault(fila['tipo'], {'total': 0, 'por_estado': {}})
+            tipo['por_estado'][fila['estado']] = fila['n']
+            tipo['total'] += fila['n']
+            resultado['total'] += fila['n']
+        return resultado
+
+    # ------------------------------------------------------------------
+    # Reconciliación
+    # ------------------------------------------------------------------
+    @classmethod
+    def reconciliar(cls, zona_id: Optional[int] = None, batch_size: int = 1000) -> dict:
+        """
+        Recalcula los contadores con un GROUP BY sobre Reporte y reemplaza los
+        guardados (todos o los de una zona).
+
+        En PostgreSQL la tabla de contadores se bloquea (EXCLUSIVE) antes de contar:
+        los guardados concurrentes esperan y suman después del recálculo, sin
+        perderse ni contarse dos veces.
+
+        Returns:
+            {"filas": n, "corregidas": n, "diferencia": suma de |guardado - real|}
+        """
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute(f'LOCK TABLE {connection.ops.quote_name(ContadorAvance._meta.db_table)} '
+                                   f'IN EXCLUSIVE MODE')
+            actuales = ContadorAvance.objects.all()
+            reportes = Reporte.objects.all()
+            if zona_id is not None:
+                actuales = actuales.filter(zona_id=zona_id)
+                reportes = reportes.filter(zona_id=zona_id)
+
+            guardados = {(c.zona_id, c.sector_id, c.tipo, c.estado): c.total for c in actuales}
+            reales = {
+                (r['zona_id'], r['sector_id'], r['tipo'], r['estado']): r['n']
+                for r in reportes.values(*Reporte.CAMPOS_AVANCE).annotate(n=Count('id')).order_by()
+            }
+            actuales.delete()
+            ContadorAvance.objects.bulk_create(
+                [ContadorAvance(zona_id=z, sector_id=s, tipo=t, estado=e, total=n)
+                 for (z, s, t, e), n in reales.items()],
+                batch_size=batch_size,
+            )
+
+        claves = set(guardados) | set(reales)
+        diferencias = [abs(guardados.get(k, 0) - reales.get(k, 0)) for k in claves]
+        return {
+            'filas': len(reales),
+            'corregidas': sum(1 for d in diferencias if d),
+            'diferencia': sum(diferencias),
+        }
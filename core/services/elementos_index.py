@@ -0,0 +1,139 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from django.db import models, transaction
+
+from ..models.models import ElementoElectrico, PosteElectricoWizard
+from ..models.models_telematico import PosteTelematicWizard
+from ..models.models_elementos import PosteElementoLink
+
+
+class ElementosIndexService:
+    """
+    Servicio que mantiene la tabla PosteElementoLink sincronizada con los
+    arrays JSON `elementos_electricos` / `elementos_telematicos` de la Parte 1
+    (tanto del wizard eléctrico como del telemático).
+    """
+
+    WIZARD_MODELS = {
+        'electrico': PosteElectricoWizard,
+        'telematico': PosteTelematicWizard,
+    }
+    LISTAS = ('electrico', 'telematico')
+
+    def __init__(self, tipo_poste: str):
+        if tipo_poste not in self.WIZARD_MODELS:
+            raise ValueError(f'tipo_poste inválido: {tipo_poste}')
+        self.tipo_poste = tipo_poste
+        self.wizard_model = self.WIZARD_MODELS[tipo_poste]
+        self.fk_name = f'poste_{tipo_poste}'
+
+    def _catalogo(self, valores: Iterable) -> Tuple[Set[int], Dict[str, int]]:
+        """
+        Carga del catálogo solo lo necesario para resolver `valores`.
+
+        Returns:
+            (ids válidos, mapa nombre en minúsculas -> id)
+        """
+        ids, nombres = set(), set()
+        for v in valores:
+            if isinstance(v, int) or (isinstance(v, str) and v.strip().isdigit()):
+                ids.add(int(v))
+            elif isinstance(v, str) and v.strip():
+                nombres.add(v.strip())
+
+        validos, por_nombre = set(), {}
+        if ids:
+            validos = set(ElementoElectrico.objects.filter(id__in=ids).values_list('id', flat=True))
+        if nombres:
+            # El telemático guarda strings: pueden ser IDs o nombres del catálogo
+            q = models.Q()
+            for n in nombres:
+                q |= models.Q(nombre__iexact=n)
+            por_nombre = {
+                nombre.lower(): pk
+                for pk, nombre in ElementoElectrico.objects.filter(q).values_list('id', 'nombre')
+            }
+        return validos, por_nombre
+
+    @staticmethod
+    def _resolver(valores, validos: Set[int], por_nombre: Dict[str, int]) -> List[int]:
+        """Traduce los valores crudos del JSON a IDs de ElementoElectrico (ignora los desconocidos)."""
+        resueltos = []
+        for v in valores or []:
+            if isinstance(v, int) or (isinstance(v, str) and v.strip().isdigit()):
+                pk = int(v)
+                if pk in validos:
+                    resueltos.append(pk)
+            elif isinstance(v, str):
+                pk = por_nombre.get(v.strip().lower())
+                if pk is not None:
+                    resueltos.append(pk)
+        return resueltos
+
+    def _links_para(self, wizard, validos, por_nombre) -> List[PosteElementoLink]:
+        links = []
+        for lista in self.LISTAS:
+            for elemento_id in dict.fromkeys(
+                self._resolver(getattr(wizard, f'elementos_{lista}s', None), validos, por_nombre)
+            ):
+                links.append(PosteElementoLink(
+                    tipo_poste=self.tipo_poste,
+                    elemento_id=elemento_id,
+                    lista=lista,
+                    **{f'{self.fk_name}_id': wizard.id}
+                ))
+        return links
+
+    def sincronizar(self, wizard: models.Model) -> int:
+        """
+        Reemplaza los links de un wizard por los de su Parte 1 actual.
+        Debe llamarse dentro de la misma transacción que guarda la Parte 1.
+
+        Args:
+            wizard: Instancia de PosteElectricoWizard o PosteTelematicWizard
+
+        Returns:
+            Número de links creados
+        """
+        valores = list(wizard.elementos_electricos or []) + list(wizard.elementos_telematicos or [])
+        validos, por_nombre = self._catalogo(valores)
+        links = self._links_para(wizard, validos, por_nombre)
+
+        PosteElementoLink.objects.filter(**{self.fk_name: wizard}).delete()
+        PosteElementoLink.objects.bulk_create(links)
+        return len(links)
+
+    def reindexar(self, queryset: Optional[models.QuerySet] = None, batch_size: int = 500) -> int:
+        """
+        Reconstruye los links de todos los wizards (o de `queryset`) por lotes.
+
+        Args:
+            queryset: Wizards a reindexar (por defecto todos)
+            batch_size: Cantidad de wizards procesados por transacción
+
+        Returns:
+            Número total de links creados
+        """
+        qs = queryset if queryset is not None else self.wizard_model.objects.all()
+        qs = qs.only('id', 'elementos_electricos', 'elementos_telematicos').order_by('id')
+
+        # El catálogo es pequeño: se carga completo una sola vez para todo el backfill
+        validos = set(ElementoElectrico.objects.values_list('id', flat=True))
+        por_nombre = {n.lower(): pk for pk, n in ElementoElectrico.objects.values_list('id', 'nombre')}
+
+        total = 0
+        ultimo_id = 0
+        while True:
+            lote = list(qs.filter(id__gt=ultimo_id)[:batch_size])
+            if not lote:
+                break
+            links = []
+            for wizard in lote:
+                links.extend(self._links_para(wizard, validos, por_nombre))
+            with transaction.atomic():
+                PosteElementoLink.objects.filter(
+                    **{f'{self.fk_name}_id__in': [w.id for w in lote]}
+                ).delete()
+                PosteElementoLink.objects.bulk_create(links, batch_size=1000)
+            total += len(links)
+            ultimo_id = lote[-1].id
+        return total
@@ -0,0 +1,46 @@
+"""
+Hash de contraseñas repartido entre procesos.
+
+Este módulo no importa modelos: con 'forkserver' o 'spawn' cada proceso hijo
+arranca limpio, importa solo esto y hashea con los PASSWORD_HASHERS de
+DJANGO_SETTINGS_MODULE (heredado del entorno). Así el pool es seguro dentro
+de un servidor web con hilos y conexiones abiertas, donde 'fork' copiaría
+sockets y locks a medio usar. 'fork' queda para procesos de un solo hilo
+(manage.py).
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from django.contrib.auth.hashers import make_password
+
+
+def _hashear(passwords: List[str]) -> List[str]:
+    """Se ejecuta en los procesos hijos: hashea un bloque de contraseñas."""
+    return [make_password(pw) for pw in passwords]
+
+
+def metodo_seguro() -> str:
+    """'forkserver' donde existe (Linux), si no 'spawn'."""
+    return 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+def hashear(passwords: List[str], workers: int, metodo: Optional[str] = None) -> List[str]:
+    """
+    Hashea `passwords` en `workers` procesos creados con `metodo` (por defecto
+    `metodo_seguro()`). Cada hash lleva su propia sal. Si no se pueden crear
+    procesos, hashea en el proceso actual.
+    """
+    if workers <= 1:
+        return _hashear(passwords)
+    metodo = metodo or metodo_seguro()
+    if metodo not in multiprocessing.get_all_start_methods():
+        return _hashear(passwords)
+    tam = -(-len(passwords) // (workers * 4))
+    bloques = [passwords[i:i + tam] for i in range(0, len(passwords), tam)]
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(metodo)) as pool:
+            return [h for bloque in pool.map(_hashear, bloques) for h in bloque]
+    except OSError:
+        # Entornos sin permiso para crear procesos
+        return _hashear(passwords)
@@ -0,0 +1,492 @@
+import csv
+import io
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connection, models, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.text import slugify
+
+from ..models.models import CustomUser, DetallePredio, FotoReporte, Proyecto, Reporte, Sector, Zona
+from ..models.models_importacion import ImportacionLegado
+from .contadores_avance import ContadoresAvanceService
+from .sync_feed import SyncFeedService
+
+VERDADEROS = {'1', 't', 'true', 'si', 'sí', 's', 'x', 'yes'}
+FALSOS = {'0', 'f', 'false', 'no', 'n', ''}
+
+
+class ImportacionReportesService:
+    """
+    Carga masiva de reportes históricos (Reporte + DetallePredio + FotoReporte)
+    desde CSV o JSONL, leyendo el archivo en streaming.
+
+    Columnas / claves por fila:
+      encargado_dni, zona, sector (nombres), distrito y proyecto (nombres, opcionales;
+      distrito y proyecto desambiguan zonas homónimas; la zona debe ser del proyecto,
+      que por defecto es el de la zona),
+      tipo (default predio), fecha_reporte, estado, observaciones, latitud, longitud,
+      fotos (rutas relativas a `fotos_dir`, separadas por ';' en CSV o lista en JSONL)
+      y, para predios, cualquier campo de DetallePredio (codigo_predio, manzana, ...).
+
+    - Los nombres se resuelven con mapas en memoria cargados una sola vez.
+    - Cada lote se inserta con bulk_create (COPY en PostgreSQL) en su propia
+      transacción, junto con el avance en ImportacionLegado: un corte nunca deja
+      un lote a medias y al reanudar se salta lo ya confirmado.
+    - Las fotos se copian a MEDIA_ROOT con un pool de hilos antes de abrir la
+      transacción; el destino es fijo por fila, así que reanudar no las duplica.
+    - Las filas con errores se informan y se saltan; no detienen la importación.
+    """
+
+    LOTE = 1000
+    WORKERS_FOTOS = 8
+    CARPETA_FOTOS = 'fotos_reportes/legado'
+    CAMPOS_DETALLE = [
+        f for f in DetallePredio._meta.concrete_fields
+        if not f.primary_key and f.name != 'reporte'
+    ]
+
+    def __init__(self, importacion: ImportacionLegado, fotos_dir: Optional[str] = None,
+                 lote: Optional[int] = None, workers: Optional[int] = None,
+                 usar_copy: Optional[bool] = None, registrar_sync: bool = True):
+        """
+        Args:
+            importacion: Punto de control (se crea/recupera en el comando)
+            fotos_dir: Carpeta de origen de las fotos
+            lote: Filas por transacción
+            workers: Hilos para copiar fotos
+            usar_copy: COPY en PostgreSQL (None = automático según el motor)
+            registrar_sync: Agregar los reportes al feed de sincronización
+        """
+        self.importacion = importacion
+        self.fotos_dir = fotos_dir
+        self.lote = lote or self.LOTE
+        self.workers = workers or self.WORKERS_FOTOS
+        if usar_copy is None:
+            usar_copy = connection.vendor == 'postgresql'
+        self.usar_copy = usar_copy and connection.vendor == 'postgresql'
+        self.registrar_sync = registrar_sync
+        self.carpeta_fotos = f"{self.CARPETA_FOTOS}/{slugify(importacion.nombre) or importacion.pk}"
+        self._cargar_mapas()
+
+    # ------------------------------------------------------------------
+    # Lectura (streaming)
+    # ------------------------------------------------------------------
+    @staticmethod
+    def leer(ruta: str, formato: str) -> Iterator[dict]:
+        """Itera las filas de un .csv o .jsonl sin cargar el archivo en memoria."""
+        if formato not in ('csv', 'jsonl'):
+            raise ValueError(f'formato inválido: {formato}')
+        with open(ruta, encoding='utf-8-sig', newline='') as f:
+            if formato == 'jsonl':
+                for n, linea in enumerate(f, start=1):
+                    linea = linea.strip()
+                    if not linea:
+                        yield {}
+                        continue
+                    try:
+                        fila = json.loads(linea)
+                    except ValueError:
+                        fila = {'__error__': f'JSON inválido en la línea {n}.'}
+                    yield fila if isinstance(fila, dict) else {'__error__': 'Cada línea debe ser un objeto JSON.'}
+                return
+            muestra = f.read(4096)
+            f.seek(0)
+            try:
+                dialecto = csv.Sniffer().sniff(muestra, delimiters=',;\t')
+            except csv.Error:
+                dialecto = csv.excel
+            for fila in csv.DictReader(f, dialect=dialecto):
+                yield {(k or '').strip().lower(): v for k, v in fila.items()}
+
+    # ------------------------------------------------------------------
+    # Mapas de nombres
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _clave(valor) -> str:
+        return ' '.join(str(valor or '').split()).lower()
+
+    def _cargar_mapas(self) -> None:
+        self.encargados: Dict[str, Tuple[int, str, Optional[int]]] = {
+            dni: (pk, rol, empresa_id)
+            for pk, dni, rol, empresa_id in CustomUser.objects.values_list('id', 'dni', 'rol', 'empresa_id').iterator()
+        }
+        self.proyectos: Dict[str, List[Tuple[int, int]]] = {}
+        self.empresa_proyecto: Dict[int, Optional[int]] = {}
+        for pk, nombre, empresa_id in Proyecto.objects.values_list('id', 'nombre', 'empresa_id'):
+            self.proyectos.setdefault(self._clave(nombre), []).append((pk, empresa_id))
+            self.empresa_proyecto[pk] = empresa_id
+        # nombre -> [(zona_id, distrito, proyecto_id, empresa del distrito)]
+        self.zonas: Dict[str, List[Tuple[int, str, Optional[int], Optional[int]]]] = {}
+        for pk, nombre, distrito, proyecto_id, empresa_distrito in Zona.objects.values_list(
+                'id', 'nombre', 'distrito__nombre', 'proyecto_id', 'distrito__empresa_id'):
+            self.zonas.setdefault(self._clave(nombre), []).append(
+                (pk, self._clave(distrito), proyecto_id, empresa_distrito))
+        self.sectores: Dict[Tuple[int, str], int] = {
+            (zona_id, self._clave(nombre)): pk
+            for pk, nombre, zona_id in Sector.objects.values_list('id', 'nombre', 'zona_id').iterator()
+        }
+
+    # ------------------------------------------------------------------
+    # Normalización
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _texto(valor) -> str:
+        return str(valor if valor is not None else '').strip()
+
+    @staticmethod
+    def _fecha(valor) -> Optional[datetime]:
+        valor = str(valor or '').strip()
+        if not valor:
+            return None
+        # Primero solo fecha: parse_datetime también la acepta, pero como medianoche,
+        # y al pasar a UTC el reporte puede caer en el día anterior
+        dia = parse_date(valor)
+        if dia is not None:
+            fecha = datetime.combine(dia, time(12, 0))
+        else:
+            fecha = parse_datetime(valor)
+            if fecha is None:
+                raise ValueError(valor)
+        if settings.USE_TZ and timezone.is_naive(fecha):
+            fecha = timezone.make_aware(fecha)
+        return fecha
+
+    @staticmethod
+    def _lista_fotos(valor) -> List[str]:
+        if valor in (None, ''):
+            return []
+        partes = valor if isinstance(valor, list) else str(valor).split(';')
+        return [str(p).strip() for p in partes if str(p).strip()]
+
+    def _campo_detalle(self, campo: models.Field, valor):
+        if isinstance(valor, str):
+            valor = valor.strip()
+        if isinstance(campo, models.BooleanField):
+            texto = str(valor).lower() if not isinstance(valor, bool) else ('1' if valor else '0')
+            if texto in VERDADEROS:
+                return True
+            if texto in FALSOS:
+                return False
+            raise ValidationError(f'{campo.name}: se esperaba sí/no.')
+        if valor in ('', None):
+            if campo.null:
+                return None
+            if campo.has_default():
+                return campo.get_default()
+            return ''
+        valor = campo.to_python(valor)
+        if campo.max_length and len(str(valor)) > campo.max_length:
+            raise ValidationError(f'{campo.name}: máximo {campo.max_length} caracteres.')
+        if campo.choices and valor not in dict(campo.choices):
+            raise ValidationError(f"{campo.name}: valor inválido '{valor}'.")
+        return valor
+
+    def normalizar(self, fila: dict, n: int) -> Tuple[Optional[dict], List[str]]:
+        """
+        Convierte una fila del archivo en los datos de Reporte/DetallePredio/fotos.
+
+        Returns:
+            (datos, errores) — datos es None si la fila tiene errores
+        """
+        if fila.get('__error__'):
+            return None, [fila['__error__']]
+        if not fila:
+            return None, ['Fila vacía.']
+        errores = []
+        g = lambda k: self._texto(fila.get(k))  # noqa: E731
+
+        tipo = g('tipo').lower() or 'predio'
+        if tipo not in dict(Reporte.TIPO_REPORTE):
+            errores.append(f"tipo inválido: {tipo}")
+
+        encargado = self.encargados.get(g('encargado_dni'))
+        if encargado is None:
+            errores.append(f"encargado_dni no existe: {g('encargado_dni') or '(vacío)'}")
+        elif encargado[1] != 'encargado':
+            errores.append("encargado_dni no corresponde a un encargado.")
+
+        # El proyecto se resuelve primero: decide entre zonas homónimas y la zona debe ser suya
+        proyecto_id = None
+        if g('proyecto'):
+            opciones = self.proyectos.get(self._clave(g('proyecto')), [])
+            if encargado and encargado[2]:
+                opciones = [p for p in opciones if p[1] == encargado[2]]
+            if len(opciones) != 1:
+                errores.append(f"proyecto {'ambiguo' if opciones else 'no existe'}: {g('proyecto')}")
+            else:
+                proyecto_id = opciones[0][0]
+
+        zona_id = None
+        candidatas = self.zonas.get(self._clave(g('zona')), [])
+        distrito = self._clave(g('distrito'))
+        if distrito:
+            candidatas = [z for z in candidatas if z[1] == distrito]
+        if candidatas and proyecto_id is not None:
+            empresa_id = self.empresa_proyecto.get(proyecto_id)
+            # Zonas del proyecto, o sin proyecto en un distrito compartido o de la misma empresa
+            del_proyecto = [z for z in candidatas if z[2] == proyecto_id
+                            or (z[2] is None and z[3] in (None, empresa_id))]
+            if not del_proyecto:
+                errores.append(f"La zona {g('zona')} no pertenece al proyecto {g('proyecto')}.")
+            candidatas = del_proyecto
+        elif not candidatas:
+            errores.append(f"zona no existe: {g('zona') or '(vacía)'}")
+        if len(candidatas) > 1:
+            errores.append(f"zona ambigua: {g('zona')} (indica distrito)")
+        elif candidatas:
+            zona_id, _, proyecto_zona, _ = candidatas[0]
+            if proyecto_id is None and not g('proyecto'):
+                proyecto_id = proyecto_zona
+                if proyecto_id is None:
+                    errores.append("La zona no tiene proyecto; indica la columna proyecto.")
+                elif encargado and encargado[2] and self.empresa_proyecto.get(proyecto_id) != encargado[2]:
+                    errores.append("La zona pertenece a un proyecto de otra empresa que el encargado.")
+
+        sector_id = self.sectores.get((zona_id, self._clave(g('sector')))) if zona_id else None
+        if zona_id and sector_id is None:
+            errores.append(f"sector no existe en la zona: {g('sector') or '(vacío)'}")
+
+        estado = g('estado').lower() or 'registrado'
+        if estado not in dict(Reporte.ESTADOS):
+            errores.append(f"estado inválido: {estado}")
+        try:
+            fecha = self._fecha(fila.get('fecha_reporte'))
+        except ValueError:
+            errores.append(f"fecha_reporte inválida: {g('fecha_reporte')}")
+            fecha = None
+        coords = {}
+        for campo in ('latitud', 'longitud'):
+            try:
+                coords[campo] = float(g(campo)) if g(campo) else None
+            except ValueError:
+                errores.append(f"{campo} inválida: {g(campo)}")
+
+        detalle = None
+        if tipo == 'predio':
+            detalle = {}
+            for campo in self.CAMPOS_DETALLE:
+                if campo.name in fila:
+                    try:
+                        detalle[campo.attname] = self._campo_detalle(campo, fila[campo.name])
+                    except ValidationError as e:
+                        errores.extend(e.messages)
+
+        if errores:
+            return None, errores
+        return {
+            'fila': n,
+            'reporte': {
+                'tipo': tipo, 'encargado_id': encargado[0], 'proyecto_id': proyecto_id,
+                'zona_id': zona_id, 'sector_id': sector_id, 'estado': estado,
+                'observaciones': g('observaciones') or None, **coords,
+            },
+            'fecha': fecha,
+            'detalle': detalle,
+            'fotos': self._lista_fotos(fila.get('fotos')),
+        }, []
+
+    # ------------------------------------------------------------------
+    # Fotos
+    # ------------------------------------------------------------------
+    def _destino_foto(self, fila: int, i: int, origen: str) -> str:
+        return f"{self.carpeta_fotos}/{fila}_{i}_{os.path.basename(origen)}"
+
+    def _copiar_foto(self, origen: str, destino: str) -> Optional[str]:
+        """Copia una foto; devuelve un mensaje de error o None."""
+        if not self.fotos_dir:
+            return 'No se indicó la carpeta de fotos.'
+        ruta_origen = os.path.normpath(os.path.join(self.fotos_dir, origen))
+        if not ruta_origen.startswith(os.path.normpath(self.fotos_dir) + os.sep):
+            return f'Ruta de foto fuera de la carpeta: {origen}'
+        ruta_destino = os.path.join(str(settings.MEDIA_ROOT), *destino.split('/'))
+        try:
+            tamano = os.path.getsize(ruta_origen)
+            # Reanudación: ya copiada en una corrida anterior
+            if os.path.exists(ruta_destino) and os.path.getsize(ruta_destino) == tamano:
+                return None
+            os.makedirs(os.path.dirname(ruta_destino), exist_ok=True)
+            shutil.copyfile(ruta_origen, ruta_destino)
+        except OSError as e:
+            return f'No se pudo copiar {origen}: {e.strerror or e}'
+        return None
+
+    def copiar_fotos(self, datos: List[dict]) -> List[dict]:
+        """
+        Copia en paralelo las fotos del lote (E/S de disco, el GIL no estorba).
+
+        Returns:
+            Avisos {"fila", "errores"} de las fotos que no se pudieron copiar;
+            esas fotos se omiten pero el reporte se importa igual.
+        """
+        tareas = []
+        for d in datos:
+            d['fotos_destino'] = []
+            for i, origen in enumerate(d['fotos']):
+                tareas.append((d, origen, self._destino_foto(d['fila'], i, origen)))
+        if not tareas:
+            return []
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            resultados = list(pool.map(lambda t: self._copiar_foto(t[1], t[2]), tareas))
+
+        avisos: Dict[int, List[str]] = {}
+        for (d, _, destino), error in zip(tareas, resultados):
+            if error:
+                avisos.setdefault(d['fila'], []).append(error)
+            else:
+                d['fotos_destino'].append(destino)
+        return [{'fila': fila, 'errores': errores} for fila, errores in avisos.items()]
+
+    # ------------------------------------------------------------------
+    # Inserción
+    # ------------------------------------------------------------------
+    def _objetos(self, datos: List[dict]):
+        ahora = timezone.now()
+        return [Reporte(fecha_reporte=d['fecha'] or ahora, **d['reporte']) for d in datos]
+
+    def _hijos(self, datos: List[dict], reportes: List[Reporte]):
+        detalles, fotos = [], []
+        for d, rep in zip(datos, reportes):
+            if d['detalle'] is not None:
+                detalles.append(DetallePredio(reporte_id=rep.id, **d['detalle']))
+            for i, nombre in enumerate(d['fotos_destino']):
+                fotos.append(FotoReporte(
+                    reporte_id=rep.id, imagen=nombre, tipo='fachada' if i == 0 else '',
+                    latitud=rep.latitud, longitud=rep.longitud, is_principal=i == 0,
+                ))
+        return detalles, fotos
+
+    def _insertar_bulk(self, datos: List[dict]) -> Tuple[List[Reporte], int]:
+        reportes = self._objetos(datos)
+        fechas = [r.fecha_reporte for r in reportes]
+        Reporte.objects.bulk_create(reportes, batch_size=self.lote)
+        # auto_now_add pisa fecha_reporte en el INSERT: se restaura la histórica
+        for rep, fecha in zip(reportes, fechas):
+            rep.fecha_reporte = fecha
+        Reporte.objects.bulk_update(reportes, ['fecha_reporte'], batch_size=self.lote)
+
+        detalles, fotos = self._hijos(datos, reportes)
+        DetallePredio.objects.bulk_create(detalles, batch_size=self.lote)
+        FotoReporte.objects.bulk_create(fotos, batch_size=self.lote)
+        return reportes, len(fotos)
+
+    @staticmethod
+    def _valor_copy(valor) -> str:
+        if valor is None:
+            return '\\N'
+        if isinstance(valor, bool):
+            return 't' if valor else 'f'
+        texto = valor.isoformat() if isinstance(valor, datetime) else str(valor)
+        return (texto.replace('\\', '\\\\').replace('\t', '\\t')
+                     .replace('\n', '\\n').replace('\r', '\\r'))
+
+    def _copy(self, cursor, model, objetos: List[models.Model], con_pk: bool) -> None:
+        campos = [f for f in model._meta.concrete_fields if con_pk or not f.primary_key]
+        buffer = io.StringIO()
+        for obj in objetos:
+            buffer.write('\t'.join(
+                self._valor_copy(f.get_db_prep_save(getattr(obj, f.attname), connection)) for f in campos
+            ))
+            buffer.write('\n')
+        buffer.seek(0)
+        columnas = ', '.join(connection.ops.quote_name(f.column) for f in campos)
+        cursor.copy_expert(
+            f"COPY {connection.ops.quote_name(model._meta.db_table)} ({columnas}) FROM STDIN", buffer)
+
+    def _insertar_copy(self, datos: List[dict]) -> Tuple[List[Reporte], int]:
+        reportes = self._objetos(datos)
+        with connection.cursor() as cursor:
+            # Los ids se reservan de la secuencia para poder enlazar detalle y fotos
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)",
+                [Reporte._meta.db_table, len(reportes)],
+            )
+            for rep, (pk,) in zip(reportes, cursor.fetchall()):
+                rep.id = pk
+            detalles, fotos = self._hijos(datos, reportes)
+            crudo = cursor.cursor  # cursor de psycopg2
+            self._copy(crudo, Reporte, reportes, con_pk=True)
+            self._copy(crudo, DetallePredio, detalles, con_pk=False)
+            self._copy(crudo, FotoReporte, fotos, con_pk=False)
+        return reportes, len(fotos)
+
+    def insertar_lote(self, datos: List[dict], procesadas: int, errores: int) -> Tuple[int, int]:
+        """
+        Inserta un lote y avanza el punto de control en la misma transacción.
+
+        Returns:
+            (reportes creados, fotos enlazadas)
+        """
+        with transaction.atomic():
+            if datos:
+                insertar = self._insertar_copy if self.usar_copy else self._insertar_bulk
+                reportes, n_fotos = insertar(datos)
+                # bulk_create/COPY no disparan las señales de los contadores
+                ContadoresAvanceService.sumar_reportes(reportes)
+                if self.registrar_sync:
+                    SyncFeedService.registrar_lote('reporte', ((r.id, r.encargado_id) for r in reportes))
+            else:
+                reportes, n_fotos = [], 0
+            ImportacionLegado.objects.filter(pk=self.importacion.pk).update(
+                filas_procesadas=F('filas_procesadas') + procesadas,
+                reportes_creados=F('reportes_creados') + len(reportes),
+                fotos_copiadas=F('fotos_copiadas') + n_fotos,
+                filas_con_error=F('filas_con_error') + errores,
+                actualizada_en=timezone.now(),
+            )
+        return len(reportes), n_fotos
+
+    # ------------------------------------------------------------------
+    # Orquestación
+    # ------------------------------------------------------------------
+    def importar(self, filas: Iterable[dict], al_terminar_lote=None) -> dict:
+        """
+        Recorre `filas` (ya posicionadas después de lo procesado) por lotes.
+
+        Args:
+            al_terminar_lote: callback(resumen_lote: dict) para informar progreso
+
+        Returns:
+            {"procesadas", "creados", "fotos", "errores": [{"fila", "errores"}]}
+        """
+        inicio = self.importacion.filas_procesadas
+        total = {'procesadas': 0, 'creados': 0, 'fotos': 0, 'errores': []}
+        lote: List[dict] = []
+        errores_lote: List[dict] = []
+
+        def cerrar_lote(n_filas):
+            avisos = self.copiar_fotos(lote)
+            creados, fotos = self.insertar_lote(lote, n_filas, len(errores_lote))
+            total['procesadas'] += n_filas
+            total['creados'] += creados
+            total['fotos'] += fotos
+            total['errores'].extend(errores_lote + avisos)
+            if al_terminar_lote:
+                al_terminar_lote({'hasta_fila': inicio + total['procesadas'], 'creados': creados,
+                                  'fotos': fotos, 'errores': errores_lote + avisos})
+
+        n_filas = 0
+        for n, fila in enumerate(filas, start=inicio + 1):
+            n_filas += 1
+            datos, errores = self.normalizar(fila, n)
+            if errores:
+                errores_lote.append({'fila': n, 'errores': errores})
+            else:
+                lote.append(datos)
+            if n_filas >= self.lote:
+                cerrar_lote(n_filas)
+                lote, errores_lote, n_filas = [], [], 0
+        if n_filas:
+            cerrar_lote(n_filas)
+
+        ImportacionLegado.objects.filter(pk=self.importacion.pk).update(
+            estado='terminada', actualizada_en=timezone.now())
+        return total
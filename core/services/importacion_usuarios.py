@@ -0,0 +1,314 @@
+import csv
+import io
+import json
+import os
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.contrib.auth.base_user import BaseUserManager
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models.functions import Lower
+
+from ..models.models import CustomUser, Empresa, Sector
+from . import hash_paralelo
+
+
+class ImportacionUsuariosService:
+    """
+    Alta masiva de usuarios desde CSV o JSON.
+
+    Columnas / claves por fila:
+      dni, email, nombres, apellidos, password (u opcional con password_defecto),
+      rol (default encargado), celular, empresa_id, supervisor_dni,
+      sectores (IDs separados por ';' o ',' en CSV, lista en JSON).
+
+    La validación es todo o nada: si alguna fila tiene errores no se crea ningún
+    usuario. Las consultas de unicidad y de FKs se hacen por lotes, no por fila.
+
+    Las contraseñas se hashean en un pool de procesos (core/services/hash_paralelo):
+    por HTTP con 'forkserver'/'spawn', seguro dentro del servidor web; el comando
+    puede usar 'fork'. Por HTTP se aceptan hasta MAX_FILAS_HTTP filas para que la
+    petición termine antes del timeout del proxy; más filas, con el comando.
+    """
+
+    ROLES_VALIDOS = ('superadmin', 'admin', 'supervisor', 'encargado')
+    MAX_FILAS = 5000
+    MAX_FILAS_HTTP = 500
+    LOTE_CONSULTA = 500
+    # Por debajo de este número de contraseñas no compensa levantar procesos
+    MIN_FILAS_POOL = 50
+
+    def __init__(self, empresa_id: Optional[int] = None, roles_permitidos: Iterable[str] = ROLES_VALIDOS,
+                 password_defecto: Optional[str] = None, workers: Optional[int] = None,
+                 metodo_procesos: Optional[str] = None, max_filas: Optional[int] = None):
+        """
+        Args:
+            empresa_id: Si se indica, todas las filas se crean en esa empresa (admins)
+            roles_permitidos: Roles que se aceptan en el archivo
+            password_defecto: Contraseña para las filas que no traen una
+            workers: Procesos para el hash (default settings.USUARIOS_IMPORT_WORKERS o nº de CPUs)
+            metodo_procesos: 'fork' | 'forkserver' | 'spawn' (default: forkserver o spawn)
+            max_filas: Límite de filas (default MAX_FILAS)
+        """
+        self.empresa_id = empresa_id
+        self.roles_permitidos = set(roles_permitidos)
+        self.password_defecto = password_defecto
+        self.workers = workers or getattr(settings, 'USUARIOS_IMPORT_WORKERS', None) or os.cpu_count() or 1
+        self.metodo_procesos = metodo_procesos
+        self.max_filas = max_filas or self.MAX_FILAS
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+    @classmethod
+    def leer(cls, contenido, formato: str) -> List[dict]:
+        """
+        Convierte el contenido de un archivo en filas.
+
+        Args:
+            contenido: bytes o str del archivo
+            formato: 'csv' | 'json'
+        """
+        if isinstance(contenido, bytes):
+            contenido = contenido.decode('utf-8-sig')
+        if formato == 'json':
+            data = json.loads(contenido)
+            if isinstance(data, dict):
+                data = data.get('usuarios', [])
+            if not isinstance(data, list):
+                raise ValueError('El JSON debe ser una lista de usuarios o {"usuarios": [...]}')
+            return data
+        if formato == 'csv':
+            muestra = contenido[:2048]
+            try:
+                dialecto = csv.Sniffer().sniff(muestra, delimiters=',;\t')
+            except csv.Error:
+                dialecto = csv.excel
+            lector = csv.DictReader(io.StringIO(contenido), dialect=dialecto)
+            return [{(k or '').strip().lower(): v for k, v in fila.items()} for fila in lector]
+        raise ValueError(f'formato inválido: {formato}')
+
+    # ------------------------------------------------------------------
+    # Validación
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _texto(valor) -> str:
+        return str(valor if valor is not None else '').strip()
+
+    @staticmethod
+    def _ids_sectores(valor) -> List[int]:
+        if valor in (None, ''):
+            return []
+        partes = valor if isinstance(valor, list) else str(valor).replace(';', ',').split(',')
+        ids = []
+        for p in partes:
+            p = str(p).strip()
+            if p:
+                ids.append(int(p))
+        return list(dict.fromkeys(ids))
+
+    def _en_lotes(self, valores: List) -> Iterable[List]:
+        for i in range(0, len(valores), self.LOTE_CONSULTA):
+            yield valores[i:i + self.LOTE_CONSULTA]
+
+    def validar(self, filas: List[dict]):
+        """
+        Normaliza y valida todas las filas.
+
+        Returns:
+            (usuarios normalizados, errores) — errores es una lista de
+            {"fila", "dni", "errores": [...]} con fila numerada desde 1.
+        """
+        if len(filas) > self.max_filas:
+            mensaje = f'Máximo {self.max_filas} filas por importación.'
+            if self.max_filas < self.MAX_FILAS:
+                mensaje += ' Para cargas mayores usa manage.py importar_usuarios.'
+            return [], [{'fila': None, 'dni': None, 'errores': [mensaje]}]
+
+        normalizados = []
+        for n, fila in enumerate(filas, start=1):
+            fila = fila if isinstance(fila, dict) else {}
+            u = {
+                'fila': n,
+                'dni': self._texto(fila.get('dni')),
+                'email': BaseUserManager.normalize_email(self._texto(fila.get('email'))),
+                'password': self._texto(fila.get('password')) or self.password_defecto or '',
+                'nombres': self._texto(fila.get('nombres')),
+                'apellidos': self._texto(fila.get('apellidos')),
+                'rol': self._texto(fila.get('rol')).lower() or 'encargado',
+                'celular': self._texto(fila.get('celular')) or None,
+                'empresa_id': self.empresa_id or self._texto(fila.get('empresa_id')) or None,
+                'supervisor_dni': self._texto(fila.get('supervisor_dni')) or None,
+                'errores': [],
+            }
+            e = u['errores']
+            faltan = [k for k in ('dni', 'email', 'password', 'nombres', 'apellidos') if not u[k]]
+            if faltan:
+                e.append(f"Faltan campos requeridos: {', '.join(faltan)}")
+            if u['dni'] and not (u['dni'].isdigit() and len(u['dni']) == 8):
+                e.append('El DNI debe tener 8 dígitos numéricos.')
+            if u['email']:
+                try:
+                    validate_email(u['email'])
+                except ValidationError:
+                    e.append('Email inválido.')
+            pw = u['password']
+            if pw and not (len(pw) >= 8 and any(c.isalpha() for c in pw) and any(c.isdigit() for c in pw)):
+                e.append('Password débil: mínimo 8 caracteres, con letras y números.')
+            if u['rol'] not in self.roles_permitidos:
+                e.append(f"Rol no permitido. Usa uno de: {', '.join(sorted(self.roles_permitidos))}.")
+            try:
+                u['empresa_id'] = int(u['empresa_id']) if u['empresa_id'] else None
+            except ValueError:
+                e.append('empresa_id inválido.')
+                u['empresa_id'] = None
+            try:
+                u['sectores'] = self._ids_sectores(fila.get('sectores'))
+            except ValueError:
+                e.append('sectores debe ser una lista de IDs.')
+                u['sectores'] = []
+            normalizados.append(u)
+
+        self._validar_contra_bd(normalizados)
+
+        errores = [{'fila': u['fila'], 'dni': u['dni'] or None, 'errores': u['errores']}
+                   for u in normalizados if u['errores']]
+        return normalizados, errores
+
+    def _validar_contra_bd(self, usuarios: List[dict]) -> None:
+        """
+        Duplicados dentro del archivo y contra la base, FKs y supervisores, por lotes.
+        Los emails se comparan sin distinguir mayúsculas (se guardan normalizados).
+        """
+        vistos_dni, vistos_email = {}, {}
+        for u in usuarios:
+            for campo, clave, vistos in (('dni', u['dni'], vistos_dni), ('email', u['email'].lower(), vistos_email)):
+                if clave:
+                    if clave in vistos:
+                        u['errores'].append(f"{campo} repetido en el archivo (fila {vistos[clave]}).")
+                    else:
+                        vistos[clave] = u['fila']
+
+        dnis_existentes, emails_existentes = set(), set()
+        for lote in self._en_lotes(list(vistos_dni)):
+            dnis_existentes.update(CustomUser.objects.filter(dni__in=lote).values_list('dni', flat=True))
+        for lote in self._en_lotes(list(vistos_email)):
+            emails_existentes.update(
+                CustomUser.objects.annotate(email_lower=Lower('email'))
+                .filter(email_lower__in=lote).values_list('email_lower', flat=True)
+            )
+
+        empresas = {u['empresa_id'] for u in usuarios if u['empresa_id']}
+        empresas_validas = set(Empresa.objects.filter(id__in=empresas).values_list('id', flat=True)) if empresas else set()
+
+        # Empresa de cada sector: la del proyecto de su zona o, sin proyecto, la del distrito
+        sectores = sorted({s for u in usuarios for s in u['sectores']})
+        empresa_sector: Dict[int, Optional[int]] = {}
+        for lote in self._en_lotes(sectores):
+            for pk, empresa_proyecto, empresa_distrito in Sector.objects.filter(id__in=lote).values_list(
+                    'id', 'zona__proyecto__empresa_id', 'zona__distrito__empresa_id'):
+                empresa_sector[pk] = empresa_proyecto or empresa_distrito
+
+        # Supervisores: pueden existir ya o venir en el mismo archivo
+        sup_dnis = sorted({u['supervisor_dni'] for u in usuarios if u['supervisor_dni']})
+        sup_existentes = {}
+        for lote in self._en_lotes(sup_dnis):
+            for dni, rol, empresa_id in CustomUser.objects.filter(dni__in=lote).values_list('dni', 'rol', 'empresa_id'):
+                sup_existentes[dni] = (rol, empresa_id)
+        sup_en_archivo = {u['dni']: u['empresa_id'] for u in usuarios if u['rol'] == 'supervisor'}
+
+        for u in usuarios:
+            e = u['errores']
+            if u['dni'] in dnis_existentes:
+                e.append('El DNI ya está registrado.')
+            if u['email'].lower() in emails_existentes:
+                e.append('El email ya está registrado.')
+            if u['empresa_id'] and u['empresa_id'] not in empresas_validas:
+                e.append('empresa_id no existe.')
+            faltantes = [s for s in u['sectores'] if s not in empresa_sector]
+            if faltantes:
+                e.append(f"Sectores inexistentes: {', '.join(map(str, faltantes))}")
+            ajenos = [s for s in u['sectores'] if s in empresa_sector and empresa_sector[s] != u['empresa_id']]
+            if ajenos:
+                e.append(f"Sectores de otra empresa: {', '.join(map(str, ajenos))}")
+            sdni = u['supervisor_dni']
+            if sdni:
+                if u['rol'] != 'encargado':
+                    e.append('supervisor_dni solo aplica a encargados.')
+                elif sdni in sup_existentes:
+                    rol, empresa_id = sup_existentes[sdni]
+                    if rol != 'supervisor':
+                        e.append("supervisor_dni no corresponde a un usuario con rol 'supervisor'.")
+                    elif self.empresa_id and empresa_id != self.empresa_id:
+                        e.append('El supervisor debe pertenecer a su misma empresa.')
+                elif sdni not in sup_en_archivo:
+                    e.append('supervisor_dni no existe.')
+
+    # ------------------------------------------------------------------
+    # Hash e inserción
+    # ------------------------------------------------------------------
+    def hashear(self, passwords: List[str]) -> List[str]:
+        """
+        Hashea las contraseñas repartiéndolas entre procesos. Cada hash lleva su
+        propia sal, así que no se reutiliza el resultado entre filas iguales.
+        """
+        workers = min(self.workers, len(passwords) // self.MIN_FILAS_POOL or 1)
+        return hash_paralelo.hashear(passwords, workers, self.metodo_procesos)
+
+    def importar(self, filas: List[dict], solo_validar: bool = False) -> dict:
+        """
+        Valida e inserta las filas.
+
+        Returns:
+            {"total", "creados", "errores"} — si hay errores no se crea nada.
+        """
+        usuarios, errores = self.validar(filas)
+        if errores or solo_validar:
+            return {'total': len(filas), 'creados': 0, 'errores': errores}
+
+        hashes = self.hashear([u['password'] for u in usuarios])
+
+        with transaction.atomic():
+            # Supervisores (y demás roles) primero para poder enlazar encargados del mismo archivo
+            objetos = [
+                CustomUser(
+                    dni=u['dni'], email=u['email'], password=hashes[i],
+                    nombres=u['nombres'], apellidos=u['apellidos'], celular=u['celular'],
+                    rol=u['rol'], empresa_id=u['empresa_id'],
+                    is_active=True, is_staff=u['rol'] in ('admin', 'superadmin'),
+                )
+                for i, u in enumerate(usuarios) if u['rol'] != 'encargado'
+            ]
+            CustomUser.objects.bulk_create(objetos, batch_size=self.LOTE_CONSULTA)
+
+            sup_dnis = sorted({u['supervisor_dni'] for u in usuarios if u['supervisor_dni']})
+            sup_ids: Dict[str, int] = {}
+            for lote in self._en_lotes(sup_dnis):
+                sup_ids.update(CustomUser.objects.filter(dni__in=lote).values_list('dni', 'id'))
+
+            encargados = [
+                CustomUser(
+                    dni=u['dni'], email=u['email'], password=hashes[i],
+                    nombres=u['nombres'], apellidos=u['apellidos'], celular=u['celular'],
+                    rol='encargado', empresa_id=u['empresa_id'],
+                    supervisor_id=sup_ids.get(u['supervisor_dni']),
+                    is_active=True, is_staff=False,
+                )
+                for i, u in enumerate(usuarios) if u['rol'] == 'encargado'
+            ]
+            CustomUser.objects.bulk_create(encargados, batch_size=self.LOTE_CONSULTA)
+
+            # bulk_create no devuelve PKs en todos los motores: se releen por DNI
+            con_sectores = [u for u in usuarios if u['sectores']]
+            ids: Dict[str, int] = {}
+            for lote in self._en_lotes([u['dni'] for u in con_sectores]):
+                ids.update(CustomUser.objects.filter(dni__in=lote).values_list('dni', 'id'))
+            Through = CustomUser.sectores.through
+            Through.objects.bulk_create(
+                [Through(customuser_id=ids[u['dni']], sector_id=s) for u in con_sectores for s in u['sectores']],
+                batch_size=1000,
+            )
+
+        return {'total': len(filas), 'creados': len(usuarios), 'errores': []}
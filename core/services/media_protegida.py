@@ -0,0 +1,165 @@
+import hashlib
+import os
+import posixpath
+import time
+from typing import Optional
+from urllib.parse import quote, unquote, urlencode
+
+from django.conf import settings
+from django.urls import reverse
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from ..models.models import FotoReporte, FotoPosteWizard, PredioWizard
+from ..models.models_telematico import FotoTelematicWizard
+
+
+class MediaProtegidaService:
+    """
+    Resuelve a qué foto pertenece un archivo de MEDIA_ROOT y si el usuario puede verlo.
+
+    Cada carpeta de subida corresponde a un modelo; la visibilidad sigue las mismas
+    reglas que los reportes:
+      - superadmin: todo
+      - admin: lo de su empresa
+      - supervisor: lo de sus encargados
+      - encargado: solo lo suyo
+
+    Las URLs que se entregan a los clientes (`url`) llevan la versión del archivo
+    (`v`, hash de tamaño + mtime) y, si MEDIA_FIRMAR_URLS, una firma con vencimiento
+    (`exp`, `sig`). Una URL con versión vigente no cambia de contenido, así que se
+    sirve con Cache-Control immutable; la firma permite usarla en <img src> sin JWT.
+    """
+
+    SAL_FIRMA = 'core.media.url'
+
+    # prefijo de upload_to -> (modelo, campo de archivo, ruta al encargado, ruta a la empresa)
+    ORIGENES = (
+        ('fotos_reportes/', FotoReporte, 'imagen', 'reporte__encargado', 'reporte__proyecto__empresa'),
+        ('fotos_postes/', FotoPosteWizard, 'foto', 'wizard__encargado', 'wizard__encargado__empresa'),
+        ('telematicos/fotos/', FotoTelematicWizard, 'imagen', 'wizard__wizard__encargado',
+         'wizard__wizard__encargado__empresa'),
+        ('fotos_predios/', PredioWizard, 'imagen', 'encargado', 'encargado__empresa'),
+    )
+
+    @staticmethod
+    def normalizar(ruta: str) -> Optional[str]:
+        """
+        Ruta relativa limpia dentro de MEDIA_ROOT, o None si intenta salir de ella
+        (`..`, rutas absolutas, barras invertidas).
+        """
+        if not ruta or '\\' in ruta or '\x00' in ruta:
+            return None
+        limpia = posixpath.normpath(ruta).lstrip('/')
+        if limpia in ('', '.') or limpia.startswith('../') or limpia == '..':
+            return None
+        return limpia
+
+    @staticmethod
+    def ruta_absoluta(ruta: str) -> str:
+        return os.path.join(str(settings.MEDIA_ROOT), *ruta.split('/'))
+
+    @staticmethod
+    def _scope(qs, user, campo_encargado: str, campo_empresa: str):
+        rol = getattr(user, 'rol', None)
+        if rol == 'admin' and getattr(user, 'empresa_id', None):
+            return qs.filter(**{f'{campo_empresa}_id': user.empresa_id})
+        if rol == 'supervisor':
+            return qs.filter(**{f'{campo_encargado}__supervisor_id': user.id})
+        if rol == 'encargado':
+            return qs.filter(**{f'{campo_encargado}_id': user.id})
+        if rol == 'superadmin' or getattr(user, 'is_superuser', False):
+            return qs
+        return qs.none()
+
+    @classmethod
+    def origen(cls, ruta: str):
+        for origen in cls.ORIGENES:
+            if ruta.startswith(origen[0]):
+                return origen
+        return None
+
+    @classmethod
+    def puede_ver(cls, user, ruta: str) -> bool:
+        """
+        True si `ruta` (ya normalizada) es una foto registrada que el usuario puede ver.
+        Un archivo sin fila en la base (huérfano) o de otra carpeta no se sirve.
+        """
+        origen = cls.origen(ruta)
+        if origen is None:
+            return False
+        _, modelo, campo, campo_encargado, campo_empresa = origen
+        qs = cls._scope(modelo.objects.filter(**{campo: ruta}), user, campo_encargado, campo_empresa)
+        return qs.exists()
+
+    # ------------------------------------------------------------------
+    # URLs versionadas y firmadas
+    # ------------------------------------------------------------------
+    @classmethod
+    def version(cls, ruta: str) -> Optional[str]:
+        """Versión del archivo (None si no existe). Un stat, sin leer el contenido."""
+        try:
+            estado = os.stat(cls.ruta_absoluta(ruta))
+        except OSError:
+            return None
+        return hashlib.sha1(f'{estado.st_size}-{estado.st_mtime_ns}'.encode()).hexdigest()[:12]
+
+    @classmethod
+    def _firma(cls, ruta: str, version: str, expira: int) -> str:
+        return salted_hmac(cls.SAL_FIRMA, f'{ruta}|{version}|{expira}').hexdigest()[:32]
+
+    @staticmethod
+    def _vencimiento() -> int:
+        """
+        Vencimiento redondeado a MEDIA_FIRMA_VENTANA_SEGUNDOS: todas las URLs de una
+        foto emitidas dentro de la misma ventana son idénticas y comparten caché.
+        """
+        ttl = int(getattr(settings, 'MEDIA_FIRMA_TTL_SEGUNDOS', 7 * 24 * 3600))
+        ventana = max(int(getattr(settings, 'MEDIA_FIRMA_VENTANA_SEGUNDOS', 24 * 3600)), 1)
+        return (int(time.time()) // ventana + 1) * ventana + ttl
+
+    @classmethod
+    def url(cls, request, nombre: Optional[str]) -> Optional[str]:
+        """
+        URL absoluta para el archivo `nombre` (name del FileField). Fuera de las
+        carpetas protegidas, o si el archivo no está en disco, devuelve la de MEDIA_URL.
+        """
+        if not nombre:
+            return None
+        ruta = cls.normalizar(nombre)
+        version = cls.version(ruta) if ruta and cls.origen(ruta) else None
+        if version is None:
+            url = settings.MEDIA_URL + quote(nombre)
+        else:
+            params = {'v': version}
+            if getattr(settings, 'MEDIA_FIRMAR_URLS', True):
+                params['exp'] = cls._vencimiento()
+                params['sig'] = cls._firma(ruta, version, params['exp'])
+            url = reverse('media_protegida', kwargs={'ruta': ruta}) + '?' + urlencode(params)
+        build_abs = getattr(request, 'build_absolute_uri', None)
+        if callable(build_abs):
+            return build_abs(url)
+        base = getattr(settings, 'SITE_URL', '').rstrip('/')
+        return f'{base}{url}' if base else url
+
+    @staticmethod
+    def nombre_desde_url(url_relativa: str) -> Optional[str]:
+        """name del archivo a partir de su URL de MEDIA_URL (None si no es de media)."""
+        if url_relativa and url_relativa.startswith(settings.MEDIA_URL):
+            return unquote(url_relativa[len(settings.MEDIA_URL):])
+        return None
+
+    @classmethod
+    def version_vigente(cls, ruta: str, params) -> bool:
+        """True si la URL trae `v` y coincide con el archivo actual."""
+        version = params.get('v')
+        return bool(version) and constant_time_compare(version, cls.version(ruta) or '')
+
+    @classmethod
+    def firma_valida(cls, ruta: str, params) -> bool:
+        """True si `sig` corresponde a ruta + versión vigente + `exp` y no venció."""
+        firma, expira = params.get('sig'), params.get('exp')
+        if not firma or not expira or not str(expira).isdigit() or int(expira) < time.time():
+            return False
+        if not cls.version_vigente(ruta, params):
+            return False
+        return constant_time_compare(firma, cls._firma(ruta, params['v'], int(expira)))
@@ -0,0 +1,319 @@
+import re
+from datetime import date, datetime, timezone as dt_timezone
+from typing import Dict, List, Optional, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+
+SUFIJO_MES = re.compile(r'_p(\d{4})(\d{2})$')
+
+
+def _mes(valor: date) -> date:
+    return date(valor.year, valor.month, 1)
+
+
+def _sumar_meses(mes: date, n: int) -> date:
+    total = mes.year * 12 + mes.month - 1 + n
+    return date(total // 12, total % 12 + 1, 1)
+
+
+class ParticionesService:
+    """
+    Particionado mensual opcional (PostgreSQL, particiones declarativas por RANGE).
+
+    Las tablas se declaran en settings.PARTICIONES_MENSUALES como
+    {"app.Modelo": "campo_fecha"}; `convertir` reemplaza la tabla plana por una
+    particionada con los mismos datos, índices, FKs salientes y nombres, de modo que
+    el ORM y las migraciones siguientes no notan la diferencia. Cada mes es una
+    partición `<tabla>_pYYYYMM` y `<tabla>_default` recibe lo que caiga fuera.
+
+    Restricciones de PostgreSQL que deciden qué tablas se pueden convertir:
+      - La PK pasa a ser (pk, campo_fecha) y todo UNIQUE debe incluir el campo.
+      - Ninguna FK puede apuntar a la tabla (exigiría la fecha en la referencia):
+        por eso Reporte, con DetallePredio/FotoReporte colgando, sigue plana.
+      - El campo debe ser NOT NULL y no cambiar después del INSERT.
+
+    Las particiones futuras se crean con `crear_futuras` (cron diario/semanal) y los
+    meses viejos se archivan con `archivar`: DETACH + mover al esquema de archivo
+    (o DROP), sin DELETE fila por fila ni VACUUM posterior.
+    """
+
+    # ------------------------------------------------------------------
+    # Configuración
+    # ------------------------------------------------------------------
+    @staticmethod
+    def configuradas() -> List[Tuple[type, str]]:
+        """[(modelo, campo)] de settings.PARTICIONES_MENSUALES."""
+        return [(apps.get_model(etiqueta), campo)
+                for etiqueta, campo in getattr(settings, 'PARTICIONES_MENSUALES', {}).items()]
+
+    @staticmethod
+    def meses_futuros() -> int:
+        return int(getattr(settings, 'PARTICIONES_MESES_FUTUROS', 3))
+
+    @staticmethod
+    def esquema_archivo() -> str:
+        return getattr(settings, 'PARTICIONES_ESQUEMA_ARCHIVO', 'archivo')
+
+    @staticmethod
+    def disponible() -> bool:
+        return connection.vendor == 'postgresql'
+
+    @staticmethod
+    def _q(nombre: str) -> str:
+        return connection.ops.quote_name(nombre)
+
+    @classmethod
+    def _nombre_particion(cls, tabla: str, mes: date) -> str:
+        return f'{tabla}_p{mes:%Y%m}'
+
+    @staticmethod
+    def _limite(mes: date) -> str:
+        return f"'{datetime(mes.year, mes.month, 1, tzinfo=dt_timezone.utc).isoformat()}'"
+
+    # ------------------------------------------------------------------
+    # Diagnóstico
+    # ------------------------------------------------------------------
+    @staticmethod
+    def esta_particionada(tabla: str) -> bool:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [tabla])
+            fila = cursor.fetchone()
+        return bool(fila) and fila[0] == 'p'
+
+    @classmethod
+    def impedimentos(cls, modelo, campo: str) -> List[str]:
+        """Motivos por los que la tabla no se puede convertir (vacío si se puede)."""
+        if not cls.disponible():
+            return ['El particionado solo está disponible en PostgreSQL.']
+        tabla = modelo._meta.db_table
+        try:
+            field = modelo._meta.get_field(campo)
+        except Exception:
+            return [f'{modelo.__name__} no tiene el campo {campo}.']
+        if field.get_internal_type() not in ('DateTimeField', 'DateField'):
+            return [f'{campo} no es una fecha.']
+        if field.null:
+            return [f'{campo} admite NULL; la clave de partición debe ser NOT NULL.']
+
+        motivos = []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT conrelid::regclass::text FROM pg_constraint "
+                "WHERE contype = 'f' AND confrelid = to_regclass(%s)", [tabla])
+            entrantes = sorted({r[0] for r in cursor.fetchall()})
+            if entrantes:
+                motivos.append(f"Tiene FKs entrantes desde {', '.join(entrantes)}.")
+            cursor.execute(
+                "SELECT i.relname FROM pg_index ix "
+                "JOIN pg_class i ON i.oid = ix.indexrelid "
+                "JOIN pg_attribute a ON a.attrelid = ix.indrelid AND a.attname = %s "
+                "WHERE ix.indrelid = to_regclass(%s) AND ix.indisunique AND NOT ix.indisprimary "
+                "AND NOT (a.attnum = ANY(ix.indkey::int2[]))", [field.column, tabla])
+            unicos = [r[0] for r in cursor.fetchall()]
+            if unicos:
+                motivos.append(f"Índices UNIQUE sin {campo}: {', '.join(unicos)}.")
+        return motivos
+
+    @classmethod
+    def particiones(cls, tabla: str) -> List[Dict]:
+        """Particiones de `tabla` con filas estimadas y tamaño total (tabla + índices)."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT c.relname, c.reltuples::bigint, pg_total_relation_size(c.oid) "
+                "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = to_regclass(%s) ORDER BY c.relname", [tabla])
+            return [{'nombre': n, 'filas': max(f, 0), 'bytes': b} for n, f, b in cursor.fetchall()]
+
+    # ------------------------------------------------------------------
+    # Conversión
+    # ------------------------------------------------------------------
+    @classmethod
+    def convertir(cls, modelo, campo: str, meses_futuros: Optional[int] = None) -> int:
+        """
+        Convierte la tabla del modelo en particionada por mes de `campo`.
+
+        Todo ocurre en una transacción con la tabla bloqueada (ACCESS EXCLUSIVE):
+        conviene hacerlo en una ventana de mantenimiento.
+
+        Returns:
+            Número de particiones mensuales creadas
+
+        Raises:
+            ValueError si la tabla ya está particionada o no se puede convertir
+        """
+        tabla = modelo._meta.db_table
+        if cls.esta_particionada(tabla):
+            raise ValueError(f'{tabla} ya está particionada.')
+        motivos = cls.impedimentos(modelo, campo)
+        if motivos:
+            raise ValueError(' '.join(motivos))
+
+        columna = modelo._meta.get_field(campo).column
+        pk = modelo._meta.pk.column
+        plana = f'{tabla[:50]}_plana'
+        q = cls._q
+        meses_futuros = cls.meses_futuros() if meses_futuros is None else meses_futuros
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'LOCK TABLE {q(tabla)} IN ACCESS EXCLUSIVE MODE')
+            # Definiciones con los nombres actuales, antes de renombrar
+            cursor.execute(
+                "SELECT i.relname, pg_get_indexdef(ix.indexrelid), ix.indisprimary, "
+                "c.contype, pg_get_constraintdef(c.oid) "
+                "FROM pg_index ix JOIN pg_class i ON i.oid = ix.indexrelid "
+                "LEFT JOIN pg_constraint c ON c.conindid = ix.indexrelid AND c.conrelid = ix.indrelid "
+                "WHERE ix.indrelid = to_regclass(%s)", [tabla])
+            indices = cursor.fetchall()
+            cursor.execute(
+                "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+                "WHERE contype = 'f' AND conrelid = to_regclass(%s)", [tabla])
+            fks = cursor.fetchall()
+            cursor.execute(
+                "SELECT attidentity, pg_get_serial_sequence(%s, %s) FROM pg_attribute "
+                "WHERE attrelid = to_regclass(%s) AND attname = %s", [tabla, pk, tabla, pk])
+            identidad, secuencia = cursor.fetchone()
+            cursor.execute(f'SELECT min({q(columna)}) FROM {q(tabla)}')
+            minimo = cursor.fetchone()[0]
+
+            # La tabla vieja y sus índices liberan los nombres que espera Django
+            cursor.execute(f'ALTER TABLE {q(tabla)} RENAME TO {q(plana)}')
+            for n, (nombre, *_) in enumerate(indices):
+                cursor.execute(f'ALTER INDEX {q(nombre)} RENAME TO {q(f"{plana[:40]}_idx{n}")}')
+
+            cursor.execute(
+                f'CREATE TABLE {q(tabla)} (LIKE {q(plana)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS '
+                f'INCLUDING IDENTITY INCLUDING GENERATED INCLUDING STORAGE INCLUDING COMMENTS) '
+                f'PARTITION BY RANGE ({q(columna)})')
+
+            desde = _mes(minimo) if minimo else _mes(date.today())
+            hasta = _sumar_meses(_mes(date.today()), meses_futuros)
+            creadas = 0
+            mes = desde
+            while mes <= hasta:
+                cls._crear(cursor, tabla, mes)
+                creadas += 1
+                mes = _sumar_meses(mes, 1)
+            cursor.execute(f'CREATE TABLE {q(tabla + "_default")} PARTITION OF {q(tabla)} DEFAULT')
+
+            cursor.execute(f'INSERT INTO {q(tabla)} SELECT * FROM {q(plana)}')
+
+            # Índices y FKs después de la carga: más rápido que mantenerlos fila a fila
+            cursor.execute(f'ALTER TABLE {q(tabla)} ADD CONSTRAINT {q(tabla[:58] + "_pkey")} '
+                           f'PRIMARY KEY ({q(pk)}, {q(columna)})')
+            for nombre, definicion, primaria, tipo, restriccion in indices:
+                if primaria:
+                    continue
+                if tipo == 'u':
+                    cursor.execute(f'ALTER TABLE {q(tabla)} ADD CONSTRAINT {q(nombre)} {restriccion}')
+                else:
+                    cursor.execute(definicion)
+            for nombre, definicion in fks:
+                cursor.execute(f'ALTER TABLE {q(tabla)} ADD CONSTRAINT {q(nombre)} {definicion}')
+
+            if secuencia and identidad:
+                # IDENTITY copiada con LIKE: secuencia nueva, se adelanta al máximo
+                cursor.execute(f'SELECT max({q(pk)}) FROM {q(tabla)}')
+                maximo = cursor.fetchone()[0]
+                cursor.execute("SELECT setval(pg_get_serial_sequence(%s, %s), %s, %s)",
+                               [tabla, pk, maximo or 1, maximo is not None])
+            elif secuencia:
+                # serial: el DEFAULT copiado sigue usando la secuencia de la tabla vieja
+                cursor.execute(f'ALTER SEQUENCE {secuencia} OWNED BY {q(tabla)}.{q(pk)}')
+            cursor.execute(f'DROP TABLE {q(plana)}')
+            cursor.execute(f'ANALYZE {q(tabla)}')
+        return creadas
+
+    # ------------------------------------------------------------------
+    # Mantenimiento
+    # ------------------------------------------------------------------
+    @classmethod
+    def _existe(cls, cursor, nombre: str) -> bool:
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [nombre])
+        return cursor.fetchone()[0]
+
+    @classmethod
+    def _crear(cls, cursor, tabla: str, mes: date) -> bool:
+        """Crea la partición del mes; si el DEFAULT ya tiene filas de ese mes, las mueve."""
+        nombre = cls._nombre_particion(tabla, mes)
+        if cls._existe(cursor, nombre):
+            return False
+        q = cls._q
+        limites = f'FROM ({cls._limite(mes)}) TO ({cls._limite(_sumar_meses(mes, 1))})'
+        default = tabla + '_default'
+        columna = cls._columna_particion(cursor, tabla)
+        rango = (f'{q(columna)} >= {cls._limite(mes)} AND '
+                 f'{q(columna)} < {cls._limite(_sumar_meses(mes, 1))}')
+
+        con_filas = False
+        if cls._existe(cursor, default):
+            cursor.execute(f'SELECT EXISTS (SELECT 1 FROM {q(default)} WHERE {rango})')
+            con_filas = cursor.fetchone()[0]
+        if not con_filas:
+            cursor.execute(f'CREATE TABLE {q(nombre)} PARTITION OF {q(tabla)} FOR VALUES {limites}')
+            return True
+
+        # PostgreSQL no deja crear la partición si el DEFAULT tiene filas de su rango
+        cursor.execute(f'ALTER TABLE {q(tabla)} DETACH PARTITION {q(default)}')
+        cursor.execute(f'CREATE TABLE {q(nombre)} PARTITION OF {q(tabla)} FOR VALUES {limites}')
+        cursor.execute(f'INSERT INTO {q(nombre)} SELECT * FROM {q(default)} WHERE {rango}')
+        cursor.execute(f'DELETE FROM {q(default)} WHERE {rango}')
+        cursor.execute(f'ALTER TABLE {q(tabla)} ATTACH PARTITION {q(default)} DEFAULT')
+        return True
+
+    @staticmethod
+    def _columna_particion(cursor, tabla: str) -> str:
+        cursor.execute(
+            "SELECT a.attname FROM pg_partitioned_table p "
+            "JOIN pg_attribute a ON a.attrelid = p.partrelid AND a.attnum = p.partattrs[0] "
+            "WHERE p.partrelid = to_regclass(%s)", [tabla])
+        return cursor.fetchone()[0]
+
+    @classmethod
+    def crear_futuras(cls, tabla: str, meses: Optional[int] = None) -> List[str]:
+        """
+        Asegura las particiones desde el mes actual hasta `meses` adelante.
+
+        Returns:
+            Nombres de las particiones creadas
+        """
+        meses = cls.meses_futuros() if meses is None else meses
+        creadas = []
+        mes_actual = _mes(date.today())
+        for n in range(meses + 1):
+            mes = _sumar_meses(mes_actual, n)
+            with transaction.atomic(), connection.cursor() as cursor:
+                if cls._crear(cursor, tabla, mes):
+                    creadas.append(cls._nombre_particion(tabla, mes))
+        return creadas
+
+    @classmethod
+    def archivar(cls, tabla: str, antes: date, eliminar: bool = False) -> List[str]:
+        """
+        Separa las particiones de meses anteriores a `antes` (su mes no incluido).
+
+        Sin `eliminar` la partición se mueve al esquema de archivo (consultable con
+        SQL, fuera de los planes y del VACUUM de la tabla viva); con `eliminar` se borra.
+
+        Returns:
+            Nombres de las particiones archivadas
+        """
+        limite = _mes(antes)
+        q = cls._q
+        esquema = cls.esquema_archivo()
+        archivadas = []
+        for particion in cls.particiones(tabla):
+            m = SUFIJO_MES.search(particion['nombre'])
+            if not m or date(int(m.group(1)), int(m.group(2)), 1) >= limite:
+                continue
+            nombre = particion['nombre']
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f'ALTER TABLE {q(tabla)} DETACH PARTITION {q(nombre)}')
+                if eliminar:
+                    cursor.execute(f'DROP TABLE {q(nombre)}')
+                else:
+                    cursor.execute(f'CREATE SCHEMA IF NOT EXISTS {q(esquema)}')
+                    cursor.execute(f'ALTER TABLE {q(nombre)} SET SCHEMA {q(esquema)}')
+            archivadas.append(nombre)
+        return archivadas
@@ -0,0 +1,164 @@
+from typing import Iterable, List, Optional
+from django.db import models, transaction
+from django.utils import timezone
+
+from ..models.models import PosteElectricoWizard
+from ..models.models_telematico import PosteTelematicWizard
+from ..models.models_publicados import PostePublicado
+from .proximidad_postes import ProximidadPostesService
+
+
+def _nombre(obj, campo: str = 'nombre') -> str:
+    if obj is None:
+        return ""
+    return getattr(obj, campo, "") or ""
+
+
+class PostePublicadoService:
+    """
+    Servicio que construye y mantiene la proyección PostePublicado a partir de
+    los wizards publicados (eléctrico y telemático) y sus partes 2-4.
+    """
+
+    WIZARD_MODELS = {
+        'electrico': PosteElectricoWizard,
+        'telematico': PosteTelematicWizard,
+    }
+    # Nombre de la relación inversa de cada parte según el tipo de wizard
+    PARTES = {
+        'electrico': ('caracteristicas', 'condicion', 'ubicacion'),
+        'telematico': ('caracteristicas_fisicas', 'condiciones_tecnicas', 'ubicacion'),
+    }
+
+    def __init__(self, tipo_poste: str):
+        if tipo_poste not in self.WIZARD_MODELS:
+            raise ValueError(f'tipo_poste inválido: {tipo_poste}')
+        self.tipo_poste = tipo_poste
+        self.wizard_model = self.WIZARD_MODELS[tipo_poste]
+
+    def queryset(self) -> models.QuerySet:
+        """Wizards publicados con todas las partes y catálogos resueltos en un solo JOIN."""
+        p2, p3, p4 = self.PARTES[self.tipo_poste]
+        qs = self.wizard_model.objects.filter(estado='published').select_related(
+            'encargado',
+            f'{p2}__estructura', f'{p2}__material', f'{p2}__zona_instalacion', f'{p2}__resistencia',
+            f'{p3}__estado_poste', f'{p3}__inclinacion', f'{p3}__propietario',
+            p4,
+        )
+        if self.tipo_poste == 'electrico':
+            return qs.prefetch_related('fotos')
+        return qs.prefetch_related('ubicacion__fotos')
+
+    def _parte(self, wizard, indice: int):
+        # hasattr sobre un OneToOne inverso inexistente lanza DoesNotExist → False
+        nombre = self.PARTES[self.tipo_poste][indice]
+        return getattr(wizard, nombre) if hasattr(wizard, nombre) else None
+
+    def _fotos(self, wizard):
+        """Devuelve (ruta de la foto principal, total de fotos)."""
+        if self.tipo_poste == 'electrico':
+            fotos = list(wizard.fotos.all())
+            principal = fotos[0].foto if fotos else None
+        else:
+            p4 = self._parte(wizard, 2)
+            fotos = list(p4.fotos.all()) if p4 else []
+            principal = next((f.imagen for f in fotos if f.is_principal), fotos[0].imagen if fotos else None)
+        return (principal.name if principal else ""), len(fotos)
+
+    def construir(self, wizard) -> PostePublicado:
+        """Arma (sin guardar) la fila de proyección para un wizard ya cargado con `queryset()`."""
+        p2, p3, p4 = (self._parte(wizard, i) for i in range(3))
+        encargado = wizard.encargado
+        foto_principal, total_fotos = self._fotos(wizard)
+        latitud, longitud = getattr(p4, 'latitud', None), getattr(p4, 'longitud', None)
+
+        if self.tipo_poste == 'electrico':
+            tension = wizard.tension
+            cables_electricos = wizard.cables_electricos
+        else:
+            tension = None
+            cables_electricos = wizard.cable_electrico
+
+        return PostePublicado(
+            tipo_poste=self.tipo_poste,
+            wizard_id=wizard.id,
+            encargado=encargado,
+            encargado_nombre=f"{encargado.nombres} {encargado.apellidos}" if encargado else "",
+            empresa_id=getattr(encargado, 'empresa_id', None),
+            codigo=wizard.codigo,
+            tension=tension,
+            cables_electricos=cables_electricos,
+            cables_telematicos=wizard.cables_telematicos,
+            estructura=_nombre(getattr(p2, 'estructura', None)),
+            material=_nombre(getattr(p2, 'material', None)),
+            zona_instalacion=_nombre(getattr(p2, 'zona_instalacion', None)),
+            resistencia=_nombre(getattr(p2, 'resistencia', None)),
+            resistencia_valor=getattr(p2, 'resistencia_valor', None),
+            estado_poste=_nombre(getattr(p3, 'estado_poste', None), 'descripcion'),
+            inclinacion=_nombre(getattr(p3, 'inclinacion', None), 'descripcion'),
+            propietario=_nombre(getattr(p3, 'propietario', None), 'siglas'),
+            altura=getattr(p3, 'altura', None),
+            latitud=latitud,
+            longitud=longitud,
+            celda=ProximidadPostesService.celda(latitud, longitud),
+            observaciones=getattr(p4, 'observaciones', "") or "",
+            foto_principal=foto_principal,
+            total_fotos=total_fotos,
+            publicado_en=wizard.actualizado_en or timezone.now(),
+        )
+
+    def proyectar(self, wizard_id: int) -> Optional[PostePublicado]:
+        """
+        Crea o actualiza la proyección de un wizard. Si el wizard ya no está
+        publicado, elimina su fila. Llamar dentro de la transacción de publicación.
+
+        Args:
+            wizard_id: ID del wizard (eléctrico o telemático según el servicio)
+        """
+        wizard = self.queryset().filter(id=wizard_id).first()
+        if wizard is None:
+            self.eliminar([wizard_id])
+            return None
+
+        fila = self.construir(wizard)
+        campos = {
+            f.attname: getattr(fila, f.attname)
+            for f in PostePublicado._meta.concrete_fields
+            if f.attname not in ('id', 'tipo_poste', 'wizard_id', 'actualizado_en')
+        }
+        obj, _ = PostePublicado.objects.update_or_create(
+            tipo_poste=self.tipo_poste, wizard_id=wizard.id, defaults=campos
+        )
+        return obj
+
+    def eliminar(self, wizard_ids: Iterable[int]) -> int:
+        deleted, _ = PostePublicado.objects.filter(
+            tipo_poste=self.tipo_poste, wizard_id__in=list(wizard_ids)
+        ).delete()
+        return deleted
+
+    def reconstruir(self, batch_size: int = 500) -> int:
+        """
+        Reconstruye la proyección completa por lotes de `batch_size` wizards.
+        También elimina filas de wizards que ya no están publicados.
+
+        Returns:
+            Número de filas escritas
+        """
+        total = 0
+        ultimo_id = 0
+        while True:
+            lote: List = list(self.queryset().filter(id__gt=ultimo_id).order_by('id')[:batch_size])
+            if not lote:
+                break
+            filas = [self.construir(w) for w in lote]
+            with transaction.atomic():
+                self.eliminar([w.id for w in lote])
+                PostePublicado.objects.bulk_create(filas, batch_size=batch_size)
+            total += len(filas)
+            ultimo_id = lote[-1].id
+
+        # Filas huérfanas (wizard borrado o despublicado)
+        publicados = self.wizard_model.objects.filter(estado='published').values('id')
+        PostePublicado.objects.filter(tipo_poste=self.tipo_poste).exclude(wizard_id__in=publicados).delete()
+        return total
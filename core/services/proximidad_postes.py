@@ -0,0 +1,188 @@
+import math
+from typing import Dict, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import models
+from django.db.models.functions import Upper
+
+from ..models.models_publicados import PostePublicado
+
+METROS_POR_GRADO = 111320.0
+
+
+class ProximidadPostesService:
+    """
+    Búsqueda de postes cercanos sobre PostePublicado usando una grilla de celdas.
+
+    Cada fila guarda en `celda` el índice de la celda de POSTES_CELDA_GRADOS
+    grados que contiene sus coordenadas. Buscar alrededor de un punto consulta
+    solo las celdas vecinas (índice sobre `celda`) y calcula la distancia exacta
+    (haversine) en Python sobre esos pocos candidatos.
+
+    Si se cambia POSTES_CELDA_GRADOS hay que ejecutar `reconstruir_postes_publicados`.
+    """
+
+    # Más celdas que esto en una búsqueda por radio: se usa el índice (latitud, longitud)
+    MAX_CELDAS = 400
+
+    @staticmethod
+    def tamano_celda() -> float:
+        return float(getattr(settings, 'POSTES_CELDA_GRADOS', 0.001))
+
+    @classmethod
+    def _columnas(cls) -> int:
+        return int(math.ceil(360 / cls.tamano_celda())) + 1
+
+    @classmethod
+    def _indices(cls, latitud, longitud) -> Tuple[int, int]:
+        g = cls.tamano_celda()
+        return int(math.floor((float(latitud) + 90) / g)), int(math.floor((float(longitud) + 180) / g))
+
+    @classmethod
+    def celda(cls, latitud, longitud) -> Optional[int]:
+        """Índice de celda para unas coordenadas (None si faltan)."""
+        if latitud is None or longitud is None:
+            return None
+        i, j = cls._indices(latitud, longitud)
+        return i * cls._columnas() + j
+
+    @staticmethod
+    def distancia_m(lat1, lon1, lat2, lon2) -> float:
+        """Distancia haversine en metros."""
+        lat1, lon1, lat2, lon2 = (math.radians(float(v)) for v in (lat1, lon1, lat2, lon2))
+        a = (math.sin((lat2 - lat1) / 2) ** 2
+             + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+        return 2 * 6371008.8 * math.asin(min(1.0, math.sqrt(a)))
+
+    @classmethod
+    def _metros_por_celda(cls, latitud) -> float:
+        """Lado mínimo de una celda en metros a esa latitud (el de longitud se achica con cos)."""
+        return cls.tamano_celda() * METROS_POR_GRADO * max(math.cos(math.radians(float(latitud))), 0.01)
+
+    @classmethod
+    def _cuadrado(cls, latitud, longitud, radio_celdas: int) -> Set[int]:
+        i, j = cls._indices(latitud, longitud)
+        columnas = cls._columnas()
+        return {
+            (i + di) * columnas + (j + dj)
+            for di in range(-radio_celdas, radio_celdas + 1)
+            for dj in range(-radio_celdas, radio_celdas + 1)
+        }
+
+    @classmethod
+    def _candidatos(cls, qs, latitud, longitud, radio_celdas: int,
+                    celdas_vistas: Optional[Set[int]] = None) -> List[Tuple[float, int]]:
+        """
+        Postes en el cuadrado de (2·radio_celdas + 1)² celdas alrededor del punto.
+        Hasta MAX_CELDAS consulta por `celda` (omitiendo `celdas_vistas`); más
+        grande, por recuadro sobre el índice (latitud, longitud).
+        """
+        if (2 * radio_celdas + 1) ** 2 <= cls.MAX_CELDAS:
+            celdas = cls._cuadrado(latitud, longitud, radio_celdas)
+            if celdas_vistas is not None:
+                celdas -= celdas_vistas
+                celdas_vistas |= celdas
+            filas = qs.filter(celda__in=list(celdas))
+        else:
+            g = cls.tamano_celda() * (radio_celdas + 1)
+            filas = qs.filter(
+                latitud__range=(float(latitud) - g, float(latitud) + g),
+                longitud__range=(float(longitud) - g, float(longitud) + g),
+            )
+        return [
+            (cls.distancia_m(latitud, longitud, lat, lon), pk)
+            for pk, lat, lon in filas.values_list('id', 'latitud', 'longitud')
+        ]
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+    @classmethod
+    def en_radio(cls, latitud, longitud, radio_m: float,
+                 qs: Optional[models.QuerySet] = None) -> List[Tuple[float, int]]:
+        """
+        Postes a menos de `radio_m` metros, ordenados por distancia.
+
+        Returns:
+            [(distancia_m, id de PostePublicado)]
+        """
+        qs = qs if qs is not None else PostePublicado.objects.all()
+        radio_celdas = int(math.ceil(radio_m / cls._metros_por_celda(latitud)))
+        return sorted(c for c in cls._candidatos(qs, latitud, longitud, radio_celdas) if c[0] <= radio_m)
+
+    @classmethod
+    def k_cercanos(cls, latitud, longitud, k: int, radio_max_m: float,
+                   qs: Optional[models.QuerySet] = None) -> List[Tuple[float, int]]:
+        """
+        Los `k` postes más cercanos dentro de `radio_max_m`, ampliando la búsqueda
+        por anillos de celdas (1, 2, 4, 8...) hasta tener k resultados seguros.
+
+        Returns:
+            [(distancia_m, id de PostePublicado)]
+        """
+        qs = qs if qs is not None else PostePublicado.objects.all()
+        lado = cls._metros_por_celda(latitud)
+        limite = max(1, int(math.ceil(radio_max_m / lado)))
+
+        celdas_vistas: Set[int] = set()
+        distancias: Dict[int, float] = {}
+        radio = 1
+        while True:
+            for distancia, pk in cls._candidatos(qs, latitud, longitud, radio, celdas_vistas):
+                distancias[pk] = distancia
+            candidatos = sorted((d, pk) for pk, d in distancias.items())
+            # Todo lo que esté a menos de radio * lado ya fue visto
+            if len(candidatos) >= k and candidatos[k - 1][0] <= radio * lado:
+                break
+            if radio >= limite:
+                break
+            radio = min(radio * 2, limite)
+        return [c for c in candidatos if c[0] <= radio_max_m][:k]
+
+    @classmethod
+    def posibles_duplicados(cls, poste: PostePublicado, metros: Optional[float] = None,
+                            limite: int = 10) -> List[Dict]:
+        """
+        Postes de la misma empresa a menos de `metros` (POSTES_DUPLICADO_METROS) o
+        con el mismo código (sin distinguir mayúsculas). Excluye al propio poste.
+
+        Returns:
+            [{"id", "tipo_poste", "wizard_id", "codigo", "distancia_m", "motivos"}]
+        """
+        metros = metros if metros is not None else float(getattr(settings, 'POSTES_DUPLICADO_METROS', 10))
+        qs = PostePublicado.objects.exclude(id=poste.id).filter(empresa_id=poste.empresa_id)
+        motivos: Dict[int, List[str]] = {}
+        distancias: Dict[int, Optional[float]] = {}
+
+        if poste.latitud is not None and poste.longitud is not None:
+            for distancia, pk in cls.en_radio(poste.latitud, poste.longitud, metros, qs)[:limite]:
+                motivos.setdefault(pk, []).append('distancia')
+                distancias[pk] = round(distancia, 1)
+
+        codigo = (poste.codigo or '').strip().upper()
+        if codigo:
+            mismos = (qs.annotate(codigo_upper=Upper('codigo'))
+                        .filter(codigo_upper=codigo)
+                        .values_list('id', flat=True)[:limite])
+            for pk in mismos:
+                motivos.setdefault(pk, []).append('codigo')
+
+        if not motivos:
+            return []
+        filas = PostePublicado.objects.filter(id__in=motivos).values(
+            'id', 'tipo_poste', 'wizard_id', 'codigo', 'latitud', 'longitud')
+        resultado = []
+        for f in filas:
+            distancia = distancias.get(f['id'])
+            if distancia is None and f['latitud'] is not None and poste.latitud is not None:
+                distancia = round(cls.distancia_m(poste.latitud, poste.longitud, f['latitud'], f['longitud']), 1)
+            resultado.append({
+                'id': f['id'],
+                'tipo_poste': f['tipo_poste'],
+                'wizard_id': f['wizard_id'],
+                'codigo': f['codigo'],
+                'distancia_m': distancia,
+                'motivos': motivos[f['id']],
+            })
+        resultado.sort(key=lambda d: (d['distancia_m'] is None, d['distancia_m'] or 0))
+        return resultado[:limite]
@@ -0,0 +1,220 @@
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
+
+from ..models.models import (
+    Distrito, Zona, Sector,
+    TipoEstructura, Material, ZonaInstalacion, Resistencia,
+    EstadoFisico, Inclinacion, Propietario,
+    ElementoElectrico, ElementoTelematico, ParametroCatalogo,
+    PosteElectricoWizard, PredioWizard, Reporte,
+)
+from ..models.models_telematico import PosteTelematicWizard
+from ..models.models_sync import CambioSync
+
+
+class SyncFeedService:
+    """
+    Servicio del change-feed de sincronización offline.
+
+    ENTIDADES define, por cada modelo sincronizado:
+      - el nombre corto que viaja al cliente,
+      - el campo dueño (None = global, visible para todos),
+      - los campos compactos que se envían en los upserts.
+
+    Orden de visibilidad: `seq` se asigna al insertar, pero dos transacciones
+    pueden confirmar en otro orden y un cliente que avanzó su cursor más allá de
+    un hueco no volvería a ver el seq menor. Por eso el log se escribe después
+    del COMMIT del negocio en un INSERT corto (autocommit) y la lectura se detiene
+    en las filas con más de SYNC_MARGEN_SEGUNDOS: para entonces todo seq menor
+    ya es visible.
+    """
+
+    ENTIDADES: Dict[str, Tuple[type, Optional[str], Tuple[str, ...]]] = {
+        # Ubicaciones
+        'distrito': (Distrito, None, ('id', 'nombre', 'empresa_id', 'activo')),
+        'zona': (Zona, None, ('id', 'nombre', 'distrito_id', 'proyecto_id')),
+        'sector': (Sector, None, ('id', 'nombre', 'zona_id')),
+        # Catálogos
+        'tipo_estructura': (TipoEstructura, None, ('id', 'nombre')),
+        'material': (Material, None, ('id', 'nombre')),
+        'zona_instalacion': (ZonaInstalacion, None, ('id', 'nombre')),
+        'resistencia': (Resistencia, None, ('id', 'valor')),
+        'estado_fisico': (EstadoFisico, None, ('id', 'descripcion')),
+        'inclinacion': (Inclinacion, None, ('id', 'descripcion')),
+        'propietario': (Propietario, None, ('id', 'siglas')),
+        'elemento': (ElementoElectrico, None, ('id', 'nombre', 'tipo')),
+        'elemento_telematico': (ElementoTelematico, None, ('id', 'nombre')),
+        'parametro_catalogo': (ParametroCatalogo, None, ('id', 'categoria', 'nombre', 'orden', 'activo')),
+        # Datos propios del encargado
+        'poste_electrico_wizard': (PosteElectricoWizard, 'encargado_id', (
+            'id', 'tension', 'cables_electricos', 'cables_telematicos', 'codigo',
+            'elementos_electricos', 'elementos_telematicos', 'estado', 'creado_en', 'actualizado_en',
+        )),
+        'poste_telematico_wizard': (PosteTelematicWizard, 'encargado_id', (
+            'id', 'cables_telematicos', 'codigo', 'cable_electrico',
+            'elementos_telematicos', 'elementos_electricos', 'estado', 'creado_en', 'actualizado_en',
+        )),
+        'predio_wizard': (PredioWizard, 'encargado_id', (
+            'id', 'distrito_id', 'zona_id', 'sector_id', 'latitud', 'longitud',
+            'estado', 'is_published', 'observaciones', 'created_at', 'updated_at',
+        )),
+        'reporte': (Reporte, 'encargado_id', (
+            'id', 'tipo', 'proyecto_id', 'zona_id', 'sector_id', 'fecha_reporte',
+            'observaciones', 'estado', 'latitud', 'longitud',
+        )),
+    }
+
+    DEFAULT_LIMIT = 500
+    MAX_LIMIT = 2000
+
+    @classmethod
+    def entidad_de(cls, model) -> Optional[str]:
+        for nombre, (m, _, _) in cls.ENTIDADES.items():
+            if m is model:
+                return nombre
+        return None
+
+    # ------------------------------------------------------------------
+    # Escritura del log
+    # ------------------------------------------------------------------
+    @classmethod
+    def registrar(cls, instance: models.Model, operacion: str) -> None:
+        """
+        Agrega al log el cambio de `instance` cuando la transacción confirma
+        (fuera de ella, para que el seq se haga visible en seguida).
+        Si la transacción hace rollback no queda rastro en el feed.
+        """
+        entidad = cls.entidad_de(type(instance))
+        if entidad is None:
+            return
+        _, campo_dueno, _ = cls.ENTIDADES[entidad]
+        usuario_id = getattr(instance, campo_dueno, None) if campo_dueno else None
+        if campo_dueno and usuario_id is None:
+            # Registros sin dueño (p. ej. telemáticos antiguos) no se pueden enrutar a nadie
+            return
+        cambio = CambioSync(
+            entidad=entidad,
+            objeto_id=str(instance.pk),
+            operacion=operacion,
+            usuario_id=usuario_id,
+        )
+        transaction.on_commit(cambio.save)
+
+    @classmethod
+    def registrar_lote(cls, entidad: str, filas: Iterable[Tuple[object, Optional[int]]],
+                       operacion: str = 'upsert', batch_size: int = 1000) -> int:
+        """
+        Registra de una vez los cambios de operaciones masivas (bulk_create/update,
+        comandos de seed o importación) que no disparan señales. Dentro de una
+        transacción se insertan al confirmarla, igual que `registrar`.
+
+        Args:
+            entidad: Clave de ENTIDADES
+            filas: Iterable de (pk, usuario_id) — usuario_id None para entidades globales
+            operacion: 'upsert' | 'delete'
+
+        Returns:
+            Número de cambios registrados
+        """
+        if entidad not in cls.ENTIDADES:
+            raise ValueError(f'entidad inválida: {entidad}')
+        cambios = [
+            CambioSync(entidad=entidad, objeto_id=str(pk), operacion=operacion, usuario_id=usuario_id)
+            for pk, usuario_id in filas
+        ]
+        if cambios:
+            transaction.on_commit(lambda: CambioSync.objects.bulk_create(cambios, batch_size=batch_size))
+        return len(cambios)
+
+    @classmethod
+    def sembrar(cls, batch_size: int = 1000) -> int:
+        """
+        Registra un upsert por cada fila existente, para que un cliente nuevo
+        pueda hacer la carga inicial con `after=0`.
+        """
+        total = 0
+        for entidad, (model, campo_dueno, _) in cls.ENTIDADES.items():
+            qs = model.objects.order_by()
+            if campo_dueno:
+                filas = qs.filter(**{f'{campo_dueno}__isnull': False}).values_list('pk', campo_dueno).iterator()
+            else:
+                filas = ((pk, None) for pk in qs.values_list('pk', flat=True).iterator())
+            total += cls.registrar_lote(entidad, filas, batch_size=batch_size)
+        return total
+
+    @staticmethod
+    def compactar() -> int:
+        """
+        Elimina las entradas superadas por una posterior del mismo objeto.
+        El cliente solo necesita el último estado de cada objeto, así que el
+        resultado de sincronizar no cambia.
+
+        Returns:
+            Número de entradas eliminadas
+        """
+        ultimos = (CambioSync.objects
+                   .values('entidad', 'objeto_id')
+                   .annotate(ultimo=models.Max('seq'))
+                   .values('ultimo'))
+        borrados, _ = CambioSync.objects.exclude(seq__in=models.Subquery(ultimos)).delete()
+        return borrados
+
+    # ------------------------------------------------------------------
+    # Lectura del feed
+    # ------------------------------------------------------------------
+    @staticmethod
+    def margen() -> timedelta:
+        return timedelta(seconds=getattr(settings, 'SYNC_MARGEN_SEGUNDOS', 5))
+
+    @classmethod
+    def cambios_para(cls, user, after: int, limit: int) -> dict:
+        """
+        Devuelve los cambios visibles para `user` con seq > after, agrupados por
+        entidad y deduplicados (solo la última operación de cada objeto).
+        Los cambios más nuevos que `margen()` quedan para la siguiente consulta.
+
+        Returns:
+            {"after", "last_seq", "has_more", "changes": {entidad: {"upserts": [...], "deletes": [...]}}}
+        """
+        qs = (CambioSync.objects
+              .filter(seq__gt=after, creado_en__lt=timezone.now() - cls.margen())
+              .filter(models.Q(usuario__isnull=True) | models.Q(usuario_id=user.id))
+              .order_by('seq')
+              .values_list('seq', 'entidad', 'objeto_id', 'operacion'))
+        filas = list(qs[:limit + 1])
+        has_more = len(filas) > limit
+        filas = filas[:limit]
+
+        # La última operación de cada objeto dentro del lote es la que manda
+        ultimo: Dict[Tuple[str, str], str] = {}
+        for _, entidad, objeto_id, operacion in filas:
+            ultimo[(entidad, objeto_id)] = operacion
+
+        por_entidad: Dict[str, Dict[str, List[str]]] = {}
+        for (entidad, objeto_id), operacion in ultimo.items():
+            por_entidad.setdefault(entidad, {'upsert': [], 'delete': []})[operacion].append(objeto_id)
+
+        changes = {}
+        for entidad, ops in por_entidad.items():
+            model, campo_dueno, campos = cls.ENTIDADES[entidad]
+            upserts = []
+            deletes = list(ops['delete'])
+            if ops['upsert']:
+                qs_obj = model.objects.filter(pk__in=ops['upsert'])
+                if campo_dueno:
+                    qs_obj = qs_obj.filter(**{campo_dueno: user.id})
+                upserts = list(qs_obj.values(*campos))
+                # Borrado después de registrarse el upsert (o reasignado a otro dueño)
+                encontrados = {str(u['id']) for u in upserts}
+                deletes.extend(pk for pk in ops['upsert'] if pk not in encontrados)
+            changes[entidad] = {'upserts': upserts, 'deletes': deletes}
+
+        return {
+            'after': after,
+            'last_seq': filas[-1][0] if filas else after,
+            'has_more': has_more,
+            'changes': changes,
+        }
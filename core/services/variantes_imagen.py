@@ -0,0 +1,291 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from ..lazy import lazy_import
+
+fcntl = lazy_import('fcntl')  # no existe en Windows: sin bloqueo entre procesos
+Image = lazy_import('PIL.Image')
+ImageOps = lazy_import('PIL.ImageOps')
+
+logger = logging.getLogger(__name__)
+
+AJUSTES = ('contain', 'cover', 'fill')
+FORMATOS = {'jpeg': ('JPEG', 'jpg', 'image/jpeg'),
+            'webp': ('WEBP', 'webp', 'image/webp'),
+            'png': ('PNG', 'png', 'image/png')}
+
+
+@dataclass(frozen=True)
+class Variante:
+    ancho: Optional[int]
+    alto: Optional[int]
+    ajuste: str
+    formato: str
+
+    @classmethod
+    def desde_parametros(cls, params) -> 'Variante':
+        """
+        Valida width / height / fit / format de la query.
+
+        Raises:
+            ValueError: con el mensaje para el cliente
+        """
+        maximo = int(getattr(settings, 'MEDIA_VARIANTE_MAX_LADO', 2048))
+
+        def lado(nombre):
+            raw = params.get(nombre)
+            if raw in (None, ''):
+                return None
+            if not str(raw).isdigit() or not 1 <= int(raw) <= maximo:
+                raise ValueError(f"{nombre} debe ser un entero entre 1 y {maximo}")
+            return int(raw)
+
+        ancho, alto = lado('width'), lado('height')
+        if ancho is None and alto is None:
+            raise ValueError("Indica width, height o ambos")
+        ajuste = params.get('fit') or 'contain'
+        if ajuste not in AJUSTES:
+            raise ValueError(f"fit debe ser uno de: {', '.join(AJUSTES)}")
+        formato = (params.get('format') or 'jpeg').lower()
+        if formato == 'jpg':
+            formato = 'jpeg'
+        if formato not in FORMATOS:
+            raise ValueError(f"format debe ser uno de: {', '.join(FORMATOS)}")
+        return cls(ancho, alto, ajuste, formato)
+
+    @property
+    def content_type(self) -> str:
+        return FORMATOS[self.formato][2]
+
+
+class VariantesImagenService:
+    """
+    Versiones redimensionadas de las fotos, generadas con Pillow la primera vez que
+    se piden y guardadas en un caché en disco (MEDIA_VARIANTES_DIR).
+
+    - La clave incluye ruta + versión del original + parámetros: si la foto cambia
+      la variante vieja deja de usarse y termina saliendo por LRU.
+    - Un acierto es un `os.stat`: no se importa ni se abre Pillow.
+    - Generación "single-flight": un lock por clave (flock entre procesos) hace que
+      peticiones simultáneas de la misma variante esperen a la primera en lugar de
+      decodificar la foto N veces. El archivo se escribe aparte y se publica con
+      os.replace, así nunca se sirve a medias.
+    - El tamaño total se limita a MEDIA_VARIANTES_MAX_BYTES borrando las variantes
+      usadas hace más tiempo (mtime, que se renueva en los aciertos).
+    """
+
+    CACHE_BYTES = 'variantes_imagen:bytes'
+    # No se renueva el mtime de un acierto más de una vez por este intervalo
+    TOQUE_SEGUNDOS = 3600
+    # Locks de hilo repartidos por clave (dentro del proceso; entre procesos, flock)
+    _locks_hilos = [threading.Lock() for _ in range(64)]
+
+    @staticmethod
+    def directorio() -> str:
+        return str(getattr(settings, 'MEDIA_VARIANTES_DIR', os.path.join(str(settings.MEDIA_ROOT), '.variantes')))
+
+    @staticmethod
+    def max_bytes() -> int:
+        return int(getattr(settings, 'MEDIA_VARIANTES_MAX_BYTES', 512 * 1024 * 1024))
+
+    @classmethod
+    def clave(cls, ruta: str, version: str, variante: Variante) -> str:
+        base = f'{ruta}|{version}|{variante.ancho}|{variante.alto}|{variante.ajuste}|{variante.formato}'
+        return hashlib.sha1(base.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def ruta_relativa(cls, clave: str, variante: Variante) -> str:
+        return f'{clave[:2]}/{clave}.{FORMATOS[variante.formato][1]}'
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+    @classmethod
+    def obtener(cls, origen_abs: str, ruta: str, version: str, variante: Variante) -> str:
+        """
+        Ruta relativa (dentro de directorio()) de la variante, generándola si falta.
+
+        Raises:
+            OSError / PIL.UnidentifiedImageError si el original no se puede leer
+        """
+        clave = cls.clave(ruta, version, variante)
+        relativa = cls.ruta_relativa(clave, variante)
+        destino = os.path.join(cls.directorio(), *relativa.split('/'))
+        if cls._acierto(destino):
+            return relativa
+
+        with cls._lock(clave):
+            # Otro proceso pudo haberla generado mientras esperábamos
+            if cls._acierto(destino):
+                return relativa
+            tamano = cls._generar(origen_abs, destino, variante)
+
+        cls._contabilizar(tamano)
+        return relativa
+
+    @classmethod
+    def podar(cls, objetivo: Optional[int] = None) -> int:
+        """
+        Borra variantes (la menos usada primero) hasta quedar en `objetivo` bytes
+        (por defecto el 90 % de MEDIA_VARIANTES_MAX_BYTES).
+
+        Returns:
+            Bytes ocupados al terminar
+        """
+        objetivo = int(cls.max_bytes() * 0.9) if objetivo is None else objetivo
+        archivos = []
+        total = 0
+        for carpeta, _, nombres in os.walk(cls.directorio()):
+            for nombre in nombres:
+                if nombre.endswith(('.lock', '.tmp')):
+                    continue
+                ruta = os.path.join(carpeta, nombre)
+                try:
+                    estado = os.stat(ruta)
+                except OSError:
+                    continue
+                archivos.append((estado.st_mtime, estado.st_size, ruta))
+                total += estado.st_size
+
+        if total > objetivo:
+            archivos.sort()
+            for _, tamano, ruta in archivos:
+                try:
+                    os.remove(ruta)
+                except OSError:
+                    continue
+                total -= tamano
+                if total <= objetivo:
+                    break
+        cache.set(cls.CACHE_BYTES, total, None)
+        return total
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+    @classmethod
+    def _acierto(cls, destino: str) -> bool:
+        try:
+            estado = os.stat(destino)
+        except OSError:
+            return False
+        # LRU por mtime (atime suele estar desactivado con noatime)
+        ahora = time.time()
+        if ahora - estado.st_mtime > cls.TOQUE_SEGUNDOS:
+            try:
+                os.utime(destino, (ahora, ahora))
+            except OSError:
+                pass
+        return True
+
+    @classmethod
+    def _lock(cls, clave: str):
+        return _LockVariante(cls, clave)
+
+    @classmethod
+    def _lock_hilo(cls, clave: str) -> threading.Lock:
+        return cls._locks_hilos[int(clave[:4], 16) % len(cls._locks_hilos)]
+
+    @staticmethod
+    def _generar(origen_abs: str, destino: str, variante: Variante) -> int:
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        formato_pil = FORMATOS[variante.formato][0]
+
+        with Image.open(origen_abs) as img:
+            w, h = img.size
+            # Orientación EXIF de 90°/270°: el tamaño visible es el transpuesto
+            rotada = img.getexif().get(0x0112) in (5, 6, 7, 8)
+            if rotada:
+                w, h = h, w
+            if variante.ancho and variante.alto:
+                objetivo = (variante.ancho, variante.alto)
+            elif variante.ancho:
+                # Un solo lado: se conserva la proporción
+                objetivo = (variante.ancho, max(1, round(h * variante.ancho / w)))
+            else:
+                objetivo = (max(1, round(w * variante.alto / h)), variante.alto)
+            # JPEG: decodifica directamente a escala reducida (1/2, 1/4, 1/8)
+            img.draft('RGB', objetivo[::-1] if rotada else objetivo)
+            img = ImageOps.exif_transpose(img)
+
+            if variante.ajuste == 'cover':
+                img = ImageOps.fit(img, objetivo, Image.LANCZOS)
+            elif variante.ajuste == 'fill':
+                img = img.resize(objetivo, Image.LANCZOS)
+            else:
+                img = ImageOps.contain(img, objetivo, Image.LANCZOS)
+
+            if formato_pil == 'JPEG' and img.mode not in ('RGB', 'L'):
+                img = img.convert('RGB')
+            elif img.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+                img = img.convert('RGBA' if 'A' in img.getbands() else 'RGB')
+
+            calidad = int(getattr(settings, 'MEDIA_VARIANTE_CALIDAD', 82))
+            fd, temporal = tempfile.mkstemp(dir=os.path.dirname(destino), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    opciones = {'optimize': True}
+                    if formato_pil in ('JPEG', 'WEBP'):
+                        opciones['quality'] = calidad
+                    if formato_pil == 'JPEG':
+                        opciones['progressive'] = True
+                    img.save(f, formato_pil, **opciones)
+                os.replace(temporal, destino)
+            except BaseException:
+                try:
+                    os.remove(temporal)
+                except OSError:
+                    pass
+                raise
+        return os.path.getsize(destino)
+
+    @classmethod
+    def _contabilizar(cls, tamano: int):
+        """Suma la variante nueva al total estimado y poda si se pasa del máximo."""
+        try:
+            total = cache.incr(cls.CACHE_BYTES, tamano)
+        except ValueError:
+            # Clave inexistente (caché vacía o reinicio): se recalcula recorriendo el disco
+            total = cls.podar(objetivo=cls.max_bytes())
+        if total > cls.max_bytes():
+            total = cls.podar()
+            logger.info("Caché de variantes podada a %s bytes", total)
+
+
+class _LockVariante:
+    """Lock por clave: threading.Lock dentro del proceso + flock entre procesos."""
+
+    def __init__(self, servicio, clave: str):
+        self.servicio = servicio
+        self.clave = clave
+        self.archivo = None
+
+    def __enter__(self):
+        self.lock_hilo = self.servicio._lock_hilo(self.clave)
+        self.lock_hilo.acquire()
+        if fcntl is not None:
+            carpeta = os.path.join(self.servicio.directorio(), self.clave[:2])
+            os.makedirs(carpeta, exist_ok=True)
+            self.archivo = open(os.path.join(carpeta, f'{self.clave}.lock'), 'a+b')
+            fcntl.flock(self.archivo.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self.archivo is not None:
+            try:
+                os.remove(self.archivo.name)
+            except OSError:
+                pass
+            fcntl.flock(self.archivo.fileno(), fcntl.LOCK_UN)
+            self.archivo.close()
+        self.lock_hilo.release()
+        return False
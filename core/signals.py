@@ -0,0 +1,30 @@
+"""
+Señales que alimentan el change-feed de sincronización (CambioSync) y los
+contadores de avance por zona/sector (ContadorAvance).
+Se conectan en CoreConfig.ready() para todos los modelos de SyncFeedService.ENTIDADES.
+"""
+from django.db.models.signals import post_save, post_delete, pre_save
+
+from .models.models import Reporte
+from .services.contadores_avance import ContadoresAvanceService
+from .services.sync_feed import SyncFeedService
+
+
+def _registrar_guardado(sender, instance, raw=False, **kwargs):
+    if raw:  # loaddata
+        return
+    SyncFeedService.registrar(instance, 'upsert')
+
+
+def _registrar_borrado(sender, instance, **kwargs):
+    SyncFeedService.registrar(instance, 'delete')
+
+
+def conectar():
+    for model, _, _ in SyncFeedService.ENTIDADES.values():
+        post_save.connect(_registrar_guardado, sender=model, dispatch_uid=f'sync_save_{model.__name__}')
+        post_delete.connect(_registrar_borrado, sender=model, dispatch_uid=f'sync_delete_{model.__name__}')
+
+    pre_save.connect(ContadoresAvanceService.antes_de_guardar, sender=Reporte, dispatch_uid='avance_pre_save')
+    post_save.connect(ContadoresAvanceService.al_guardar, sender=Reporte, dispatch_uid='avance_save')
+    post_delete.connect(ContadoresAvanceService.al_borrar, sender=Reporte, dispatch_uid='avance_delete')
@@ -1,3 +1,14 @@
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
 
-# Create your tests here.
+
+class PresupuestosConsultasTests(TestCase):
+    """Recorre todas las rutas con cada rol (ver manage.py verificar_presupuestos)."""
+
+    def test_vistas_dentro_de_presupuesto(self):
+        # Falla con CommandError si alguna vista supera su presupuesto o responde 5xx
+        salida = StringIO()
+        call_command('verificar_presupuestos', base_actual=True, stdout=salida)
+        self.assertIn('Todas las vistas están dentro de su presupuesto.', salida.getvalue())
@@ -0,0 +1,54 @@
+"""
+Throttles de DRF para los endpoints caros (login y subida de fotos).
+
+Los contadores viven en la caché `throttle` (settings.CACHES): memoria local por
+defecto o Redis compartido entre workers si REDIS_URL está configurado.
+DRF evalúa los throttles en `initial()`, antes de ejecutar el handler y antes de
+leer el cuerpo multipart, así que un cliente rechazado no cuesta hashing de
+contraseña ni escritura en disco. La respuesta es 429 con `Retry-After`.
+
+Presupuestos (settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']):
+  - login:        intentos por IP
+  - login_dni:    intentos por DNI desde una misma IP (frena probar contraseñas
+                  de una cuenta sin que otra IP pueda bloquear a su dueño)
+  - parte4:       subidas de la Parte 4 de los wizards de poste, por usuario
+  - foto_reporte: subidas de FotoReporteUploadView, por usuario
+"""
+from django.core.cache import caches
+from rest_framework.throttling import SimpleRateThrottle, UserRateThrottle
+
+
+class CacheThrottleMixin:
+    cache = caches['throttle']
+
+
+class LoginIPThrottle(CacheThrottleMixin, SimpleRateThrottle):
+    scope = 'login'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class LoginDniThrottle(CacheThrottleMixin, SimpleRateThrottle):
+    """
+    Intentos por (DNI, IP). Con solo el DNI, cualquiera podría dejar sin acceso a
+    un usuario mandando intentos con su DNI; así solo se frena la IP que insiste.
+    """
+    scope = 'login_dni'
+
+    def get_cache_key(self, request, view):
+        try:
+            dni = str(request.data.get('dni') or '').strip()
+        except Exception:  # cuerpo ilegible: lo rechazará la vista
+            return None
+        if not dni:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': f'{dni[:32]}:{self.get_ident(request)}'}
+
+
+class Parte4UploadThrottle(CacheThrottleMixin, UserRateThrottle):
+    scope = 'parte4'
+
+
+class FotoReporteThrottle(CacheThrottleMixin, UserRateThrottle):
+    scope = 'foto_reporte'
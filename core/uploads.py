@@ -0,0 +1,209 @@
+"""
+Validación de archivos subidos mientras se reciben, sin decodificar imágenes.
+
+`LimiteSubidaHandler` va primero en settings.FILE_UPLOAD_HANDLERS y ve cada trozo
+del multipart antes que los handlers de Django:
+
+    - Corta el archivo (SkipFile) en cuanto supera `max_bytes` del perfil, sin
+      terminar de leerlo ni escribirlo a disco.
+    - Con los primeros KB de una imagen abre solo la cabecera con Pillow
+      (Image.open no decodifica píxeles) y rechaza formato, lado o megapíxeles
+      fuera del perfil, también antes de recibir el resto.
+    - Limita cuántos archivos se aceptan por petición.
+
+Lo que pasa el filtro lo guardan los handlers de Django: en memoria hasta
+FILE_UPLOAD_MAX_MEMORY_SIZE y en un archivo temporal por encima.
+
+Cada vista declara su perfil con `@validar_subidas('foto')` (settings.UPLOADS_PERFILES);
+sin decorador se aplica 'default', que solo limita bytes. El decorador responde
+413/415 si hubo rechazos y los registra en el logger `core.uploads`.
+
+Ejemplo:
+    @api_view(['POST'])
+    @permission_classes([IsAuthenticated])
+    @validar_subidas('foto_wizard')
+    def mi_vista(request): ...
+"""
+import functools
+import io
+import logging
+import warnings
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from .lazy import lazy_import
+
+Image = lazy_import('PIL.Image')
+
+logger = logging.getLogger(__name__)
+
+# Bytes que se acumulan como máximo buscando la cabecera (EXIF grande antes del SOF)
+MAX_CABECERA = 256 * 1024
+
+STATUS_POR_MOTIVO = {
+    'bytes': status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+    'archivos': status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+    'pixeles': status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+    'lado': status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+    'formato': status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+    'ilegible': status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+}
+
+
+def limites_subida(perfil):
+    """Límites de un perfil de settings.UPLOADS_PERFILES (o un dict ya armado)."""
+    perfiles = getattr(settings, 'UPLOADS_PERFILES', {})
+    if isinstance(perfil, dict):
+        return {**perfiles.get('default', {}), **perfil}
+    return {**perfiles.get('default', {}), **perfiles.get(perfil, {})}
+
+
+def inspeccionar_cabecera(datos: bytes):
+    """
+    Formato y tamaño de una imagen leyendo solo su cabecera.
+
+    Returns:
+        (formato, ancho, alto), o None si los bytes no alcanzan (o no es imagen)
+
+    Raises:
+        Image.DecompressionBombError si declara más píxeles de los que Pillow admite
+    """
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', Image.DecompressionBombWarning)
+            with Image.open(io.BytesIO(datos)) as img:
+                return img.format, img.size[0], img.size[1]
+    except Image.DecompressionBombError:
+        raise
+    except Exception:
+        return None
+
+
+def validar_cabecera(formato, ancho, alto, limites):
+    """Devuelve (motivo, mensaje) si la imagen no cumple el perfil, o None."""
+    formatos = limites.get('formatos')
+    if formatos and formato not in formatos:
+        return 'formato', f"Formato {formato} no permitido (usa {', '.join(formatos)})."
+    max_lado = limites.get('max_lado')
+    if max_lado and max(ancho, alto) > max_lado:
+        return 'lado', f"La imagen mide {ancho}x{alto}; el lado máximo es {max_lado} px."
+    max_pixeles = limites.get('max_pixeles')
+    if max_pixeles and ancho * alto > max_pixeles:
+        return 'pixeles', (f"La imagen tiene {ancho * alto / 1e6:.1f} MP; "
+                           f"el máximo es {max_pixeles / 1e6:.0f} MP.")
+    return None
+
+
+class LimiteSubidaHandler(FileUploadHandler):
+    """Primer handler de la cadena: filtra por bytes y cabecera mientras se recibe."""
+
+    def _limites(self):
+        return limites_subida(getattr(self.request, 'perfil_subidas', 'default'))
+
+    def _rechazar(self, motivo, mensaje, saltar=True):
+        if not hasattr(self.request, 'subidas_rechazadas'):
+            self.request.subidas_rechazadas = []
+        self.request.subidas_rechazadas.append({
+            'campo': self.field_name,
+            'archivo': self.file_name,
+            'bytes': self.recibidos,
+            'motivo': motivo,
+            'detail': mensaje,
+        })
+        if saltar:
+            raise SkipFile()
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None,
+                 content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        self.limites = self._limites()
+        self.recibidos = 0
+        self.cabecera = bytearray() if self.limites.get('formatos') else None
+
+        # SkipFile desde new_file cerraría el archivo anterior (ya completo) de los
+        # otros handlers: el exceso de archivos se rechaza en el primer trozo.
+        self.request.subidas_recibidas = getattr(self.request, 'subidas_recibidas', 0) + 1
+        max_archivos = self.limites.get('max_archivos')
+        self.excede_archivos = bool(max_archivos) and self.request.subidas_recibidas > max_archivos
+
+    def _rechazar_exceso_archivos(self, saltar):
+        self.cabecera = None
+        self.excede_archivos = False
+        self._rechazar('archivos', f"Máximo {self.limites['max_archivos']} archivos por petición.", saltar)
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.excede_archivos:
+            self._rechazar_exceso_archivos(saltar=True)
+        self.recibidos += len(raw_data)
+        max_bytes = self.limites.get('max_bytes')
+        if max_bytes and self.recibidos > max_bytes:
+            self._rechazar('bytes', f"El archivo supera {max_bytes // (1024 * 1024)} MB.")
+
+        if self.cabecera is not None:
+            self.cabecera += raw_data
+            self._revisar_cabecera(final=False)
+        return raw_data
+
+    def _revisar_cabecera(self, final):
+        try:
+            info = inspeccionar_cabecera(bytes(self.cabecera))
+        except Image.DecompressionBombError:
+            self.cabecera = None
+            self._rechazar('pixeles', "La imagen declara demasiados píxeles.", saltar=not final)
+            return
+        if info is None:
+            if final or len(self.cabecera) >= MAX_CABECERA:
+                self.cabecera = None
+                self._rechazar('ilegible', "El archivo no es una imagen válida.", saltar=not final)
+            return
+        self.cabecera = None
+        error = validar_cabecera(*info, self.limites)
+        if error:
+            self._rechazar(*error, saltar=not final)
+
+    def file_complete(self, file_size):
+        # Archivo más chico que la cabecera buscada: se decide con lo recibido.
+        # Aquí ya no se puede saltar el archivo; validar_subidas rechaza la petición.
+        if self.excede_archivos:
+            self._rechazar_exceso_archivos(saltar=False)
+        if self.cabecera is not None:
+            self._revisar_cabecera(final=True)
+        return None
+
+
+def validar_subidas(perfil='default'):
+    """
+    Decorador para el handler de una vista DRF (función bajo @api_view o método de
+    un APIView). Fija el perfil antes de que se lea el cuerpo y, si algún archivo
+    fue rechazado, responde 413/415 sin ejecutar la vista.
+    """
+    def decorador(vista):
+        @functools.wraps(vista)
+        def envoltura(*args, **kwargs):
+            request = next(a for a in args if isinstance(a, Request))
+            django_request = request._request
+            django_request.perfil_subidas = perfil
+            request.FILES  # fuerza el parseo con el perfil ya fijado
+
+            rechazos = getattr(django_request, 'subidas_rechazadas', None)
+            if not rechazos:
+                return vista(*args, **kwargs)
+
+            for r in rechazos:
+                logger.warning(
+                    "Subida rechazada (%s) en %s %s: usuario=%s campo=%s archivo=%r bytes=%s perfil=%s",
+                    r['motivo'], request.method, request.path, getattr(request.user, 'pk', None),
+                    r['campo'], r['archivo'], r['bytes'], perfil,
+                )
+            primero = rechazos[0]
+            return Response(
+                {"detail": primero['detail'], "rechazados": rechazos},
+                status=STATUS_POR_MOTIVO.get(primero['motivo'], status.HTTP_400_BAD_REQUEST),
+            )
+        envoltura.perfil_subidas = perfil
+        return envoltura
+    return decorador
@@ -5,11 +5,14 @@ from .views.views import (
     login_view,
     create_supervisor, create_encargado, create_usuario,
     list_supervisores, list_encargados,
-    update_user, delete_user,
+    update_user, delete_user, importar_usuarios,
 )
 
 # --- Catálogos / Árbol de ubicación ---
-from .views.views_catalogos import CatalogoArbolView
+from .views.views_catalogos import CatalogoArbolView, catalogo_arbol_completo
+
+# --- Media protegida ---
+from .views.views_media import MediaProtegidaView, MediaVarianteView
 
 # --- Predios (endpoints “legacy” directos al Reporte) ---
 from .views.views_predio import (
@@ -45,7 +48,10 @@ from .views.views_reportes import (
     PredioReporteListView, 
 )
 from .views.views_wizard_elementos import wizard_elementos
-from .views.views_estadisticas import estadisticas_postes
+from .views.views_estadisticas import estadisticas_postes, avance_sector, avance_zona
+from .views.views_elementos_postes import elementos_postes_conteo, elementos_postes_buscar
+from .views.views_postes_publicados import postes_publicados_list, postes_cercanos
+from .views.views_sync import sync_cambios
 from .views.views_telematico import (
     telematico_wizard_iniciar,
     telematico_parte1_save,
@@ -76,12 +82,14 @@ urlpatterns = [
 
     path("usuarios/supervisores/", list_supervisores, name="list_supervisores"),
     path("usuarios/encargados/", list_encargados, name="list_encargados"),
+    path("usuarios/importar/", importar_usuarios, name="importar_usuarios"),
     
     path('usuarios/editar/<int:pk>/', update_user, name='update-user'),
     path('usuarios/eliminar/<int:pk>/', delete_user, name='delete-user'),
 
     # ---------------- Catálogos ----------------
     path("catalogos/arbol", CatalogoArbolView.as_view(), name="catalogo_arbol"),
+    path("catalogos/arbol/completo/", catalogo_arbol_completo, name="catalogo_arbol_completo"),
 
     # ---------------- Predios (legacy directos) ----------------
     path("predios/reportes/", ReporteCreateView.as_view(), name="reporte-create"),
@@ -113,11 +121,28 @@ urlpatterns = [
     path("predios/reportes/list/", PredioReporteListView.as_view(), name="predio-reporte-list"),
 
     # ---------------- Demo elementos electricos ----------------
-    path('wizard/<int:wizard_id>/elementos/', wizard_elementos, name='wizard_elementos'),
+    path('wizard/<uuid:wizard_id>/elementos/', wizard_elementos, name='wizard_elementos'),
     
     # ---------------- Estadísticas de Postes ----------------
     path('postes/estadisticas/', estadisticas_postes, name='postes_estadisticas'),
 
+    # ---------------- Avance por sector / zona (contadores desnormalizados) ----------------
+    path('sectores/<int:sector_id>/avance/', avance_sector, name='avance_sector'),
+    path('zonas/<int:zona_id>/avance/', avance_zona, name='avance_zona'),
+
+    # ---------------- Postes por elemento (índice relacional) ----------------
+    path('postes/elementos/conteo/', elementos_postes_conteo, name='postes_elementos_conteo'),
+    path('postes/elementos/buscar/', elementos_postes_buscar, name='postes_elementos_buscar'),
+
+    # ---------------- Postes publicados (proyección de lectura) ----------------
+    path('postes/publicados/', postes_publicados_list, name='postes_publicados_list'),
+    path('postes/cercanos/', postes_cercanos, name='postes_cercanos'),
+    path('sync/', sync_cambios, name='sync_cambios'),
+
+    # ---------------- Media (fotos con autorización por rol) ----------------
+    path('media/variantes/<path:ruta>', MediaVarianteView.as_view(), name='media_variante'),
+    path('media/<path:ruta>', MediaProtegidaView.as_view(), name='media_protegida'),
+
     # ---------------- Wizard Poste Telemático ----------------
     path('wizard/telematico/iniciar/', telematico_wizard_iniciar, name='telematico_wizard_iniciar'),
     path('wizard/telematico/<int:wizard_id>/parte1/', telematico_parte1_save, name='telematico_parte1_save'),
@@ -11,11 +11,14 @@ from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
 from ..serializers.serializers import UserSerializer
+from ..throttling import LoginDniThrottle, LoginIPThrottle
 
 
 class LoginView(APIView):
     """Vista para autenticación de usuarios."""
-    
+    # Se rechaza antes de authenticate(): el hash de la contraseña es lo caro
+    throttle_classes = [LoginIPThrottle, LoginDniThrottle]
+
     @swagger_auto_schema(
         operation_description="Autenticación de usuario por DNI y contraseña.",
         request_body=openapi.Schema(
@@ -43,7 +46,8 @@ class LoginView(APIView):
                 }
             ),
             401: "Credenciales incorrectas",
-            403: "Usuario inactivo."
+            403: "Usuario inactivo.",
+            429: "Demasiados intentos (ver cabecera Retry-After)"
         }
     )
     def post(self, request):
@@ -12,6 +12,7 @@ from drf_yasg import openapi
 
 from core.models.models import ElementoElectrico, PosteElectricoWizard
 from core.serializers.serializers import ElementoSerializer, PosteElectricoWizardSerializer
+from core.services.elementos_index import ElementosIndexService
 
 
 @swagger_auto_schema(
@@ -75,6 +76,7 @@ def poste_electrico_save(request):
         
         if serializer.is_valid():
             obj = serializer.save(encargado=request.user)
+            ElementosIndexService('electrico').sincronizar(obj)
             # 201 si creó, 200 si actualizó
             http_status = status.HTTP_201_CREATED if instance is None else status.HTTP_200_OK
             return Response(PosteElectricoWizardSerializer(obj).data, status=http_status)
@@ -12,6 +12,8 @@ from drf_yasg import openapi
 
 from ..models.models import PredioWizard, Reporte, DetallePredio, FotoReporte
 from ..serializers.serializers import PredioWizardMediaSerializer
+from ..idempotency import idempotente
+from ..uploads import validar_subidas
 
 
 class PredioWizardMediaView(APIView):
@@ -27,9 +29,12 @@ class PredioWizardMediaView(APIView):
         request_body=PredioWizardMediaSerializer,
         responses={
             200: "Datos actualizados en el wizard",
-            404: "Wizard no existe o no es tuyo."
+            404: "Wizard no existe o no es tuyo.",
+            413: "Imagen demasiado grande",
+            415: "Formato de imagen no permitido"
         }
     )
+    @validar_subidas('foto')
     def post(self, request, wizard_id):
         # Buscar wizard y validar dueño/rol
         try:
@@ -79,6 +84,7 @@ class PredioWizardPublishView(APIView):
             404: "Wizard no existe."
         }
     )
+    @idempotente
     def post(self, request, wizard_id):
         # Validar wizard existe y pertenece al usuario
         try:
@@ -86,10 +92,8 @@ class PredioWizardPublishView(APIView):
         except PredioWizard.DoesNotExist:
             return Response({"detail": "Wizard no existe."}, status=404)
 
-        # Determinar proyecto
-        proyecto = wz.proyecto
-        if proyecto is None and wz.zona:
-            proyecto = wz.zona.proyecto
+        # Determinar proyecto (PredioWizard no guarda proyecto: se toma el de la zona)
+        proyecto = wz.zona.proyecto if wz.zona_id else None
         
         if proyecto is None:
             return Response(
@@ -5,13 +5,17 @@ Maneja creación, listado, actualización y eliminación de usuarios (supervisor
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
 from django.db import IntegrityError, transaction
+from django.db.models import Q
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, parser_classes, permission_classes
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
 from ..models.models import CustomUser, Empresa
 from ..serializers.serializers import UserSerializer
+from ..pagination import paginate
+from ..services.importacion_usuarios import ImportacionUsuariosService
 from ..permissions import (
     IsAdminOrSuperAdmin,
     IsSupervisorOrAdmin,
@@ -19,6 +23,9 @@ from ..permissions import (
 
 ROLES_VALIDOS = {"superadmin", "admin", "supervisor", "encargado"}
 
+# Campos de la vista compacta (?compacto=1) usada por los selectores del frontend
+CAMPOS_COMPACTOS = ('id', 'dni', 'nombres', 'apellidos')
+
 
 def _password_valida(pw: str) -> bool:
     """
@@ -234,25 +241,65 @@ def create_encargado(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+def buscar_usuarios(queryset, texto):
+    """
+    Filtra por DNI (si el texto es numérico, por prefijo) o por nombres/apellidos:
+    cada palabra debe ser el inicio del nombre o del apellido. En PostgreSQL el
+    prefijo usa los índices UPPER(...) text_pattern_ops de la migración 0037.
+    """
+    texto = (texto or '').strip()
+    if not texto:
+        return queryset
+    if texto.isdigit():
+        return queryset.filter(dni__startswith=texto)
+    for palabra in texto.split():
+        queryset = queryset.filter(Q(nombres__istartswith=palabra) | Q(apellidos__istartswith=palabra))
+    return queryset
+
+
+def listado_usuarios_response(request, queryset):
+    """
+    Aplica búsqueda (?search=), orden alfabético y paginación (page/page_size).
+    Con ?compacto=1 devuelve solo id, dni, nombres y apellidos, sin sectores.
+
+    Sin page/page_size/search/compacto: lista plana (la respuesta original).
+    Si no: {"count", "page", "page_size", "results"}
+    """
+    params = request.query_params
+    if not any(p in params for p in ('page', 'page_size', 'search', 'compacto')):
+        serializer = UserSerializer(queryset.prefetch_related('sectores'), many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    qs = buscar_usuarios(queryset, params.get('search'))
+    qs = qs.order_by('apellidos', 'nombres', 'id')
+
+    if params.get('compacto') in ('1', 'true', 'True'):
+        pagina, meta = paginate(request, qs.values(*CAMPOS_COMPACTOS), max_page_size=500)
+        return Response({**meta, 'results': list(pagina)}, status=status.HTTP_200_OK)
+
+    pagina, meta = paginate(request, qs.prefetch_related('sectores'))
+    serializer = UserSerializer(pagina, many=True)
+    return Response({**meta, 'results': serializer.data}, status=status.HTTP_200_OK)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated, IsSupervisorOrAdmin])
 def list_supervisores(request):
     """
-    Lista todos los supervisores.
+    Lista de supervisores, plana o paginada (ver listado_usuarios_response).
     Los administradores solo ven supervisores de su empresa.
     """
     supervisores_qs = CustomUser.objects.filter(rol='supervisor')
     supervisores = filter_users_by_company(supervisores_qs, request.user)
-    
-    serializer = UserSerializer(supervisores, many=True)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+
+    return listado_usuarios_response(request, supervisores)
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated, IsSupervisorOrAdmin])
 def list_encargados(request):
     """
-    Lista todos los encargados.
+    Lista de encargados, plana o paginada (ver listado_usuarios_response).
     Los administradores solo ven encargados de su empresa.
     Los supervisores solo ven sus propios encargados.
     """
@@ -262,9 +309,8 @@ def list_encargados(request):
     # Los supervisores solo ven sus encargados
     if request.user.rol == 'supervisor':
         encargados = encargados.filter(supervisor=request.user)
-        
-    serializer = UserSerializer(encargados, many=True)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+
+    return listado_usuarios_response(request, encargados)
 
 
 @api_view(['PUT', 'PATCH'])
@@ -319,3 +365,56 @@ def delete_user(request, pk):
     
     user_to_delete.delete()
     return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsAdminOrSuperAdmin])
+@parser_classes([MultiPartParser, FormParser, JSONParser])
+def importar_usuarios(request):
+    """
+    Alta masiva de usuarios (todo o nada).
+    Entrada:
+      - multipart con `archivo` (.csv o .json; o indicar `formato`), o
+      - JSON: lista de usuarios o {"usuarios": [...]}
+    Columnas: dni, email, nombres, apellidos, password, rol, celular,
+    empresa_id, supervisor_dni, sectores.
+    Opcional: password_defecto, ?validar=1 (solo valida).
+    Hasta ImportacionUsuariosService.MAX_FILAS_HTTP filas; más, con manage.py importar_usuarios.
+    Los administradores solo importan supervisores y encargados de su empresa
+    (sin empresa asignada, 403). Los sectores deben ser de la empresa de cada fila.
+    """
+    archivo = request.FILES.get('archivo')
+    try:
+        if archivo is not None:
+            formato = (request.data.get('formato') or archivo.name.rsplit('.', 1)[-1]).lower()
+            filas = ImportacionUsuariosService.leer(archivo.read(), formato)
+        elif isinstance(request.data, list):
+            filas = request.data
+        else:
+            filas = request.data.get('usuarios')
+            if not isinstance(filas, list):
+                raise ValueError('Envía `archivo` o una lista `usuarios`.')
+    except (ValueError, UnicodeDecodeError) as e:
+        return Response({"detail": f"Archivo inválido: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+
+    opciones = {} if isinstance(request.data, list) else request.data
+    if request.user.rol != 'superadmin' and request.user.empresa_id is None:
+        # Sin empresa, empresa_id=None dejaría elegir la empresa de cada fila
+        return Response({"detail": "El usuario no tiene una empresa asignada."},
+                        status=status.HTTP_403_FORBIDDEN)
+    # Por HTTP: pool forkserver/spawn (no fork dentro del servidor web) y tope de filas
+    limites = dict(max_filas=ImportacionUsuariosService.MAX_FILAS_HTTP, password_defecto=opciones.get('password_defecto'))
+    if request.user.rol == 'superadmin':
+        servicio = ImportacionUsuariosService(**limites)
+    else:
+        servicio = ImportacionUsuariosService(
+            empresa_id=request.user.empresa_id,
+            roles_permitidos=('supervisor', 'encargado'),
+            **limites,
+        )
+
+    solo_validar = request.query_params.get('validar') in ('1', 'true', 'True')
+    resultado = servicio.importar(filas, solo_validar=solo_validar)
+    if resultado['errores']:
+        return Response(resultado, status=status.HTTP_400_BAD_REQUEST)
+    return Response(resultado, status=status.HTTP_200_OK if solo_validar else status.HTTP_201_CREATED)
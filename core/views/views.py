@@ -22,6 +22,7 @@ from .user_management_views import (
     list_encargados,
     update_user,
     delete_user,
+    importar_usuarios,
     filter_users_by_company,
     check_user_access,
 )
@@ -46,6 +47,7 @@ __all__ = [
     'list_encargados',
     'update_user',
     'delete_user',
+    'importar_usuarios',
     'filter_users_by_company',
     'check_user_access',
     # Catálogos
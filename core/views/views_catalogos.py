@@ -10,6 +10,12 @@ from rest_framework.response import Response
 from core.models.models import ParametroCatalogo
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
+import gzip
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from ..media import coincide_etag
+from ..middleware import codificaciones_aceptadas
+from ..services.arbol_ubicaciones import ArbolUbicacionesService
 
 class CatalogoArbolView(APIView):
     authentication_classes = []  # ← Si quieres público; si no, usa tu JWT
@@ -125,4 +131,80 @@ def catalogo_poste_opciones(request):
     }
     for row in qs:
         resp[row['categoria']].append(row['nombre'])
-    return Response(resp, status=200)
\ No newline at end of file
+    return Response(resp, status=200)
+
+
+@swagger_auto_schema(
+    method='get',
+    operation_description=(
+        "Devuelve el árbol completo Distrito → Zona → Sector de la empresa del usuario en una sola respuesta. "
+        "Se arma una vez por versión del catálogo y se sirve ya comprimido (br/gzip). "
+        "Enviar If-None-Match con el ETag recibido para obtener 304 si no cambió."
+    ),
+    manual_parameters=[
+        openapi.Parameter('mis_sectores', openapi.IN_QUERY, description="1 = solo los sectores asignados al usuario", type=openapi.TYPE_BOOLEAN, required=False),
+        openapi.Parameter('empresa_id', openapi.IN_QUERY, description="Solo superadmin: empresa a consultar (por defecto todas)", type=openapi.TYPE_INTEGER, required=False),
+    ],
+    responses={
+        200: openapi.Response(
+            description="Árbol completo",
+            examples={
+                "application/json": {
+                    "version": 42,
+                    "distritos": [
+                        {"id": 1, "nombre": "Distrito Ejemplo", "zonas": [
+                            {"id": 1, "nombre": "Zona Ejemplo", "sectores": [{"id": 1, "nombre": "Sector Ejemplo"}]}
+                        ]}
+                    ]
+                }
+            }
+        ),
+        304: "Sin cambios desde el ETag enviado",
+        400: "empresa_id inválido",
+        403: "Usuario sin empresa asignada"
+    }
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def catalogo_arbol_completo(request):
+    """
+    Árbol de ubicación completo, pre-serializado y comprimido por versión del catálogo.
+    - superadmin: todas las empresas, o ?empresa_id=
+    - resto: distritos de su empresa más los compartidos (sin empresa); sin empresa, 403
+    - ?mis_sectores=1: poda el árbol a CustomUser.sectores
+    """
+    user = request.user
+    empresa_id = user.empresa_id
+    if user.rol == 'superadmin':
+        empresa_id = request.query_params.get('empresa_id') or None
+        if empresa_id is not None:
+            if not str(empresa_id).isdigit():
+                return Response({"detail": "empresa_id inválido"}, status=status.HTTP_400_BAD_REQUEST)
+            empresa_id = int(empresa_id)
+    elif empresa_id is None:
+        # empresa_id=None es el árbol de todas las empresas: solo para superadmin
+        return Response({"detail": "El usuario no tiene una empresa asignada."},
+                        status=status.HTTP_403_FORBIDDEN)
+
+    sector_ids = None
+    if request.query_params.get('mis_sectores') in ('1', 'true', 'True'):
+        sector_ids = list(user.sectores.values_list('id', flat=True))
+
+    arbol = ArbolUbicacionesService.obtener(empresa_id, sector_ids)
+
+    if coincide_etag(request.META.get('HTTP_IF_NONE_MATCH', ''), arbol['etag']):
+        response = HttpResponseNotModified()
+    else:
+        aceptadas = codificaciones_aceptadas(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if arbol['br'] is not None and 'br' in aceptadas:
+            response = HttpResponse(arbol['br'], content_type='application/json')
+            response['Content-Encoding'] = 'br'
+        elif 'gzip' in aceptadas:
+            response = HttpResponse(arbol['gzip'], content_type='application/json')
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(gzip.decompress(arbol['gzip']), content_type='application/json')
+    response['ETag'] = arbol['etag']
+    response['Cache-Control'] = 'private, no-cache'
+    patch_vary_headers(response, ('Accept-Encoding', 'Authorization'))
+    return response
@@ -0,0 +1,203 @@
+"""
+Consultas por elemento sobre los wizards de poste.
+Usa el índice relacional PosteElementoLink para filtrar y contar en la base de datos,
+sin decodificar los arrays JSON de cada wizard en Python.
+"""
+from django.db.models import Count, Q
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+
+from ..models.models import PosteElectricoWizard
+from ..models.models_telematico import PosteTelematicWizard
+from ..models.models_elementos import PosteElementoLink
+from ..db import presupuesto_consultas, statement_timeout
+from ..pagination import paginate
+
+TIPOS_POSTE = ('electrico', 'telematico')
+
+
+def _scope_links_por_rol(qs, user):
+    """
+    Aplica las mismas reglas de visibilidad que los reportes:
+      - superadmin: todo
+      - admin: wizards de encargados de su empresa
+      - supervisor: wizards de sus encargados
+      - encargado: solo los suyos
+    """
+    rol = getattr(user, 'rol', None)
+    if rol == 'admin' and getattr(user, 'empresa_id', None):
+        campo, valor = 'encargado__empresa_id', user.empresa_id
+    elif rol == 'supervisor':
+        campo, valor = 'encargado__supervisor_id', user.id
+    elif rol == 'encargado':
+        campo, valor = 'encargado_id', user.id
+    else:
+        return qs
+    return qs.filter(
+        Q(**{f'poste_electrico__{campo}': valor}) | Q(**{f'poste_telematico__{campo}': valor})
+    )
+
+
+def _parse_ids(raw_values):
+    """Acepta ?elemento_id=1&elemento_id=2 y ?elemento_id=1,2."""
+    ids = []
+    for raw in raw_values:
+        for parte in str(raw).split(','):
+            parte = parte.strip()
+            if not parte:
+                continue
+            if not parte.isdigit():
+                raise ValueError(parte)
+            ids.append(int(parte))
+    return list(dict.fromkeys(ids))
+
+
+def _links_filtrados(request):
+    """Construye el queryset base de links aplicando scope y filtros comunes."""
+    qs = _scope_links_por_rol(PosteElementoLink.objects.all(), request.user)
+
+    tipo_poste = request.query_params.get('tipo_poste')
+    if tipo_poste:
+        if tipo_poste not in TIPOS_POSTE:
+            raise ValueError('tipo_poste')
+        qs = qs.filter(tipo_poste=tipo_poste)
+
+    lista = request.query_params.get('lista')
+    if lista:
+        if lista not in TIPOS_POSTE:
+            raise ValueError('lista')
+        qs = qs.filter(lista=lista)
+
+    estado = request.query_params.get('estado')
+    if estado:
+        qs = qs.filter(Q(poste_electrico__estado=estado) | Q(poste_telematico__estado=estado))
+    return qs
+
+
+FILTROS_COMUNES = [
+    openapi.Parameter('tipo_poste', openapi.IN_QUERY, description="electrico | telematico", type=openapi.TYPE_STRING, required=False),
+    openapi.Parameter('lista', openapi.IN_QUERY, description="Array de origen: electrico | telematico", type=openapi.TYPE_STRING, required=False),
+    openapi.Parameter('estado', openapi.IN_QUERY, description="Estado del wizard (draft | published)", type=openapi.TYPE_STRING, required=False),
+]
+
+
+@swagger_auto_schema(
+    method='get',
+    operation_description="Cuenta cuántos postes llevan cada elemento del catálogo.",
+    manual_parameters=FILTROS_COMUNES,
+    responses={
+        200: openapi.Response(
+            description="Conteo por elemento",
+            examples={
+                "application/json": [
+                    {"elemento_id": 6, "nombre": "Caja NAP", "tipo_poste": "electrico", "lista": "telematico", "total": 42}
+                ]
+            }
+        ),
+        400: "Parámetros inválidos"
+    }
+)
+@presupuesto_consultas('lectura')
+@statement_timeout('lectura')
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def elementos_postes_conteo(request):
+    """
+    Devuelve el número de postes por elemento, agrupado por tipo de poste y lista.
+    El conteo se resuelve con un único GROUP BY sobre PosteElementoLink.
+    """
+    try:
+        qs = _links_filtrados(request)
+    except ValueError as e:
+        return Response({"detail": f"Parámetro inválido: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+
+    filas = (qs.values('elemento_id', 'elemento__nombre', 'tipo_poste', 'lista')
+               .annotate(total=Count('id'))
+               .order_by('-total', 'elemento__nombre'))
+
+    data = [
+        {
+            'elemento_id': f['elemento_id'],
+            'nombre': f['elemento__nombre'],
+            'tipo_poste': f['tipo_poste'],
+            'lista': f['lista'],
+            'total': f['total'],
+        }
+        for f in filas
+    ]
+    return Response(data, status=status.HTTP_200_OK)
+
+
+@swagger_auto_schema(
+    method='get',
+    operation_description="Lista los postes que llevan uno o varios elementos.",
+    manual_parameters=FILTROS_COMUNES + [
+        openapi.Parameter('elemento_id', openapi.IN_QUERY, description="ID(s) de elemento, repetible o separado por comas", type=openapi.TYPE_STRING, required=True),
+        openapi.Parameter('modo', openapi.IN_QUERY, description="any (alguno) | all (todos). Por defecto any", type=openapi.TYPE_STRING, required=False),
+        openapi.Parameter('page', openapi.IN_QUERY, description="Número de página", type=openapi.TYPE_INTEGER, required=False),
+        openapi.Parameter('page_size', openapi.IN_QUERY, description="Cantidad de elementos por página", type=openapi.TYPE_INTEGER, required=False),
+    ],
+    responses={200: "Postes paginados", 400: "Parámetros inválidos"}
+)
+@presupuesto_consultas('lectura')
+@statement_timeout('lectura')
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def elementos_postes_buscar(request):
+    """
+    Devuelve los wizards de poste que llevan los elementos indicados.
+    - modo=any: al menos uno de los elementos
+    - modo=all: todos los elementos
+    """
+    try:
+        ids = _parse_ids(request.query_params.getlist('elemento_id'))
+        qs = _links_filtrados(request)
+    except ValueError as e:
+        return Response({"detail": f"Parámetro inválido: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+
+    if not ids:
+        return Response({"detail": "elemento_id es requerido"}, status=status.HTTP_400_BAD_REQUEST)
+
+    modo = request.query_params.get('modo', 'any')
+    if modo not in ('any', 'all'):
+        return Response({"detail": "modo debe ser 'any' o 'all'"}, status=status.HTTP_400_BAD_REQUEST)
+
+    postes = (qs.filter(elemento_id__in=ids)
+                .values('tipo_poste', 'poste_electrico_id', 'poste_telematico_id')
+                .annotate(coincidencias=Count('elemento_id', distinct=True))
+                .order_by('tipo_poste', '-poste_electrico_id', '-poste_telematico_id'))
+    if modo == 'all':
+        postes = postes.filter(coincidencias=len(ids))
+
+    pagina, meta = paginate(request, postes)
+    pagina = list(pagina)
+
+    # Datos de cabecera de los wizards de la página (una consulta por tipo)
+    ids_elec = [p['poste_electrico_id'] for p in pagina if p['poste_electrico_id']]
+    ids_tel = [p['poste_telematico_id'] for p in pagina if p['poste_telematico_id']]
+    cabeceras = {}
+    for tipo, model, wids in (('electrico', PosteElectricoWizard, ids_elec),
+                              ('telematico', PosteTelematicWizard, ids_tel)):
+        if wids:
+            for w in model.objects.filter(id__in=wids).values('id', 'codigo', 'estado', 'encargado_id', 'actualizado_en'):
+                cabeceras[(tipo, w['id'])] = w
+
+    results = []
+    for p in pagina:
+        wid = p['poste_electrico_id'] or p['poste_telematico_id']
+        cab = cabeceras.get((p['tipo_poste'], wid), {})
+        results.append({
+            'tipo_poste': p['tipo_poste'],
+            'wizard_id': wid,
+            'codigo': cab.get('codigo'),
+            'estado': cab.get('estado'),
+            'encargado': cab.get('encargado_id'),
+            'actualizado_en': cab.get('actualizado_en'),
+            'coincidencias': p['coincidencias'],
+        })
+
+    return Response({**meta, 'results': results}, status=status.HTTP_200_OK)
@@ -3,7 +3,8 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.db.models import Count
-from ..models.models import PosteElectricoWizard
+from ..models.models import PosteElectricoWizard, Sector, Zona
+from ..services.contadores_avance import ContadoresAvanceService
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
@@ -72,4 +73,60 @@ def estadisticas_postes(request):
         }
     }
     
-    return Response(response_data, status=status.HTTP_200_OK)
\ No newline at end of file
+    return Response(response_data, status=status.HTTP_200_OK)
+
+
+EJEMPLO_AVANCE = {
+    "total": 42,
+    "por_tipo": {
+        "predio": {"total": 30, "por_estado": {"registrado": 25, "observado": 5}},
+        "electrico": {"total": 12, "por_estado": {"registrado": 12}},
+    },
+}
+
+
+def _puede_ver_zona(user, zona):
+    if getattr(user, 'rol', None) == 'superadmin' or user.is_superuser:
+        return True
+    empresa_id = zona.proyecto.empresa_id if zona.proyecto_id else None
+    return bool(user.empresa_id) and empresa_id == user.empresa_id
+
+
+@swagger_auto_schema(
+    method='get',
+    operation_description="Avance de un sector: reportes registrados por tipo y estado "
+                          "(lee los contadores de avance, sin contar reportes).",
+    responses={200: openapi.Response(description="Avance del sector",
+                                     examples={"application/json": {"sector_id": 1, "zona_id": 1, **EJEMPLO_AVANCE}}),
+               403: "Sector de otra empresa", 404: "Sector no encontrado"},
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def avance_sector(request, sector_id):
+    sector = Sector.objects.select_related('zona__proyecto').filter(pk=sector_id).first()
+    if sector is None:
+        return Response({"detail": "Sector no encontrado."}, status=status.HTTP_404_NOT_FOUND)
+    if not _puede_ver_zona(request.user, sector.zona):
+        return Response({"detail": "No autorizado para ver este sector."}, status=status.HTTP_403_FORBIDDEN)
+    avance = ContadoresAvanceService.avance(sector_id=sector.id)
+    return Response({"sector_id": sector.id, "zona_id": sector.zona_id, **avance}, status=status.HTTP_200_OK)
+
+
+@swagger_auto_schema(
+    method='get',
+    operation_description="Avance de una zona: reportes registrados por tipo y estado "
+                          "(lee los contadores de avance, sin contar reportes).",
+    responses={200: openapi.Response(description="Avance de la zona",
+                                     examples={"application/json": {"zona_id": 1, **EJEMPLO_AVANCE}}),
+               403: "Zona de otra empresa", 404: "Zona no encontrada"},
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def avance_zona(request, zona_id):
+    zona = Zona.objects.select_related('proyecto').filter(pk=zona_id).first()
+    if zona is None:
+        return Response({"detail": "Zona no encontrada."}, status=status.HTTP_404_NOT_FOUND)
+    if not _puede_ver_zona(request.user, zona):
+        return Response({"detail": "No autorizado para ver esta zona."}, status=status.HTTP_403_FORBIDDEN)
+    avance = ContadoresAvanceService.avance(zona_id=zona.id)
+    return Response({"zona_id": zona.id, **avance}, status=status.HTTP_200_OK)
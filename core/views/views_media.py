@@ -0,0 +1,146 @@
+"""
+Fotos de MEDIA_ROOT servidas con autorización por rol.
+Django valida el acceso y delega el envío al servidor de adelante (core/media.py).
+También sirve variantes redimensionadas (VariantesImagenService).
+"""
+import os
+import time
+
+from django.conf import settings
+from django.http import Http404
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+
+from ..media import servir_archivo
+from ..services.media_protegida import MediaProtegidaService
+from ..services.variantes_imagen import Image, Variante, VariantesImagenService
+
+
+class SinNegociacion(BaseContentNegotiation):
+    """Las imágenes no pasan por los renderers: se acepta cualquier Accept (img src envía image/*)."""
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+class MediaProtegidaView(APIView):
+    """
+    GET /api/media/<ruta>
+    - 404 si el archivo no existe, no es una foto registrada o el usuario no puede verla
+      (no se distingue para no revelar qué existe).
+    - Soporta Range / If-Range, ETag fuerte e If-None-Match.
+    - Con `v` vigente la respuesta es immutable; con `exp` + `sig` válidos no
+      hace falta JWT y la caché puede ser pública (ver MediaProtegidaService.url).
+    """
+    permission_classes = [IsAuthenticated]
+    content_negotiation_class = SinNegociacion
+    presupuesto_consultas = 5
+
+    def _firmada(self):
+        if not hasattr(self, '_firma_ok'):
+            ruta = MediaProtegidaService.normalizar(self.kwargs.get('ruta', ''))
+            self._firma_ok = bool(ruta) and MediaProtegidaService.firma_valida(ruta, self.request.query_params)
+        return self._firma_ok
+
+    def get_permissions(self):
+        if self._firmada():
+            return []
+        return super().get_permissions()
+
+    def _cache_control(self, ruta):
+        max_age = int(getattr(settings, 'MEDIA_CACHE_MAX_AGE', 365 * 24 * 3600))
+        if self._firmada():
+            restante = int(self.request.query_params['exp']) - int(time.time())
+            return f'public, max-age={max(min(max_age, restante), 0)}, immutable'
+        if MediaProtegidaService.version_vigente(ruta, self.request.query_params):
+            return f'private, max-age={max_age}, immutable'
+        return 'private, no-cache'
+
+    @swagger_auto_schema(
+        operation_description="Descarga una foto (fotos_reportes/, fotos_postes/, telematicos/fotos/, fotos_predios/) "
+                              "si el usuario tiene acceso según su rol. Soporta Range y ETag.",
+        manual_parameters=[
+            openapi.Parameter('Range', openapi.IN_HEADER, description="bytes=inicio-fin", type=openapi.TYPE_STRING, required=False),
+            openapi.Parameter('If-None-Match', openapi.IN_HEADER, description="ETag recibido antes", type=openapi.TYPE_STRING, required=False),
+            openapi.Parameter('v', openapi.IN_QUERY, description="Versión del archivo", type=openapi.TYPE_STRING, required=False),
+            openapi.Parameter('exp', openapi.IN_QUERY, description="Vencimiento de la firma (epoch)", type=openapi.TYPE_INTEGER, required=False),
+            openapi.Parameter('sig', openapi.IN_QUERY, description="Firma de la URL", type=openapi.TYPE_STRING, required=False),
+        ],
+        responses={200: "Archivo", 206: "Rango parcial", 304: "Sin cambios", 404: "No encontrado", 416: "Rango inválido"}
+    )
+    def get(self, request, ruta):
+        ruta = MediaProtegidaService.normalizar(ruta)
+        if ruta is None:
+            raise Http404
+        if not self._firmada() and not MediaProtegidaService.puede_ver(request.user, ruta):
+            raise Http404
+        response = servir_archivo(request, MediaProtegidaService.ruta_absoluta(ruta), ruta,
+                                  cache_control=self._cache_control(ruta))
+        if response is None:
+            raise Http404
+        return response
+
+
+class MediaVarianteView(MediaProtegidaView):
+    """
+    GET /api/media/variantes/<ruta>?width=&height=&fit=&format=
+    Misma autorización y caché que la foto original; la variante se genera una vez
+    y luego se sirve desde disco.
+    """
+    presupuesto_consultas = 5
+
+    @swagger_auto_schema(
+        operation_description="Versión redimensionada de una foto. Se genera en la primera petición "
+                              "y se guarda en un caché en disco con límite de tamaño (LRU).",
+        manual_parameters=[
+            openapi.Parameter('width', openapi.IN_QUERY, description="Ancho en px", type=openapi.TYPE_INTEGER, required=False),
+            openapi.Parameter('height', openapi.IN_QUERY, description="Alto en px", type=openapi.TYPE_INTEGER, required=False),
+            openapi.Parameter('fit', openapi.IN_QUERY, description="contain (por defecto) | cover | fill", type=openapi.TYPE_STRING, required=False),
+            openapi.Parameter('format', openapi.IN_QUERY, description="jpeg (por defecto) | webp | png", type=openapi.TYPE_STRING, required=False),
+            openapi.Parameter('v', openapi.IN_QUERY, description="Versión del archivo", type=openapi.TYPE_STRING, required=False),
+            openapi.Parameter('exp', openapi.IN_QUERY, description="Vencimiento de la firma (epoch)", type=openapi.TYPE_INTEGER, required=False),
+            openapi.Parameter('sig', openapi.IN_QUERY, description="Firma de la URL", type=openapi.TYPE_STRING, required=False),
+        ],
+        responses={200: "Imagen", 304: "Sin cambios", 400: "Parámetros inválidos", 404: "No encontrado",
+                   422: "El archivo no es una imagen válida"}
+    )
+    def get(self, request, ruta):
+        ruta = MediaProtegidaService.normalizar(ruta)
+        if ruta is None:
+            raise Http404
+        if not self._firmada() and not MediaProtegidaService.puede_ver(request.user, ruta):
+            raise Http404
+        try:
+            variante = Variante.desde_parametros(request.query_params)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        version = MediaProtegidaService.version(ruta)
+        if version is None:
+            raise Http404
+        try:
+            relativa = VariantesImagenService.obtener(
+                MediaProtegidaService.ruta_absoluta(ruta), ruta, version, variante)
+        except (OSError, Image.DecompressionBombError):
+            return Response({"detail": "No se pudo procesar la imagen."},
+                            status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+        absoluta = os.path.join(VariantesImagenService.directorio(), *relativa.split('/'))
+        # Para X-Accel-Redirect: MEDIA_VARIANTES_DIR vive dentro de MEDIA_ROOT
+        relativa_media = os.path.relpath(absoluta, str(settings.MEDIA_ROOT)).replace(os.sep, '/')
+        clave = os.path.basename(relativa).split('.')[0]
+        response = servir_archivo(request, absoluta, relativa_media,
+                                  cache_control=self._cache_control(ruta),
+                                  content_type=variante.content_type, etag=f'"{clave}"')
+        if response is None:
+            raise Http404
+        return response
+
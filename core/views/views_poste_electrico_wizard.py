@@ -1,4 +1,4 @@
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
@@ -21,9 +21,19 @@ from ..serializers.serializers import (
 )
 from ..services.wizard_characteristics import WizardCharacteristicsService
 from ..services.wizard_condition import WizardConditionService
+from ..services.elementos_index import ElementosIndexService
+from ..services.postes_publicados import PostePublicadoService
+from ..services.proximidad_postes import ProximidadPostesService
+from .wizard_listing import wizard_list_response, WIZARD_LIST_PARAMETERS
+from ..db import presupuesto_consultas, statement_timeout
+from ..throttling import Parte4UploadThrottle
+from ..idempotency import idempotente
+from ..uploads import validar_subidas
+from drf_yasg.utils import swagger_auto_schema
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@idempotente
 def poste_electrico_wizard_iniciar(request):
     """
     Inicia un nuevo wizard de poste eléctrico.
@@ -66,6 +76,8 @@ def poste_electrico_parte1_save(request, wizard_id):
     if serializer.is_valid():
         with transaction.atomic():
             wizard = serializer.save()
+            # Mantener el índice relacional de elementos en la misma transacción
+            ElementosIndexService('electrico').sincronizar(wizard)
             return Response(serializer.data, status=status.HTTP_200_OK)
 
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -169,6 +181,8 @@ def poste_electrico_parte3_save(request, wizard_id):
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@throttle_classes([Parte4UploadThrottle])
+@validar_subidas('foto_wizard')
 def poste_electrico_parte4_save(request, wizard_id):
     """
     Guarda los datos de la parte 4 del wizard de poste eléctrico.
@@ -228,6 +242,7 @@ def poste_electrico_parte4_save(request, wizard_id):
             status=status.HTTP_400_BAD_REQUEST
         )
 
+@presupuesto_consultas(20)
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def poste_electrico_wizard_publicar(request, wizard_id):
@@ -264,10 +279,17 @@ def poste_electrico_wizard_publicar(request, wizard_id):
             # 3. Cambiar estado a publicado
             wizard.estado = 'published'
             wizard.save()
+
+            # Actualizar la proyección de lectura (PostePublicado) en la misma transacción
+            publicado = PostePublicadoService('electrico').proyectar(wizard.id)
             
-            # 4. Retornar datos actualizados
+            # 4. Retornar datos actualizados, con los postes que podrían ser el mismo (no bloquea)
             serializer = PosteElectricoWizardSerializer(wizard)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            data = dict(serializer.data)
+            data['posibles_duplicados'] = (
+                ProximidadPostesService.posibles_duplicados(publicado) if publicado else []
+            )
+            return Response(data, status=status.HTTP_200_OK)
             
     except Exception as e:
         return Response(
@@ -275,16 +297,20 @@ def poste_electrico_wizard_publicar(request, wizard_id):
             status=status.HTTP_400_BAD_REQUEST
         )
 
+@swagger_auto_schema(
+    method='get',
+    operation_description="Lista de los wizards de poste eléctrico del usuario autenticado (paginada con page/page_size, delta con since).",
+    manual_parameters=WIZARD_LIST_PARAMETERS,
+)
+@presupuesto_consultas('lectura')
+@statement_timeout('lectura')
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def poste_electrico_wizard_list(request):
     """
-    Lista todos los wizards de poste eléctrico del usuario autenticado.
+    Lista los wizards de poste eléctrico del usuario autenticado (lista plana, o paginada con page/page_size).
     Incluye tanto los que están en borrador como los publicados.
+    Filtros: estado, fecha_desde/fecha_hasta; modo delta con since/since_id.
     """
-    registros = (PosteElectricoWizard.objects
-                .filter(encargado=request.user)
-                .order_by('-actualizado_en'))
-                
-    serializer = PosteElectricoWizardSerializer(registros, many=True)
-    return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+    registros = PosteElectricoWizard.objects.filter(encargado=request.user)
+    return wizard_list_response(request, registros, PosteElectricoWizardSerializer)
\ No newline at end of file
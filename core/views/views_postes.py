@@ -13,6 +13,7 @@ from ..serializers.serializers import (
     PosteDetalleElectricoSerializer, PredioDetalleSerializer,
     PosteFotoCreateSerializer
 )
+from ..uploads import validar_subidas
 
 class PosteReporteCreateView(CreateAPIView):
     permission_classes = [IsAuthenticated]
@@ -76,6 +77,10 @@ class PosteFotoCreateView(CreateAPIView):
     serializer_class = PosteFotoCreateSerializer
     queryset = FotoReporte.objects.all()
 
+    @validar_subidas('foto')
+    def post(self, request, *args, **kwargs):
+        return super().post(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         reporte_id = self.kwargs["pk"]
         reporte = get_object_or_404(Reporte, pk=reporte_id)
@@ -84,5 +89,7 @@ class PosteFotoCreateView(CreateAPIView):
 
 class PosteReporteRetrieveView(RetrieveAPIView):
     permission_classes = [IsAuthenticated]
+    # Reporte + detalle + catálogos + fotos: un aumento indica búsquedas por fila en el serializer
+    presupuesto_consultas = 8
     serializer_class = PosteReporteDetailSerializer
     queryset = Reporte.objects.select_related("encargado","sector").prefetch_related("fotos")
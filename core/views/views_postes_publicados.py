@@ -0,0 +1,155 @@
+"""
+Listado de postes publicados sobre la proyección PostePublicado.
+Pensado para listas, mapas y exportaciones: filtra y pagina sobre una sola tabla indexada.
+También expone los k postes más cercanos a un punto (grilla de ProximidadPostesService).
+"""
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+
+from ..models.models_publicados import PostePublicado
+from ..serializers.serializers_publicados import PostePublicadoSerializer
+from ..services.proximidad_postes import ProximidadPostesService
+from ..db import presupuesto_consultas, statement_timeout
+from ..pagination import paginate
+
+
+def _scope_por_rol(qs, user):
+    """Mismas reglas de visibilidad que PredioReporteListView."""
+    rol = getattr(user, 'rol', None)
+    if rol == 'admin' and getattr(user, 'empresa_id', None):
+        return qs.filter(empresa_id=user.empresa_id)
+    if rol == 'supervisor':
+        return qs.filter(encargado__supervisor_id=user.id)
+    if rol == 'encargado':
+        return qs.filter(encargado_id=user.id)
+    return qs
+
+
+def _decimal(raw):
+    try:
+        return Decimal(str(raw).strip())
+    except (InvalidOperation, ValueError):
+        raise ValueError(raw)
+
+
+@swagger_auto_schema(
+    method='get',
+    operation_description="Lista postes publicados (eléctricos y telemáticos) desde la proyección desnormalizada.",
+    manual_parameters=[
+        openapi.Parameter('tipo_poste', openapi.IN_QUERY, description="electrico | telematico", type=openapi.TYPE_STRING, required=False),
+        openapi.Parameter('codigo', openapi.IN_QUERY, description="Código exacto del poste", type=openapi.TYPE_STRING, required=False),
+        openapi.Parameter('q', openapi.IN_QUERY, description="Prefijo del código del poste", type=openapi.TYPE_STRING, required=False),
+        openapi.Parameter('encargado_id', openapi.IN_QUERY, description="ID del encargado", type=openapi.TYPE_INTEGER, required=False),
+        openapi.Parameter('fecha_desde', openapi.IN_QUERY, description="Publicado desde (ISO: yyyy-mm-dd)", type=openapi.TYPE_STRING, required=False),
+        openapi.Parameter('fecha_hasta', openapi.IN_QUERY, description="Publicado hasta (ISO: yyyy-mm-dd)", type=openapi.TYPE_STRING, required=False),
+        openapi.Parameter('bbox', openapi.IN_QUERY, description="Recuadro para mapas: lat_min,lon_min,lat_max,lon_max", type=openapi.TYPE_STRING, required=False),
+        openapi.Parameter('page', openapi.IN_QUERY, description="Número de página", type=openapi.TYPE_INTEGER, required=False),
+        openapi.Parameter('page_size', openapi.IN_QUERY, description="Cantidad de elementos por página (máx. 500)", type=openapi.TYPE_INTEGER, required=False),
+    ],
+    responses={200: PostePublicadoSerializer(many=True), 400: "Parámetros inválidos"}
+)
+@presupuesto_consultas('lectura')
+@statement_timeout('lectura')
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def postes_publicados_list(request):
+    """
+    Lista paginada de postes publicados con filtros por tipo, código, encargado,
+    rango de fechas de publicación y recuadro geográfico (bbox).
+    """
+    params = request.query_params
+    qs = _scope_por_rol(PostePublicado.objects.all(), request.user)
+
+    tipo_poste = params.get('tipo_poste')
+    if tipo_poste:
+        qs = qs.filter(tipo_poste=tipo_poste)
+
+    codigo = params.get('codigo')
+    if codigo:
+        qs = qs.filter(codigo=codigo)
+    q = params.get('q')
+    if q:
+        qs = qs.filter(codigo__startswith=q.strip())
+
+    encargado_id = params.get('encargado_id')
+    if encargado_id:
+        qs = qs.filter(encargado_id=encargado_id)
+
+    try:
+        f_desde = params.get('fecha_desde')
+        if f_desde:
+            qs = qs.filter(publicado_en__gte=datetime.fromisoformat(f_desde.strip()))
+        f_hasta = params.get('fecha_hasta')
+        if f_hasta:
+            d2 = datetime.fromisoformat(f_hasta.strip())
+            qs = qs.filter(publicado_en__lte=d2.replace(hour=23, minute=59, second=59, microsecond=999999))
+    except ValueError:
+        return Response({"detail": "Fechas inválidas (ISO: yyyy-mm-dd)."}, status=status.HTTP_400_BAD_REQUEST)
+
+    bbox = params.get('bbox')
+    if bbox:
+        try:
+            lat_min, lon_min, lat_max, lon_max = (_decimal(v) for v in bbox.split(','))
+        except ValueError:
+            return Response({"detail": "bbox debe ser lat_min,lon_min,lat_max,lon_max"}, status=status.HTTP_400_BAD_REQUEST)
+        qs = qs.filter(latitud__range=(lat_min, lat_max), longitud__range=(lon_min, lon_max))
+
+    pagina, meta = paginate(request, qs.order_by('-publicado_en'), max_page_size=500)
+    serializer = PostePublicadoSerializer(pagina, many=True, context={'request': request})
+    return Response({**meta, 'results': serializer.data}, status=status.HTTP_200_OK)
+
+
+K_MAXIMO = 100
+RADIO_MAXIMO_M = 50000
+
+
+@swagger_auto_schema(
+    method='get',
+    operation_description="Devuelve los k postes publicados más cercanos a un punto, con su distancia en metros.",
+    manual_parameters=[
+        openapi.Parameter('lat', openapi.IN_QUERY, description="Latitud del punto", type=openapi.TYPE_NUMBER, required=True),
+        openapi.Parameter('lon', openapi.IN_QUERY, description="Longitud del punto", type=openapi.TYPE_NUMBER, required=True),
+        openapi.Parameter('k', openapi.IN_QUERY, description=f"Cantidad de postes (por defecto 10, máx. {K_MAXIMO})", type=openapi.TYPE_INTEGER, required=False),
+        openapi.Parameter('radio', openapi.IN_QUERY, description=f"Distancia máxima en metros (por defecto 2000, máx. {RADIO_MAXIMO_M})", type=openapi.TYPE_NUMBER, required=False),
+        openapi.Parameter('tipo_poste', openapi.IN_QUERY, description="electrico | telematico", type=openapi.TYPE_STRING, required=False),
+    ],
+    responses={200: "Postes ordenados por distancia (campo distancia_m)", 400: "Parámetros inválidos"}
+)
+@presupuesto_consultas('lectura')
+@statement_timeout('lectura')
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def postes_cercanos(request):
+    """
+    k postes más cercanos a (lat, lon) dentro de `radio` metros, visibles para el usuario.
+    """
+    params = request.query_params
+    try:
+        lat = float(params['lat'])
+        lon = float(params['lon'])
+        k = min(K_MAXIMO, max(1, int(params.get('k', 10))))
+        radio = min(RADIO_MAXIMO_M, max(1.0, float(params.get('radio', 2000))))
+    except (KeyError, ValueError):
+        return Response({"detail": "lat y lon son requeridos; k y radio deben ser numéricos."}, status=status.HTTP_400_BAD_REQUEST)
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return Response({"detail": "Coordenadas fuera de rango."}, status=status.HTTP_400_BAD_REQUEST)
+
+    qs = _scope_por_rol(PostePublicado.objects.all(), request.user)
+    tipo_poste = params.get('tipo_poste')
+    if tipo_poste:
+        qs = qs.filter(tipo_poste=tipo_poste)
+
+    cercanos = ProximidadPostesService.k_cercanos(lat, lon, k, radio, qs)
+    filas = PostePublicado.objects.in_bulk([pk for _, pk in cercanos])
+    results = []
+    for distancia, pk in cercanos:
+        item = PostePublicadoSerializer(filas[pk], context={'request': request}).data
+        item['distancia_m'] = round(distancia, 1)
+        results.append(item)
+    return Response({'results': results}, status=status.HTTP_200_OK)
@@ -1,3 +1,4 @@
+from django.db import IntegrityError
 from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
@@ -20,6 +21,10 @@ from rest_framework.response import Response
 
 from ..models.models import Reporte, DetallePredio
 from ..serializers.serializers import DetallePredioAvanzadoSerializer
+from ..throttling import FotoReporteThrottle
+from ..idempotency import idempotente
+from ..services.archivo_frio import ArchivoFrioService
+from ..uploads import validar_subidas
 
 class DetallePredioAvanzadoUpsertView(APIView):
     permission_classes = [IsAuthenticated]
@@ -70,6 +75,7 @@ class ReporteCreateView(APIView):
             400: "Errores de validación"
         }
     )
+    @idempotente
     def post(self, request):
         ser = ReporteCreateSerializer(data=request.data, context={"request": request})
         ser.is_valid(raise_exception=True)
@@ -118,6 +124,7 @@ class DetallePredioUpsertView(APIView):
 class FotoReporteUploadView(APIView):
     permission_classes = [IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser]
+    throttle_classes = [FotoReporteThrottle]
 
     @swagger_auto_schema(
         operation_description="Sube fotos asociadas a un reporte utilizando multipart/form-data.",
@@ -140,9 +147,13 @@ class FotoReporteUploadView(APIView):
                     }
                 }
             ),
-            400: "Errores de validación"
+            400: "Errores de validación",
+            413: "Imagen demasiado grande",
+            415: "Formato de imagen no permitido",
+            429: "Demasiadas subidas (ver cabecera Retry-After)"
         }
     )
+    @validar_subidas('foto')
     def post(self, request, reporte_id: int):
         get_object_or_404(Reporte, pk=reporte_id)
         data = request.data.copy()
@@ -156,6 +167,7 @@ class FotoReporteUploadView(APIView):
 # 4) Obtener todo el reporte con detalle + fotos (para pintar el modal)
 class ReporteDetailView(APIView):
     permission_classes = [IsAuthenticated]
+    presupuesto_consultas = 8
 
     @swagger_auto_schema(
         operation_description="Obtiene el detalle completo de un reporte, incluyendo fotos.",
@@ -183,15 +195,27 @@ class ReporteDetailView(APIView):
                     }
                 }
             ),
-            404: "Reporte no encontrado"
+            404: "Reporte no encontrado",
+            409: "Reporte archivado que no se pudo rehidratar",
         }
     )
     def get(self, request, reporte_id: int):
-        reporte = (
+        qs = (
             Reporte.objects
             .select_related("encargado", "sector")
             .prefetch_related("fotos")
-            .get(pk=reporte_id)
         )
+        reporte = qs.filter(pk=reporte_id).first()
+        if reporte is None:
+            # Reportes antiguos pueden estar en el archivo frío: se devuelven a la tabla
+            registro = ArchivoFrioService.buscar("reporte", reporte_id)
+            if registro is None or not ArchivoFrioService.puede_rehidratar(request.user, registro):
+                return Response({"detail": "Reporte no encontrado."}, status=status.HTTP_404_NOT_FOUND)
+            try:
+                ArchivoFrioService.rehidratar("reporte", reporte_id)
+            except IntegrityError:
+                return Response({"detail": "El reporte está archivado y no se pudo restaurar."},
+                                status=status.HTTP_409_CONFLICT)
+            reporte = get_object_or_404(qs, pk=reporte_id)
         ser = ReporteDetalleViewSerializer(reporte, context={"request": request})
         return Response(ser.data)
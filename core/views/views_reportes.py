@@ -24,6 +24,8 @@ from rest_framework import status
 
 from ..models.models import Reporte
 from ..serializers.serializers import PosteReporteDetailSerializer
+from ..services.media_protegida import MediaProtegidaService
+from ..uploads import validar_subidas
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 
@@ -31,6 +33,7 @@ def make_absolute_media_url(request, relative_path):
     """
     Devuelve una URL absoluta a partir de una ruta de media.
     Tolera que request no tenga build_absolute_uri (tests, wrappers).
+    Las fotos protegidas salen versionadas y firmadas (MediaProtegidaService.url).
     
     Args:
         request: Request object
@@ -41,6 +44,9 @@ def make_absolute_media_url(request, relative_path):
     """
     if not relative_path:
         return None
+    nombre = MediaProtegidaService.nombre_desde_url(relative_path)
+    if nombre:
+        return MediaProtegidaService.url(request, nombre)
     build_abs = getattr(request, "build_absolute_uri", None)
     if callable(build_abs):
         return build_abs(relative_path)
@@ -59,6 +65,7 @@ class ReporteCompletarView(APIView):
     permission_classes = [IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser, JSONParser]
 
+    @validar_subidas('foto')
     @transaction.atomic
     def post(self, request, reporte_id: int):
         # 1) Cargar reporte
@@ -176,6 +183,8 @@ class PredioReporteListView(APIView):
       - page_size: Cantidad de elementos por página (opcional, por defecto 10).
     """
     permission_classes = [IsAuthenticated]
+    statement_timeout = 'lectura'
+    presupuesto_consultas = 'lectura'
 
     @swagger_auto_schema(
         operation_description="Lista reportes tipo 'predio' con filtros y paginación.\n\nReglas de visibilidad:\n  - superadmin: ve todo\n  - admin: ve su empresa (a través de proyecto->empresa)\n  - supervisor: ve reportes de sus encargados\n  - encargado: solo sus reportes\n\nPaginación:\n  - page: Número de página (opcional, por defecto 1).\n  - page_size: Cantidad de elementos por página (opcional, por defecto 10).",
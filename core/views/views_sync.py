@@ -0,0 +1,59 @@
+"""
+Change-feed para la sincronización offline de la app móvil.
+El cliente guarda `last_seq` y en la siguiente conexión pide solo lo posterior.
+"""
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+
+from ..db import presupuesto_consultas, statement_timeout
+from ..services.sync_feed import SyncFeedService
+
+
+@swagger_auto_schema(
+    method='get',
+    operation_description=(
+        "Devuelve los cambios (altas/modificaciones/bajas) posteriores a `after` en catálogos, "
+        "Distrito/Zona/Sector y en los wizards y reportes propios del usuario. "
+        "Repetir con after=last_seq mientras has_more sea true. "
+        "Los cambios de los últimos segundos (SYNC_MARGEN_SEGUNDOS) llegan en la siguiente consulta."
+    ),
+    manual_parameters=[
+        openapi.Parameter('after', openapi.IN_QUERY, description="Último seq recibido (0 para la carga inicial)", type=openapi.TYPE_INTEGER, required=False),
+        openapi.Parameter('limit', openapi.IN_QUERY, description=f"Máximo de cambios por lote (por defecto {SyncFeedService.DEFAULT_LIMIT}, máx. {SyncFeedService.MAX_LIMIT})", type=openapi.TYPE_INTEGER, required=False),
+    ],
+    responses={
+        200: openapi.Response(
+            description="Lote de cambios",
+            examples={
+                "application/json": {
+                    "after": 120,
+                    "last_seq": 135,
+                    "has_more": False,
+                    "changes": {
+                        "sector": {"upserts": [{"id": 4, "nombre": "Sector 4", "zona_id": 2}], "deletes": []},
+                        "poste_electrico_wizard": {"upserts": [], "deletes": ["17"]}
+                    }
+                }
+            }
+        ),
+        400: "Parámetros inválidos"
+    }
+)
+# Una consulta por entidad sincronizada, más la del log
+@presupuesto_consultas(30)
+@statement_timeout('lectura')
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def sync_cambios(request):
+    try:
+        after = max(0, int(request.query_params.get('after', 0)))
+        limit = int(request.query_params.get('limit', SyncFeedService.DEFAULT_LIMIT))
+    except ValueError:
+        return Response({"detail": "after y limit deben ser enteros"}, status=status.HTTP_400_BAD_REQUEST)
+    limit = min(SyncFeedService.MAX_LIMIT, max(1, limit))
+
+    return Response(SyncFeedService.cambios_para(request.user, after, limit), status=status.HTTP_200_OK)
@@ -1,4 +1,4 @@
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
@@ -21,27 +21,41 @@ from ..serializers.serializers_telematico import (
 )
 from ..services.wizard_characteristics import WizardCharacteristicsService
 from ..services.wizard_condition import WizardConditionService
+from ..services.elementos_index import ElementosIndexService
+from ..services.postes_publicados import PostePublicadoService
+from ..services.proximidad_postes import ProximidadPostesService
+from .wizard_listing import wizard_list_response, WIZARD_LIST_PARAMETERS
+from ..db import presupuesto_consultas, statement_timeout
+from ..throttling import Parte4UploadThrottle
+from ..idempotency import idempotente
+from ..uploads import validar_subidas
+from drf_yasg.utils import swagger_auto_schema
 
+@swagger_auto_schema(
+    method='get',
+    operation_description="Lista de los wizards de poste telemático del usuario autenticado (paginada con page/page_size, delta con since).",
+    manual_parameters=WIZARD_LIST_PARAMETERS,
+)
+@presupuesto_consultas('lectura')
+@statement_timeout('lectura')
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def telematico_wizard_list(request):
     """
-    Lista todos los wizards de poste telemático del usuario autenticado.
+    Lista los wizards de poste telemático del usuario autenticado (lista plana, o paginada con page/page_size).
     Incluye tanto los que están en borrador como los publicados.
     
     Returns:
-        Lista de wizards ordenados por fecha de actualización (más recientes primero)
+        Wizards ordenados por fecha de actualización (más recientes primero),
+        o en modo delta (?since=) los cambios posteriores en orden ascendente y los ids borrados
         Cada wizard incluye su estado actual y timestamps
     """
-    registros = (PosteTelematicWizard.objects
-                .filter(encargado=request.user)
-                .order_by('-actualizado_en'))
-                
-    serializer = PosteTelematicWizardSerializer(registros, many=True)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    registros = PosteTelematicWizard.objects.filter(encargado=request.user)
+    return wizard_list_response(request, registros, PosteTelematicWizardSerializer)
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@idempotente
 def telematico_wizard_iniciar(request):
     """
     Inicia un nuevo wizard de poste telemático.
@@ -85,6 +99,8 @@ def telematico_parte1_save(request, wizard_id):
     if serializer.is_valid():
         with transaction.atomic():
             wizard = serializer.save()
+            # Mantener el índice relacional de elementos en la misma transacción
+            ElementosIndexService('telematico').sincronizar(wizard)
             return Response(serializer.data, status=status.HTTP_200_OK)
 
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -136,6 +152,8 @@ def telematico_parte2_save(request, wizard_id):
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@throttle_classes([Parte4UploadThrottle])
+@validar_subidas('foto_wizard')
 def telematico_parte4_save(request, wizard_id):
     """
     Guarda los datos de la parte 4 del wizard telemático.
@@ -195,6 +213,7 @@ def telematico_parte4_save(request, wizard_id):
             status=status.HTTP_400_BAD_REQUEST
         )
 
+@presupuesto_consultas(20)
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def telematico_wizard_publicar(request, wizard_id):
@@ -231,10 +250,17 @@ def telematico_wizard_publicar(request, wizard_id):
             # 3. Cambiar estado a publicado
             wizard.estado = 'published'
             wizard.save()
+
+            # Actualizar la proyección de lectura (PostePublicado) en la misma transacción
+            publicado = PostePublicadoService('telematico').proyectar(wizard.id)
             
-            # 4. Retornar datos actualizados
+            # 4. Retornar datos actualizados, con los postes que podrían ser el mismo (no bloquea)
             serializer = PosteTelematicWizardSerializer(wizard)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            data = dict(serializer.data)
+            data['posibles_duplicados'] = (
+                ProximidadPostesService.posibles_duplicados(publicado) if publicado else []
+            )
+            return Response(data, status=status.HTTP_200_OK)
             
     except Exception as e:
         return Response(
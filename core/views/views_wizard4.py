@@ -12,10 +12,12 @@ from core.models.models import (
     FotoPosteWizard
 )
 from core.serializers.serializers_poste_wizard import PosteWizardParte4Serializer
+from core.uploads import validar_subidas
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 @parser_classes([MultiPartParser, FormParser])
+@validar_subidas('foto_wizard')
 def poste_wizard4_save(request):
     """
     Parte 4 del Wizard de Poste Eléctrico.
@@ -0,0 +1,117 @@
+"""
+Listado compartido de wizards de poste (eléctrico y telemático).
+Soporta paginación page/page_size, filtros por estado y fechas, y un modo delta
+(`since`) para que la app móvil solo descargue lo que cambió desde su última sincronización.
+Sin page/page_size/since responde la lista plana de siempre, para los clientes existentes.
+"""
+from datetime import datetime, time
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.response import Response
+from drf_yasg import openapi
+
+from ..models.models_sync import CambioSync
+from ..pagination import paginate, parse_page_params
+from ..services.sync_feed import SyncFeedService
+
+ESTADOS_WIZARD = ('draft', 'published')
+
+WIZARD_LIST_PARAMETERS = [
+    openapi.Parameter('estado', openapi.IN_QUERY, description="draft | published", type=openapi.TYPE_STRING, required=False),
+    openapi.Parameter('fecha_desde', openapi.IN_QUERY, description="Actualizado desde (ISO: yyyy-mm-dd)", type=openapi.TYPE_STRING, required=False),
+    openapi.Parameter('fecha_hasta', openapi.IN_QUERY, description="Actualizado hasta (ISO: yyyy-mm-dd)", type=openapi.TYPE_STRING, required=False),
+    openapi.Parameter('since', openapi.IN_QUERY, description="Modo delta: solo wizards con actualizado_en posterior (ISO datetime, usar next_since)", type=openapi.TYPE_STRING, required=False),
+    openapi.Parameter('since_id', openapi.IN_QUERY, description="Desempate del modo delta (usar next_since_id)", type=openapi.TYPE_INTEGER, required=False),
+    openapi.Parameter('page', openapi.IN_QUERY, description="Número de página (ignorado en modo delta). Sin page/page_size/since se devuelve la lista completa sin paginar", type=openapi.TYPE_INTEGER, required=False),
+    openapi.Parameter('page_size', openapi.IN_QUERY, description="Cantidad de elementos por página", type=openapi.TYPE_INTEGER, required=False),
+]
+
+
+def _eliminados(request, model, desde, hasta=None):
+    """
+    Ids de wizards del usuario borrados (o archivados) desde `desde`, según las
+    bajas del change-feed (CambioSync). Pueden repetirse entre páginas: el cliente
+    los aplica de forma idempotente.
+    """
+    entidad = SyncFeedService.entidad_de(model)
+    if entidad is None:
+        return []
+    qs = CambioSync.objects.filter(usuario_id=request.user.id, entidad=entidad,
+                                   operacion='delete', creado_en__gt=desde)
+    if hasta is not None:
+        qs = qs.filter(creado_en__lte=hasta)
+    return [model._meta.pk.to_python(pk) for pk in qs.values_list('objeto_id', flat=True).distinct()]
+
+
+def _parse_fecha(raw, fin_de_dia=False):
+    """Acepta yyyy-mm-dd o un datetime ISO completo; devuelve un datetime aware."""
+    raw = raw.strip()
+    dt = parse_datetime(raw)
+    if dt is None:
+        d = datetime.fromisoformat(raw).date()
+        dt = datetime.combine(d, time.max if fin_de_dia else time.min)
+    if timezone.is_naive(dt):
+        dt = timezone.make_aware(dt, timezone.get_default_timezone())
+    return dt
+
+
+def wizard_list_response(request, queryset, serializer_class):
+    """
+    Aplica filtros y paginación a `queryset` (ya acotado al encargado) y arma la respuesta.
+
+    Sin page/page_size/since: lista plana (la respuesta original), orden -actualizado_en.
+    Paginado: {"count", "page", "page_size", "results", "server_time"}, orden -actualizado_en.
+    Modo delta (?since=): {"results", "deleted", "has_more", "next_since", "next_since_id", "server_time"},
+    orden ascendente por (actualizado_en, id) para poder continuar desde el último recibido;
+    `deleted` son los ids borrados en el mismo tramo.
+    """
+    params = request.query_params
+    qs = queryset
+    server_time = timezone.now()
+
+    estado = params.get('estado')
+    if estado:
+        if estado not in ESTADOS_WIZARD:
+            return Response({"detail": "estado debe ser 'draft' o 'published'."}, status=status.HTTP_400_BAD_REQUEST)
+        qs = qs.filter(estado=estado)
+
+    try:
+        if params.get('fecha_desde'):
+            qs = qs.filter(actualizado_en__gte=_parse_fecha(params['fecha_desde']))
+        if params.get('fecha_hasta'):
+            qs = qs.filter(actualizado_en__lte=_parse_fecha(params['fecha_hasta'], fin_de_dia=True))
+        since = _parse_fecha(params['since']) if params.get('since') else None
+        since_id = int(params.get('since_id') or 0)
+    except ValueError:
+        return Response({"detail": "Fechas inválidas (ISO: yyyy-mm-dd o datetime ISO)."}, status=status.HTTP_400_BAD_REQUEST)
+
+    if since is None and 'page' not in params and 'page_size' not in params:
+        serializer = serializer_class(qs.order_by('-actualizado_en', '-id'), many=True, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    if since is None:
+        pagina, meta = paginate(request, qs.order_by('-actualizado_en', '-id'))
+        serializer = serializer_class(pagina, many=True, context={'request': request})
+        return Response({**meta, 'results': serializer.data, 'server_time': server_time}, status=status.HTTP_200_OK)
+
+    # Modo delta: keyset por (actualizado_en, id), sin OFFSET
+    _, page_size = parse_page_params(request)
+    qs = qs.filter(Q(actualizado_en__gt=since) | Q(actualizado_en=since, id__gt=since_id))
+    filas = list(qs.order_by('actualizado_en', 'id')[:page_size + 1])
+    has_more = len(filas) > page_size
+    filas = filas[:page_size]
+
+    ultimo = filas[-1] if filas else None
+    serializer = serializer_class(filas, many=True, context={'request': request})
+    # Con más páginas pendientes, las bajas se acotan al tramo entregado
+    eliminados = _eliminados(request, queryset.model, since, ultimo.actualizado_en if has_more else None)
+    return Response({
+        'results': serializer.data,
+        'deleted': eliminados,
+        'has_more': has_more,
+        'next_since': ultimo.actualizado_en if ultimo else since,
+        'next_since_id': ultimo.id if ultimo else since_id,
+        'server_time': server_time,
+    }, status=status.HTTP_200_OK)
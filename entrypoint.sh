@@ -5,5 +5,6 @@ set -e
 # sleep 3
 
 python manage.py migrate --noinput
+python manage.py generar_openapi
 python manage.py seed_users --password "miPassSeguro123" --empresa "MiEmpresa"
 python manage.py runserver 0.0.0.0:8000
@@ -0,0 +1,156 @@
+"""
+Esquema OpenAPI precalculado.
+
+`manage.py generar_openapi` construye el esquema una sola vez (en el despliegue)
+y lo escribe en OPENAPI_SCHEMA_DIR como artefactos versionados por hash:
+
+    openapi-<version>.json
+    openapi-<version>.yaml
+    manifest.json   -> {"version", "generado_en", "json", "yaml"}
+
+Las vistas de este módulo sirven esos archivos con ETag y Cache-Control, sin
+introspección. Si todavía no se generó el artefacto (p. ej. en desarrollo) se
+cae al esquema dinámico de drf-yasg.
+"""
+import functools
+import hashlib
+import json
+import os
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_GET
+from drf_yasg import openapi
+from rest_framework import permissions
+
+from core.lazy import lazy_import
+from core.media import coincide_etag
+
+# Solo los usa `generar_openapi`: los workers que sirven el artefacto no los cargan
+codecs = lazy_import('drf_yasg.codecs')
+generators = lazy_import('drf_yasg.generators')
+
+API_INFO = openapi.Info(
+    title="VOT System API",
+    default_version='v1',
+    description="Documentación de la API para el sistema VOT",
+    terms_of_service="https://www.google.com/policies/terms/",
+    contact=openapi.Contact(email="contacto@votsystem.com"),
+    license=openapi.License(name="BSD License"),
+)
+
+CONTENT_TYPES = {
+    'json': 'application/json',
+    'yaml': 'application/yaml',
+}
+
+# Caché por proceso: (mtime del manifest, manifest, {formato: bytes})
+_cache = {'mtime': None, 'manifest': None, 'contenidos': {}}
+
+
+def directorio():
+    return getattr(settings, 'OPENAPI_SCHEMA_DIR', os.path.join(settings.BASE_DIR, 'openapi'))
+
+
+def generar(destino=None):
+    """
+    Construye el esquema completo por introspección y escribe los artefactos.
+
+    Returns:
+        El manifest escrito
+    """
+    destino = destino or directorio()
+    os.makedirs(destino, exist_ok=True)
+
+    schema = generators.OpenAPISchemaGenerator(info=API_INFO).get_schema(request=None, public=True)
+    cuerpo_json = codecs.OpenAPICodecJson(validators=[]).encode(schema)
+    cuerpo_yaml = codecs.OpenAPICodecYaml(validators=[]).encode(schema)
+    version = hashlib.sha256(cuerpo_json).hexdigest()[:16]
+
+    manifest = {
+        'version': version,
+        'generado_en': timezone.now().isoformat(),
+        'json': f'openapi-{version}.json',
+        'yaml': f'openapi-{version}.yaml',
+    }
+    for nombre, cuerpo in ((manifest['json'], cuerpo_json), (manifest['yaml'], cuerpo_yaml)):
+        with open(os.path.join(destino, nombre), 'wb') as fh:
+            fh.write(cuerpo)
+
+    # El manifest se reemplaza de forma atómica: los workers nunca leen uno a medias
+    tmp = os.path.join(destino, 'manifest.json.tmp')
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        json.dump(manifest, fh)
+    os.replace(tmp, os.path.join(destino, 'manifest.json'))
+    return manifest
+
+
+def _cargar(formato):
+    """Devuelve (manifest, bytes) del artefacto vigente o (None, None) si no existe."""
+    ruta_manifest = os.path.join(directorio(), 'manifest.json')
+    try:
+        mtime = os.path.getmtime(ruta_manifest)
+    except OSError:
+        return None, None
+
+    if _cache['mtime'] != mtime:
+        with open(ruta_manifest, encoding='utf-8') as fh:
+            _cache.update(mtime=mtime, manifest=json.load(fh), contenidos={})
+
+    manifest = _cache['manifest']
+    if formato not in _cache['contenidos']:
+        try:
+            with open(os.path.join(directorio(), manifest[formato]), 'rb') as fh:
+                _cache['contenidos'][formato] = fh.read()
+        except (OSError, KeyError):
+            return None, None
+    return manifest, _cache['contenidos'][formato]
+
+
+@functools.lru_cache(maxsize=None)
+def schema_view():
+    """Vista dinámica de drf-yasg; se importa y construye recién en el primer uso."""
+    from drf_yasg.views import get_schema_view
+    return get_schema_view(
+        API_INFO,
+        public=True,
+        permission_classes=(permissions.AllowAny,),
+    )
+
+
+def vista_diferida(fabrica):
+    """Envuelve una vista que se construye con `fabrica()` la primera vez que se pide."""
+    construir = functools.lru_cache(maxsize=None)(fabrica)
+
+    def vista(request, *args, **kwargs):
+        return construir()(request, *args, **kwargs)
+    return vista
+
+
+def schema_estatico(formato='json'):
+    """
+    Crea la vista que sirve el artefacto `formato`; la introspección de
+    drf-yasg se usa solo si aún no se ejecutó `generar_openapi`.
+    """
+    fallback_view = vista_diferida(lambda: schema_view().without_ui(cache_timeout=0))
+    max_age = getattr(settings, 'OPENAPI_CACHE_MAX_AGE', 3600)
+
+    @require_GET
+    def vista(request, *args, **kwargs):
+        manifest, cuerpo = _cargar(formato)
+        if cuerpo is None:
+            return fallback_view(request, *args, format=f'.{formato}', **kwargs)
+
+        etag = f'"{manifest["version"]}"'
+        if coincide_etag(request.META.get('HTTP_IF_NONE_MATCH', ''), etag):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(cuerpo, content_type=CONTENT_TYPES[formato])
+        response['ETag'] = etag
+        response['X-Schema-Version'] = manifest['version']
+        patch_cache_control(response, public=True, max_age=max_age)
+        return response
+
+    return vista
@@ -32,6 +32,48 @@ ALLOWED_HOSTS = os.getenv("ALLOWED_HOSTS", "10.105.78.26").split(",")
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+# Envío de fotos autorizadas (core/media.py): '' = Django, 'x-accel' = nginx, 'x-sendfile' = Apache
+MEDIA_OFFLOAD = os.getenv("MEDIA_OFFLOAD", "")
+# location `internal` de nginx que apunta a MEDIA_ROOT (solo con MEDIA_OFFLOAD=x-accel)
+MEDIA_ACCEL_PREFIX = os.getenv("MEDIA_ACCEL_PREFIX", "/media-protegida/")
+# URLs de fotos versionadas (immutable) y firmadas con vencimiento; ver MediaProtegidaService.url
+MEDIA_FIRMAR_URLS = os.getenv("MEDIA_FIRMAR_URLS", "True") == "True"
+MEDIA_FIRMA_TTL_SEGUNDOS = int(os.getenv("MEDIA_FIRMA_TTL_SEGUNDOS", str(7 * 24 * 3600)))
+MEDIA_FIRMA_VENTANA_SEGUNDOS = 24 * 3600
+MEDIA_CACHE_MAX_AGE = 365 * 24 * 3600
+# Variantes redimensionadas (core/services/variantes_imagen.py). Dentro de MEDIA_ROOT
+# para que X-Accel-Redirect las alcance con la misma location de nginx.
+MEDIA_VARIANTES_DIR = MEDIA_ROOT / ".variantes"
+MEDIA_VARIANTES_MAX_BYTES = int(os.getenv("MEDIA_VARIANTES_MAX_MB", "512")) * 1024 * 1024
+MEDIA_VARIANTE_MAX_LADO = 2048
+MEDIA_VARIANTE_CALIDAD = 82
+
+# Subidas (core/uploads.py): LimiteSubidaHandler filtra por bytes y cabecera mientras
+# se recibe; lo demás pasa a memoria hasta FILE_UPLOAD_MAX_MEMORY_SIZE o a disco.
+FILE_UPLOAD_HANDLERS = [
+    'core.uploads.LimiteSubidaHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+FILE_UPLOAD_MAX_MEMORY_SIZE = int(os.getenv("FILE_UPLOAD_MAX_MEMORY_KB", "512")) * 1024
+# Perfiles por vista (@validar_subidas); cada uno hereda de 'default'
+UPLOADS_PERFILES = {
+    'default': {'max_bytes': int(os.getenv("UPLOADS_MAX_MB", "20")) * 1024 * 1024},
+    'foto': {
+        'max_bytes': 12 * 1024 * 1024,
+        'max_pixeles': 25_000_000,
+        'max_lado': 8192,
+        'formatos': ('JPEG', 'PNG', 'WEBP'),
+    },
+    # Partes 4 de los wizards: hasta 6 fotos en una sola petición
+    'foto_wizard': {
+        'max_bytes': 8 * 1024 * 1024,
+        'max_pixeles': 16_000_000,
+        'max_lado': 6000,
+        'formatos': ('JPEG', 'PNG', 'WEBP'),
+        'max_archivos': 6,
+    },
+}
 # Application definition
 
 INSTALLED_APPS = [
@@ -49,8 +91,60 @@ INSTALLED_APPS = [
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+    ),
+    # orjson si está instalado; si no, mismo comportamiento que los de DRF
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    # Presupuestos de core/throttling.py (se aplican por vista, no globalmente)
+    'DEFAULT_THROTTLE_RATES': {
+        'login': os.getenv("THROTTLE_LOGIN", "20/min"),
+        'login_dni': os.getenv("THROTTLE_LOGIN_DNI", "5/min"),
+        'parte4': os.getenv("THROTTLE_PARTE4", "30/min"),
+        'foto_reporte': os.getenv("THROTTLE_FOTO_REPORTE", "60/min"),
+    },
+    # Proxies delante de la app (nginx, balanceador) para tomar la IP real de X-Forwarded-For
+    'NUM_PROXIES': int(os.getenv("NUM_PROXIES")) if os.getenv("NUM_PROXIES") else None,
 }
+
+# Horas que se guarda la respuesta de un POST con Idempotency-Key (core/idempotency.py)
+IDEMPOTENCY_TTL_HORAS = int(os.getenv("IDEMPOTENCY_TTL_HORAS", "24"))
+# Segundos que una clave queda "en proceso" antes de que un reintento pueda tomarla
+IDEMPOTENCY_RESERVA_SEGUNDOS = int(os.getenv("IDEMPOTENCY_RESERVA_SEGUNDOS", "120"))
+
+# /api/sync/ solo entrega cambios con esta antigüedad: los seq menores ya confirmaron
+SYNC_MARGEN_SEGUNDOS = int(os.getenv("SYNC_MARGEN_SEGUNDOS", "5"))
+
+# Procesos para hashear contraseñas en la importación masiva de usuarios (0 = nº de CPUs)
+USUARIOS_IMPORT_WORKERS = int(os.getenv("USUARIOS_IMPORT_WORKERS", "0")) or None
+
+# Admin: a partir de cuántas filas estimadas se muestra el conteo del planificador en vez de COUNT(*)
+ADMIN_CONTEO_ESTIMADO_DESDE = int(os.getenv("ADMIN_CONTEO_ESTIMADO_DESDE", "10000"))
+
+# Proximidad de postes (core/services/proximidad_postes.py). Cambiar la celda exige
+# `manage.py reconstruir_postes_publicados`. 0.001° ≈ 111 m de latitud.
+POSTES_CELDA_GRADOS = float(os.getenv("POSTES_CELDA_GRADOS", "0.001"))
+POSTES_DUPLICADO_METROS = float(os.getenv("POSTES_DUPLICADO_METROS", "10"))
+
+# Cachés: memoria local por proceso; con REDIS_URL se comparten entre workers/instancias
+REDIS_URL = os.getenv("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': REDIS_URL},
+        'throttle': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': REDIS_URL,
+                     'KEY_PREFIX': 'throttle'},
+    }
+else:
+    CACHES = {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'throttle': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'throttle'},
+    }
 AUTH_USER_MODEL = 'core.CustomUser'
 AUTHENTICATION_BACKENDS = (
     'django.contrib.auth.backends.ModelBackend',
@@ -59,16 +153,31 @@ AUTHENTICATION_BACKENDS = (
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.StatementTimeoutMiddleware',
+    'core.middleware.PresupuestoConsultasMiddleware',
 ]
 
 CORS_ALLOW_ALL_ORIGINS = True  # Permitir todos los orígenes
 
+# Esquema OpenAPI precalculado (manage.py generar_openapi)
+OPENAPI_SCHEMA_DIR = os.getenv("OPENAPI_SCHEMA_DIR", str(BASE_DIR / "openapi"))
+OPENAPI_CACHE_MAX_AGE = int(os.getenv("OPENAPI_CACHE_MAX_AGE", "3600"))  # segundos
+# La UI de Swagger/ReDoc descarga el artefacto en lugar de regenerar el esquema
+SWAGGER_SETTINGS = {'SPEC_URL': '/swagger.json'}
+REDOC_SETTINGS = {'SPEC_URL': '/swagger.json'}
+
+# Compresión de respuestas (Brotli/gzip negociado)
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))  # bytes
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+
 ROOT_URLCONF = 'vot_core.urls'
 
 TEMPLATES = [
@@ -102,6 +211,20 @@ if DATABASE_URL:
             conn_health_checks=True,
         )
     }
+    # Pool de conexiones por proceso (core/backends/postgresql_pool)
+    if os.getenv("DB_POOL", "False") == "True":
+        DATABASES['default'].update({
+            'ENGINE': 'core.backends.postgresql_pool',
+            'CONN_MAX_AGE': 0,  # la conexión vuelve al pool al terminar cada petición
+            'CONN_HEALTH_CHECKS': False,  # el pool verifica las conexiones ociosas
+            'POOL': {
+                'min_size': int(os.getenv("DB_POOL_MIN", "2")),
+                'max_size': int(os.getenv("DB_POOL_MAX", "10")),
+                'timeout': float(os.getenv("DB_POOL_TIMEOUT", "10")),  # s esperando una conexión libre
+                'check_idle': float(os.getenv("DB_POOL_CHECK_IDLE", "30")),  # s ociosa antes de verificar con SELECT 1
+                'max_lifetime': float(os.getenv("DB_POOL_MAX_LIFETIME", "3600")),
+            },
+        })
 else:
     DATABASES = {
         'default': {
@@ -110,6 +233,48 @@ else:
         }
     }
 
+# statement_timeout (ms) de PostgreSQL por vista; ver core.db.statement_timeout. 0 = sin límite
+DB_STATEMENT_TIMEOUTS = {
+    'default': int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000")),
+    'lectura': int(os.getenv("DB_STATEMENT_TIMEOUT_LECTURA_MS", "5000")),
+    'exportacion': int(os.getenv("DB_STATEMENT_TIMEOUT_EXPORTACION_MS", "120000")),
+}
+
+# Máximo de consultas SQL por petición; ver core.db.presupuesto_consultas. 0 = sin control
+DB_PRESUPUESTOS_CONSULTAS = {
+    'default': int(os.getenv("DB_PRESUPUESTO_CONSULTAS", "40")),
+    'lectura': 15,
+}
+
+# Particionado mensual opcional en PostgreSQL (manage.py particiones; core/services/particiones.py).
+# Solo tablas sin FKs entrantes y sin UNIQUE que excluya la fecha: "app.Modelo" -> campo de partición
+PARTICIONES_MENSUALES = {
+    'core.PredioWizard': 'created_at',
+    'core.FotoTelematicWizard': 'creado_en',
+    'core.CambioSync': 'creado_en',
+}
+PARTICIONES_MESES_FUTUROS = int(os.getenv("PARTICIONES_MESES_FUTUROS", "3"))
+PARTICIONES_ESQUEMA_ARCHIVO = os.getenv("PARTICIONES_ESQUEMA_ARCHIVO", "archivo")
+
+# Archivo frío de encuestas publicadas (manage.py archivar_frio; core/services/archivo_frio.py)
+ARCHIVO_FRIO_DIR = os.getenv("ARCHIVO_FRIO_DIR", str(BASE_DIR / "archivo_frio"))
+ARCHIVO_FRIO_DIAS = int(os.getenv("ARCHIVO_FRIO_DIAS", "365"))          # sin cambios desde hace N días
+ARCHIVO_FRIO_GRACIA_DIAS = int(os.getenv("ARCHIVO_FRIO_GRACIA_DIAS", "30"))  # no re-archivar lo recién rehidratado
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {'console': {'class': 'logging.StreamHandler'}},
+    'loggers': {'core': {'handlers': ['console'], 'level': os.getenv("CORE_LOG_LEVEL", "INFO")}},
+}
+
+# PRAGMA aplicados a cada conexión SQLite (core/db.py). SQLITE_PROFILE=default deja los de SQLite.
+if os.getenv("SQLITE_PROFILE", "produccion") == "produccion":
+    from core.db import PRAGMAS_PRODUCCION
+    SQLITE_PRAGMAS = dict(PRAGMAS_PRODUCCION)
+else:
+    SQLITE_PRAGMAS = {}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
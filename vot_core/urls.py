@@ -18,29 +18,18 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-from rest_framework import permissions
 
-schema_view = get_schema_view(
-    openapi.Info(
-        title="VOT System API",
-        default_version='v1',
-        description="Documentación de la API para el sistema VOT",
-        terms_of_service="https://www.google.com/policies/terms/",
-        contact=openapi.Contact(email="contacto@votsystem.com"),
-        license=openapi.License(name="BSD License"),
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
-)
+from .openapi import schema_estatico, schema_view, vista_diferida
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('core.urls')),
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
-    path('swagger.json', schema_view.without_ui(cache_timeout=0), name='schema-json'),
+    # drf-yasg se carga recién cuando alguien abre la documentación
+    path('swagger/', vista_diferida(lambda: schema_view().with_ui('swagger', cache_timeout=0)), name='schema-swagger-ui'),
+    path('redoc/', vista_diferida(lambda: schema_view().with_ui('redoc', cache_timeout=0)), name='schema-redoc'),
+    # Esquema precalculado por `manage.py generar_openapi` (introspección solo si falta)
+    path('swagger.json', schema_estatico('json'), name='schema-json'),
+    path('swagger.yaml', schema_estatico('yaml'), name='schema-yaml'),
 ]
 
 # Agregar URLs para servir archivos media en desarrollo